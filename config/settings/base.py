@@ -179,6 +179,9 @@ STATICFILES_FINDERS = [
 MEDIA_ROOT = str(APPS_DIR / "media")
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "/media/"
+# Let phones upload deck images straight to the storage bucket through signed
+# URLs, so no worker is busy for the whole upload of a slow connection.
+DIRECT_IMAGE_UPLOADS = env.bool("DJANGO_DIRECT_IMAGE_UPLOADS", default=False)
 
 # TEMPLATES
 # ------------------------------------------------------------------------------
@@ -120,7 +120,7 @@ INSTALLED_APPS += ["django_extensions"]  # noqa F405
 GS_BUCKET_NAME = env("GS_BUCKET_NAME")
 STATIC_URL = f"https://storage.googleapis.com/{GS_BUCKET_NAME}/"
 DEFAULT_FILE_STORAGE = "storages.backends.gcloud.GoogleCloudStorage"
-STATICFILES_STORAGE = "storages.backends.gcloud.GoogleCloudStorage"
+STATICFILES_STORAGE = "mtgcube.utils.gcloud_storages.ManifestStaticGoogleCloudStorage"
 GS_DEFAULT_ACL = "publicRead"
 GS_QUERYSTRING_AUTH = True
 
@@ -144,7 +144,7 @@ SECURE_HSTS_INCLUDE_SUBDOMAINS = env.bool(
 GS_BUCKET_NAME = env("GS_BUCKET_NAME")
 STATIC_URL = f"https://storage.googleapis.com/{GS_BUCKET_NAME}/"
 DEFAULT_FILE_STORAGE = "storages.backends.gcloud.GoogleCloudStorage"
-STATICFILES_STORAGE = "storages.backends.gcloud.GoogleCloudStorage"
+STATICFILES_STORAGE = "mtgcube.utils.gcloud_storages.ManifestStaticGoogleCloudStorage"
 GS_DEFAULT_ACL = "publicRead"
 GS_QUERYSTRING_AUTH = True
 # [END gaeflex_py_django_static_config]
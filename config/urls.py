@@ -3,7 +3,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path, re_path
 from django.views import defaults as default_views
-from django.views.i18n import JavaScriptCatalog
+
+from mtgcube.utils.views import VersionedJavaScriptCatalog
 
 urlpatterns = [
   # Django Admin, use {% url 'admin:index' %}
@@ -14,7 +15,11 @@ urlpatterns = [
   re_path(r"^terms/", include("termsandconditions.urls")),
   # Your stuff: custom urls includes go here
   path("", include("tournaments.urls")),
-  path("jsi18n/", JavaScriptCatalog.as_view(), name="javascript-catalog"),
+  path(
+    "jsi18n/<str:lang>/<str:version>/",
+    VersionedJavaScriptCatalog.as_view(),
+    name="javascript-catalog",
+  ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 
@@ -4,7 +4,7 @@ document.addEventListener('DOMContentLoaded', function() {
         var playersElement = document.getElementById("players-" + draftId);
         var statusElement = document.getElementById("draft-status-" + draftId);
         var url = `/admin-dashboard/${tournamentSlug}/${draftSlug}/~draft/`
-        fetch(url)
+        return fetch(url)
         .then(response => response.json())
         .then(data => {
             var draftUrl = `/admin-dashboard/${tournamentSlug}/${draftSlug}/`;
@@ -39,7 +39,10 @@ document.addEventListener('DOMContentLoaded', function() {
             `${player}`).join(', ');
             playersElement.innerHTML = playersHtml;
         })
-        .catch(error => console.error('Error updating draft info:', error));
+        .catch(error => {
+            console.error('Error updating draft info:', error);
+            throw error;
+        });
     }
     
     var draftPanels = document.querySelectorAll('#draft-details');
@@ -47,9 +50,8 @@ document.addEventListener('DOMContentLoaded', function() {
         var tournamentSlug = panel.dataset.tournamentSlug;
         var draftSlug = panel.dataset.draftSlug;
         var draftId = panel.dataset.draftId;
-        updateDraftInfo(tournamentSlug, draftSlug, draftId);
-        setInterval(function() {
-            updateDraftInfo(tournamentSlug, draftSlug, draftId);
-        }, 120000); // 120 seconds
+        pollScheduler.every(120000, function() {
+            return updateDraftInfo(tournamentSlug, draftSlug, draftId);
+        }); // 120 seconds
     });
 });
\ No newline at end of file
@@ -1,7 +1,7 @@
 document.addEventListener('DOMContentLoaded', function () {
   function updateRoundStatus(tournamentSlug, draftSlug) {
     var url = `/admin-dashboard/${tournamentSlug}/${draftSlug}/~draft/`;
-    fetch(url)
+    return fetch(url)
       .then(response => response.json())
       .then(data => {
         var finishBtn = document.getElementById("finish-btn");
@@ -23,7 +23,10 @@ document.addEventListener('DOMContentLoaded', function () {
           }
         }
       })
-      .catch(error => console.error('Error updating match info:', error));
+      .catch(error => {
+          console.error('Error updating match info:', error);
+          throw error;
+      });
   }
   function updateMatchInfo(tournamentSlug, matchId) {
     var pairingElement = document.getElementById("pairing-" + matchId);
@@ -33,7 +36,7 @@ document.addEventListener('DOMContentLoaded', function () {
     var reportBtn = document.getElementById("report-result-btn-" + matchId);
     var confirmBtn = document.getElementById("confirm-result-btn-" + matchId);
     var url = `/admin-dashboard/${tournamentSlug}/~match/${matchId}/`;
-    fetch(url)
+    return fetch(url)
       .then(response => response.json())
       .then(data => {
         var pairingHtml = `<strong>${gettext('Table')} ${data.table}:</strong> ${data.player1} vs ${data.player2}`;
@@ -66,27 +69,31 @@ document.addEventListener('DOMContentLoaded', function () {
         player1Label.innerHTML = `<strong>${gettext('Table')} ${data.table}:</strong> ${data.player1}`;
         player2Label.innerHTML = data.player2;
       })
-      .catch(error => console.error('Error updating match info:', error));
+      .catch(error => {
+          console.error('Error updating match info:', error);
+          throw error;
+      });
   }
 
 
-  var draftSlug = document.getElementById('admin-btns').dataset.draftSlug;
-  var tournamentSlug = document.getElementById('admin-btns').dataset.tournamentSlug;
+  var adminButtons = document.getElementById('admin-btns');
+  if (!adminButtons) {
+    return;
+  }
+  var draftSlug = adminButtons.dataset.draftSlug;
+  var tournamentSlug = adminButtons.dataset.tournamentSlug;
   var matchPanels = document.querySelectorAll('#match-panel');
 
-  updateRoundStatus(tournamentSlug, draftSlug);
-
-  setInterval(function () {
-    updateRoundStatus(tournamentSlug, draftSlug);
-  }, 120000);
+  pollScheduler.every(120000, function () {
+    return updateRoundStatus(tournamentSlug, draftSlug);
+  });
 
   matchPanels.forEach(function (panel) {
     var matchId = panel.dataset.matchId;
     var tournamentSlug = panel.dataset.tournamentSlug;
-    updateMatchInfo(tournamentSlug, matchId);
 
-    setInterval(function () {
-      updateMatchInfo(tournamentSlug, matchId);
-    }, 120000); // 120 seconds
+    pollScheduler.every(120000, function () {
+      return updateMatchInfo(tournamentSlug, matchId);
+    }); // 120 seconds
   });
 });
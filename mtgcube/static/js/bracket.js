@@ -0,0 +1,67 @@
+document.addEventListener('DOMContentLoaded', function() {
+    function roundName(round, rounds) {
+        var left = rounds - round;
+        if (left == 0) {
+            return gettext('Final');
+        }
+        if (left == 1) {
+            return gettext('Semifinals');
+        }
+        if (left == 2) {
+            return gettext('Quarterfinals');
+        }
+        return `${gettext('Round')} ${round}`;
+    }
+
+    function playerHtml(player, won) {
+        if (!player) {
+            return `<span class="bracket-player">-</span>`;
+        }
+        var name = won ? `<strong>${player.name}</strong>` : player.name;
+        return `<span class="bracket-player">(${player.seed}) ${name}</span>`;
+    }
+
+    function updateBracket(tournamentSlug, draftSlug) {
+        var bracketElement = document.getElementById("bracket");
+        var roundsElement = document.getElementById("bracket-rounds");
+        var championElement = document.getElementById("bracket-champion");
+        var url = `/event-dashboard/${tournamentSlug}/${draftSlug}/~bracket/`;
+        return fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            if (!data.error) {
+                roundsElement.innerHTML = data.rounds.map(round => `
+                    <h6>${roundName(round.round, data.rounds.length)}</h6>
+                    <ul>
+                        ${round.matches.map(match => `
+                            <li>
+                                ${playerHtml(match.player1, match.winner == 1)}
+                                ${gettext('vs')}
+                                ${playerHtml(match.player2, match.winner == 2)}
+                                ${match.table ? `(${gettext('Table')} ${match.table})` : ''}
+                                ${match.confirmed ? match.result : ''}
+                            </li>
+                        `).join('')}
+                    </ul>
+                `).join('');
+                championElement.innerHTML = data.champion ? `${gettext('Champion')}: ${data.champion.name}` : '';
+                bracketElement.style.display = 'block';
+            }
+        })
+        .catch(error => {
+            console.error('Error fetching bracket:', error);
+            throw error;
+        });
+    }
+
+    var bracketElement = document.getElementById('bracket');
+    if (!bracketElement) {
+        return;
+    }
+    var tournamentSlug = bracketElement.dataset.tournamentSlug;
+    var draftSlug = bracketElement.dataset.draftSlug;
+
+    pollScheduler.every(30000, function() {
+        return updateBracket(tournamentSlug, draftSlug);
+    }); // 30 seconds
+});
\ No newline at end of file
@@ -7,7 +7,7 @@ document.addEventListener('DOMContentLoaded', function() {
         var oppTextElement = document.getElementById("opponent-text");
         var confirmButtonElement = document.getElementById("confirm-result-btn");
         var url = `/event-dashboard/${tournamentSlug}/${draftSlug}/${matchId}/~player-match/`;
-        fetch(url)
+        return fetch(url)
         .then(response => response.json())
         .then(data => {
             if (!data.error) {
@@ -46,17 +46,20 @@ document.addEventListener('DOMContentLoaded', function() {
             }
             
         })
-        .catch(error => console.error('Error updating match info:', error));
+        .catch(error => {
+            console.error('Error updating match info:', error);
+            throw error;
+        });
     }
 
-    if (document.getElementById("match-info-list").dataset.bye == 'False') {
-        var tournamentSlug = document.getElementById('match-details').dataset.tournamentSlug;
-        var draftSlug = document.getElementById('match-details').dataset.draftSlug;
-        var matchId = document.getElementById('match-details').dataset.matchId;
-        updateMatchInfo(tournamentSlug, draftSlug, matchId);
+    var matchDetails = document.getElementById('match-details');
+    if (matchDetails && document.getElementById("match-info-list").dataset.bye == 'False') {
+        var tournamentSlug = matchDetails.dataset.tournamentSlug;
+        var draftSlug = matchDetails.dataset.draftSlug;
+        var matchId = matchDetails.dataset.matchId;
 
-        setInterval(function() {
-            updateMatchInfo(tournamentSlug, draftSlug, matchId);
-        }, 120000); // 120 seconds
+        pollScheduler.every(120000, function() {
+            return updateMatchInfo(tournamentSlug, draftSlug, matchId);
+        }); // 120 seconds
     }
 });
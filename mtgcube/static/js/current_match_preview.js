@@ -2,7 +2,7 @@ document.addEventListener('DOMContentLoaded', function() {
     function updateMatchInfo(tournamentSlug, draftSlug) {
         var matchElement = document.getElementById("current-match");
         var url = `/event-dashboard/${tournamentSlug}/${draftSlug}/~player-match-preview/`;
-        fetch(url)
+        return fetch(url)
         .then(response => response.json())
         .then(data => {
             if (!data.error) {
@@ -28,14 +28,20 @@ document.addEventListener('DOMContentLoaded', function() {
                 }
             }
         })
-        .catch(error => console.error('Error fetching current match information:', error));
+        .catch(error => {
+            console.error('Error fetching current match information:', error);
+            throw error;
+        });
     }
 
-    var tournamentSlug = document.getElementById('current-match').dataset.tournamentSlug;
-    var draftSlug = document.getElementById('current-match').dataset.draftSlug;
-    updateMatchInfo(tournamentSlug, draftSlug);
+    var matchElement = document.getElementById('current-match');
+    if (!matchElement) {
+        return;
+    }
+    var tournamentSlug = matchElement.dataset.tournamentSlug;
+    var draftSlug = matchElement.dataset.draftSlug;
 
-    setInterval(function() {
-        updateMatchInfo(tournamentSlug, draftSlug);
-    }, 120000); // 120 seconds
+    pollScheduler.every(120000, function() {
+        return updateMatchInfo(tournamentSlug, draftSlug);
+    }); // 120 seconds
 });
\ No newline at end of file
@@ -5,14 +5,14 @@ document.addEventListener('DOMContentLoaded', function() {
         var infoElement = document.getElementById("draft-standings-info");
         var containerElement = document.getElementById('standings-container');
         var url = `/event-dashboard/${tournamentSlug}/${draftSlug}/~draft-standings/`;
-        fetch(url)
+        return fetch(url)
         .then(response => response.json())
         .then(data => {
             if (!data.error) {
                 headerElement.innerHTML = `${gettext('Draft standings after round')} ${data.current_round}:`;
-                var standingsHtml = data.standings.map((player, i) => `
+                var standingsHtml = data.standings.map(player => `
                     <tr>
-                        <td style="text-align: center; padding-right: 40px;">${i + 1}</td>
+                        <td style="text-align: center; padding-right: 40px;">${player.rank}</td>
                         <td style="text-align: center; padding-right: 40px;">${player.name}</td>
                         <td style="text-align: center; padding-right: 40px;">${player.score}</td>
                         <td style="text-align: center; padding-right: 40px;">${player.omw}</td>
@@ -31,14 +31,21 @@ document.addEventListener('DOMContentLoaded', function() {
                 }
             }
         })
-        .catch(error => console.error('Error updating match info:', error));
+        .catch(error => {
+            console.error('Error updating match info:', error);
+            throw error;
+        });
     }
 
-    var tournamentSlug = document.getElementById('standings-container').dataset.tournamentSlug;
-    var draftSlug = document.getElementById('standings-container').dataset.draftSlug;
-    updateStandings(tournamentSlug, draftSlug);
+    // The event standings share the container id, but carry no draft slug
+    var containerElement = document.getElementById('standings-container');
+    if (!containerElement || containerElement.dataset.draftSlug === undefined) {
+        return;
+    }
+    var tournamentSlug = containerElement.dataset.tournamentSlug;
+    var draftSlug = containerElement.dataset.draftSlug;
 
-    setInterval(function() {
-        updateStandings(tournamentSlug, draftSlug);
-    }, 120000); // 120 seconds
+    pollScheduler.every(120000, function() {
+        return updateStandings(tournamentSlug, draftSlug);
+    }); // 120 seconds
 });
\ No newline at end of file
@@ -14,7 +14,7 @@ function fetchDraftDetails(tournamentSlug, draftSlug) {
         return;
     }
     var url = `/event-dashboard/${tournamentSlug}/${draftSlug}/~player-draft-info/`;
-    fetch(url)
+    return fetch(url)
     .then(response => response.json())
     .then(data => {
         if (!data.error) {
@@ -48,12 +48,15 @@ function fetchDraftDetails(tournamentSlug, draftSlug) {
             console.log(data.error);
         }
     })
-    .catch(error => console.error('Error fetching draft information:', error));
+    .catch(error => {
+        console.error('Error fetching draft information:', error);
+        throw error;
+    });
 }
 
 function fetchAnnouncement(tournamentSlug) {
     var url = `/event-dashboard/${tournamentSlug}/~announcement/`;
-    fetch(url)
+    return fetch(url)
     .then(response => response.json())
     .then(data => {
         const announcementElement = document.getElementById('announcement');
@@ -68,19 +71,24 @@ function fetchAnnouncement(tournamentSlug) {
             announcementElement.style.display = 'block';
         }
     })
-    .catch(error => console.error('Error fetching event information', error));
+    .catch(error => {
+        console.error('Error fetching event information', error);
+        throw error;
+    });
 }
 
 // Initial formatting
 document.addEventListener('DOMContentLoaded', () => {
-    var tournamentSlug = document.getElementById('dashboard-container').dataset.tournamentSlug;
-    var draftSlug = document.getElementById('dashboard-container').dataset.draftSlug;
-    fetchDraftDetails(tournamentSlug, draftSlug);
-    fetchAnnouncement(tournamentSlug);
-    setInterval(function() {
-        fetchDraftDetails(tournamentSlug, draftSlug);
-    }, 600000); // 120 seconds
-    setInterval(function() {
-        fetchAnnouncement(tournamentSlug);
-    }, 600000); // 120 seconds
+    var dashboardElement = document.getElementById('dashboard-container');
+    if (!dashboardElement) {
+        return;
+    }
+    var tournamentSlug = dashboardElement.dataset.tournamentSlug;
+    var draftSlug = dashboardElement.dataset.draftSlug;
+    pollScheduler.every(600000, function() {
+        return fetchDraftDetails(tournamentSlug, draftSlug);
+    }); // 600 seconds
+    pollScheduler.every(600000, function() {
+        return fetchAnnouncement(tournamentSlug);
+    }); // 600 seconds
 });
\ No newline at end of file
@@ -1,18 +1,22 @@
 document.addEventListener('DOMContentLoaded', function() {
-    function updateStandings(eventSlug) {
+    function updateStandings(eventSlug, standingsWindow) {
         var standingsElement = document.getElementById("event-standings-" + eventSlug);
         var headerElement = document.getElementById("event-standings-header-" + eventSlug);
         var infoElement = document.getElementById("event-standings-info-" + eventSlug);
         var containerElement = document.getElementById('standings-container');
         var url = `/event-dashboard/${eventSlug}/~standings/`;
-        fetch(url)
+        // Players only fetch the places around their own rank
+        if (standingsWindow) {
+            url += `?window=${standingsWindow}`;
+        }
+        return fetch(url)
         .then(response => response.json())
         .then(data => {
             if (!data.error) {
                 headerElement.innerHTML = `${gettext('Event standings after round')} ${data.current_round}:`;
-                var standingsHtml = data.standings.map((player, i) => `
+                var standingsHtml = data.standings.map(player => `
                     <tr>
-                        <td style="text-align: center; padding-right: 40px;">${i + 1}</td>
+                        <td style="text-align: center; padding-right: 40px;">${player.rank}</td>
                         <td style="text-align: center; padding-right: 40px;">${player.name}</td>
                         <td style="text-align: center; padding-right: 40px;">${player.score}</td>
                         <td style="text-align: center; padding-right: 40px;">${player.omw}</td>
@@ -25,13 +29,21 @@ document.addEventListener('DOMContentLoaded', function() {
                 containerElement.style.display = 'block';
             }
         })
-        .catch(error => console.error('Error updating event standings:', error));
+        .catch(error => {
+            console.error('Error updating event standings:', error);
+            throw error;
+        });
     }
     
-    var eventSlug = document.getElementById('standings-container').dataset.tournamentSlug;
-    updateStandings(eventSlug);
+    // The draft standings share the container id, but carry a draft slug
+    var containerElement = document.getElementById('standings-container');
+    if (!containerElement || containerElement.dataset.draftSlug !== undefined) {
+        return;
+    }
+    var eventSlug = containerElement.dataset.tournamentSlug;
+    var standingsWindow = containerElement.dataset.window;
 
-    setInterval(function() {
-        updateStandings(eventSlug);
-    }, 120000); // 120 seconds
+    pollScheduler.every(120000, function() {
+        return updateStandings(eventSlug, standingsWindow);
+    }); // 120 seconds
 });
\ No newline at end of file
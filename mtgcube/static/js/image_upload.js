@@ -0,0 +1,104 @@
+// Downscales the selected photo in the browser before it is uploaded, so phones
+// don't have to push multi-megabyte originals over the venue wifi. The server
+// re-encodes every upload anyway, this only saves the transfer.
+// With direct uploads enabled the photo goes straight to the storage bucket
+// through a signed URL and only the upload token is posted to the server.
+document.addEventListener('DOMContentLoaded', function() {
+    const maxSize = 2048;
+    const quality = 0.85;
+
+    var form = document.getElementById('upload-form');
+    var input = form ? form.querySelector('input[type="file"]') : null;
+    if (!input) {
+        return;
+    }
+    var submitButton = form.querySelector('button[type="submit"]');
+    var csrfToken = form.querySelector('input[name="csrfmiddlewaretoken"]').value;
+
+    function downscale(file) {
+        // Bitmaps are decoded with their EXIF orientation applied
+        return createImageBitmap(file, {imageOrientation: 'from-image'})
+        .then(bitmap => {
+            var scale = Math.min(1, maxSize / Math.max(bitmap.width, bitmap.height));
+            var canvas = document.createElement('canvas');
+            canvas.width = Math.round(bitmap.width * scale);
+            canvas.height = Math.round(bitmap.height * scale);
+            canvas.getContext('2d').drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+            bitmap.close();
+            return new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', quality));
+        })
+        .then(blob => {
+            if (!blob || blob.size >= file.size) {
+                return file;
+            }
+            var name = file.name.replace(/\.[^.]*$/, '') + '.jpg';
+            return new File([blob], name, {type: 'image/jpeg'});
+        });
+    }
+
+    function post(url, fields) {
+        var body = new FormData();
+        Object.entries(fields).forEach(([name, value]) => body.append(name, value));
+        return fetch(url, {method: 'POST', body: body, headers: {'X-CSRFToken': csrfToken}})
+        .then(response => response.json().then(data => {
+            if (!response.ok) {
+                throw new Error(data.error);
+            }
+            return data;
+        }));
+    }
+
+    function directUpload(file) {
+        return post(form.dataset.uploadUrl, {content_type: file.type, checkin: form.dataset.checkin})
+        .then(target => fetch(target.url, {method: target.method, headers: target.headers, body: file})
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`Upload failed with status ${response.status}`);
+                }
+                return post(form.dataset.finalizeUrl, {token: target.token});
+            })
+        )
+        .then(data => {
+            window.location = data.redirect;
+        });
+    }
+
+    if (window.createImageBitmap && window.DataTransfer) {
+        input.addEventListener('change', function() {
+            var file = input.files[0];
+            if (!file || !file.type.startsWith('image/')) {
+                return;
+            }
+            submitButton.disabled = true;
+            downscale(file)
+            .then(resized => {
+                if (resized !== file) {
+                    var transfer = new DataTransfer();
+                    transfer.items.add(resized);
+                    input.files = transfer.files;
+                }
+            })
+            .catch(error => console.error('Error downscaling image, uploading the original:', error))
+            .finally(() => {
+                submitButton.disabled = false;
+            });
+        });
+    }
+
+    if (form.dataset.uploadUrl) {
+        form.addEventListener('submit', function(event) {
+            var file = input.files[0];
+            if (!file) {
+                return;
+            }
+            event.preventDefault();
+            submitButton.disabled = true;
+            directUpload(file)
+            .catch(error => {
+                // Fall back to uploading through the server
+                console.error('Error uploading image to the storage:', error);
+                form.submit();
+            });
+        });
+    }
+});
@@ -4,7 +4,7 @@ document.addEventListener('DOMContentLoaded', function() {
         var pairingsElement = document.getElementById("pairings");
         var headerElement = document.getElementById("pairings-header");
         var url = `/event-dashboard/${tournamentSlug}/${draftSlug}/~player-pairings/`;
-        fetch(url)
+        return fetch(url)
         .then(response => response.json())
         .then(data => {
             if (data.error) {
@@ -23,14 +23,20 @@ document.addEventListener('DOMContentLoaded', function() {
                 pairingsElement.innerHTML = pairingsHtml;
             }
         })
-        .catch(error => console.error('Error updating pairings info:', error));
+        .catch(error => {
+            console.error('Error updating pairings info:', error);
+            throw error;
+        });
     }
 
-    var tournamentSlug = document.getElementById('player-pairings').dataset.tournamentSlug;
-    var draftSlug = document.getElementById('player-pairings').dataset.draftSlug;
-    updatePairingsInfo(tournamentSlug, draftSlug);
+    var pairingsContainer = document.getElementById('player-pairings');
+    if (!pairingsContainer) {
+        return;
+    }
+    var tournamentSlug = pairingsContainer.dataset.tournamentSlug;
+    var draftSlug = pairingsContainer.dataset.draftSlug;
 
-    setInterval(function() {
-        updatePairingsInfo(tournamentSlug, draftSlug);
-    }, 120000); // 120 seconds
+    pollScheduler.every(120000, function() {
+        return updatePairingsInfo(tournamentSlug, draftSlug);
+    }); // 120 seconds
 });
\ No newline at end of file
@@ -2,19 +2,25 @@ document.addEventListener('DOMContentLoaded', function() {
     function updatePlayerInfo(tournamentSlug, draftSlug) {
         var infoElement = document.getElementById("player-list-inner");
         var url = `/event-dashboard/${tournamentSlug}/${draftSlug}/~players/`;
-        fetch(url)
+        return fetch(url)
         .then(response => response.json())
         .then(data => {
             infoElement.innerHTML = data.players.map((player) => `${player}`).join(', ');
         })
-        .catch(error => console.error('Error updating match info:', error));
+        .catch(error => {
+            console.error('Error updating match info:', error);
+            throw error;
+        });
     }
     
-    var tournamentSlug = document.getElementById('player-list').dataset.tournamentSlug;
-    var draftSlug = document.getElementById('player-list').dataset.draftSlug;
-    updatePlayerInfo(tournamentSlug, draftSlug);
+    var playerList = document.getElementById('player-list');
+    if (!playerList) {
+        return;
+    }
+    var tournamentSlug = playerList.dataset.tournamentSlug;
+    var draftSlug = playerList.dataset.draftSlug;
 
-    setInterval(function() {
-        updatePlayerInfo(tournamentSlug, draftSlug);
-    }, 120000); // 120 seconds
+    pollScheduler.every(120000, function() {
+        return updatePlayerInfo(tournamentSlug, draftSlug);
+    }); // 120 seconds
 });
\ No newline at end of file
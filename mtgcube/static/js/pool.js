@@ -62,7 +62,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
     function updateStatusInfo(tournamentSlug, draftSlug) {
         var url = `/event-dashboard/${tournamentSlug}/${draftSlug}/~player-basic-info/`;
-        fetch(url)
+        return fetch(url)
             .then(response => response.json())
             .then(data => {
                 if (!data.draft_seated) {
@@ -74,14 +74,19 @@ document.addEventListener('DOMContentLoaded', function() {
                     }
                 }
             })
-            .catch(error => console.error('Error fetching status information:', error));
+            .catch(error => {
+                console.error('Error fetching status information:', error);
+                throw error;
+            });
     }
 
-    var tournamentSlug = document.getElementById('deck-upload').dataset.tournamentSlug;
-    var draftSlug = document.getElementById('deck-upload').dataset.draftSlug;
     var poolElement = document.getElementById("deck-upload");
-    updateStatusInfo(tournamentSlug, draftSlug);
-    setInterval(function() {
-        updateStatusInfo(tournamentSlug, draftSlug);
-    }, 120000); // 120 seconds
+    if (!poolElement) {
+        return;
+    }
+    var tournamentSlug = poolElement.dataset.tournamentSlug;
+    var draftSlug = poolElement.dataset.draftSlug;
+    pollScheduler.every(120000, function() {
+        return updateStatusInfo(tournamentSlug, draftSlug);
+    }); // 120 seconds
 });
\ No newline at end of file
@@ -0,0 +1,28 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Registrations of events in surge mode are queued, this follows them until
+    // they went through and reloads the page to show the enrollment.
+    function updateStatus(element) {
+        return fetch(element.dataset.statusUrl)
+        .then(response => response.json())
+        .then(data => {
+            if (data.status === 'pending') {
+                element.innerHTML = interpolate(
+                    gettext('Your registration is queued, %s registrations are ahead of yours.'),
+                    [data.ahead]
+                );
+            } else {
+                window.location.reload();
+            }
+        })
+        .catch(error => {
+            console.error('Error updating registration status:', error);
+            throw error;
+        });
+    }
+
+    document.querySelectorAll('.registration-status[data-status="pending"]').forEach(element => {
+        pollScheduler.every(5000, function() {
+            return updateStatus(element);
+        }); // 5 seconds
+    });
+});
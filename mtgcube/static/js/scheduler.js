@@ -0,0 +1,86 @@
+// Shared polling scheduler for the dashboard scripts.
+// All polls run from one timer: polls that are due (or about to be) are fired
+// together, nothing is fetched while the tab is hidden, failing polls back off
+// exponentially and every interval is jittered so phones that opened the
+// dashboard at the same moment drift apart instead of hitting the server in sync.
+const pollScheduler = (function() {
+    const tickInterval = 1000;
+    // Polls due within this window are fired together with the one that is due
+    const batchWindow = 10000;
+    const jitter = 0.2;
+    const maxBackoff = 16;
+
+    var polls = [];
+    var timer = null;
+
+    function nextDue(poll) {
+        var backoff = Math.min(Math.pow(2, poll.failures), maxBackoff);
+        var spread = 1 - jitter + Math.random() * jitter * 2;
+        return Date.now() + poll.interval * backoff * spread;
+    }
+
+    function run(poll) {
+        poll.running = true;
+        Promise.resolve()
+        .then(poll.callback)
+        .then(() => {
+            poll.failures = 0;
+        })
+        .catch(() => {
+            poll.failures += 1;
+        })
+        .finally(() => {
+            poll.running = false;
+            poll.due = nextDue(poll);
+        });
+    }
+
+    function tick() {
+        if (document.hidden) {
+            return;
+        }
+        var now = Date.now();
+        if (!polls.some(poll => !poll.running && poll.due <= now)) {
+            return;
+        }
+        polls.forEach(poll => {
+            if (!poll.running && poll.due <= now + batchWindow) {
+                run(poll);
+            }
+        });
+    }
+
+    function start() {
+        if (timer === null) {
+            timer = setInterval(tick, tickInterval);
+        }
+    }
+
+    function stop() {
+        clearInterval(timer);
+        timer = null;
+    }
+
+    document.addEventListener('visibilitychange', function() {
+        if (document.hidden) {
+            stop();
+        } else {
+            // Catch up on everything that got due while the tab was hidden
+            tick();
+            start();
+        }
+    });
+
+    return {
+        // Calls the callback now and then every interval milliseconds.
+        // The callback returns a promise, a rejected one counts as a failure.
+        every: function(interval, callback) {
+            var poll = {interval: interval, callback: callback, failures: 0, running: false, due: 0};
+            polls.push(poll);
+            if (!document.hidden) {
+                run(poll);
+            }
+            start();
+        },
+    };
+})();
@@ -5,7 +5,7 @@ document.addEventListener('DOMContentLoaded', function() {
         var headerElement = document.getElementById("seatings-header");
         var infoElement = document.getElementById("seatings-info");
         var url = `/event-dashboard/${tournamentSlug}/${draftSlug}/~seatings/`;
-        fetch(url)
+        return fetch(url)
         .then(response => response.json())
         .then(data => {
             headerElement.innerHTML = 'Seatings:';
@@ -21,15 +21,20 @@ document.addEventListener('DOMContentLoaded', function() {
                 }
             }
         })
-        .catch(error => console.error('Error updating match info:', error));
+        .catch(error => {
+            console.error('Error updating match info:', error);
+            throw error;
+        });
     }
 
-    var tournamentSlug = document.getElementById('player-seatings').dataset.tournamentSlug;
-    var draftSlug = document.getElementById('player-seatings').dataset.draftSlug;
-
-    updateSeatings(tournamentSlug, draftSlug);
+    var seatingsContainer = document.getElementById('player-seatings');
+    if (!seatingsContainer) {
+        return;
+    }
+    var tournamentSlug = seatingsContainer.dataset.tournamentSlug;
+    var draftSlug = seatingsContainer.dataset.draftSlug;
 
-    setInterval(function() {
-        updateSeatings(tournamentSlug, draftSlug);
-    }, 600000); // 120 seconds
+    pollScheduler.every(600000, function() {
+        return updateSeatings(tournamentSlug, draftSlug);
+    }); // 600 seconds
 });
\ No newline at end of file
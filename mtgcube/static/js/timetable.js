@@ -3,7 +3,7 @@ document.addEventListener('DOMContentLoaded', function() {
     function updateTimetable(tournamentSlug) {
         var timetableElement = document.getElementById("timetable");
         var url = `/event-dashboard/${tournamentSlug}/~timetable/`;
-        fetch(url)
+        return fetch(url)
         .then(response => response.json())
         .then(data => {
             if (!data.error) {
@@ -18,13 +18,19 @@ document.addEventListener('DOMContentLoaded', function() {
                     }).join('') + '</ul>';
             }
         })
-        .catch(error => console.error('Error fetching upcoming draft information:', error));
+        .catch(error => {
+            console.error('Error fetching upcoming draft information:', error);
+            throw error;
+        });
     }
 
-    var tournamentSlug = document.getElementById('timetable').dataset.tournamentSlug;
-    updateTimetable(tournamentSlug);
+    var timetableElement = document.getElementById('timetable');
+    if (!timetableElement) {
+        return;
+    }
+    var tournamentSlug = timetableElement.dataset.tournamentSlug;
 
-    setInterval(function() {
-        updateTimetable(tournamentSlug);
-    }, 120000); // 120 seconds
+    pollScheduler.every(120000, function() {
+        return updateTimetable(tournamentSlug);
+    }); // 120 seconds
 });
\ No newline at end of file
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from . import services
 from .models import (
   Tournament,
   Game,
@@ -10,7 +11,10 @@ from .models import (
   Draft,
   Cube,
   Image,
+  OrphanedFile,
   SideEvent,
+  WaitlistEntry,
+  EnrollmentRequest,
 )
 
 
@@ -100,6 +104,10 @@ class TournamentAdmin(admin.ModelAdmin):
     "format_description",
     "player_capacity",
     "signed_up",
+    "queued_registration",
+    "cubes",
+    "tables",
+    "feature_tables",
     "current_round",
     "location",
     "announcement",
@@ -108,6 +116,14 @@ class TournamentAdmin(admin.ModelAdmin):
     "slug",
   ]
   prepopulated_fields = {"slug": ("name",)}
+  # Kept by the enrollment services, saving a stale count would overbook the event
+  readonly_fields = ["signed_up"]
+  filter_horizontal = ["cubes"]
+
+  def save_model(self, request, obj, form, change):
+    super().save_model(request, obj, form, change)
+    # Raising the capacity seats players from the waitlist
+    services.promote_waitlist(obj)
 
 
 class SideEventAdmin(admin.ModelAdmin):
@@ -119,11 +135,21 @@ class SideEventAdmin(admin.ModelAdmin):
     "format_description",
     "player_capacity",
     "signed_up",
+    "queued_registration",
+    "cubes",
+    "tables",
+    "feature_tables",
     "location",
     "announcement",
     "start_datetime",
     "end_datetime",
   ]
+  readonly_fields = ["signed_up"]
+  filter_horizontal = ["cubes"]
+
+  def save_model(self, request, obj, form, change):
+    super().save_model(request, obj, form, change)
+    services.promote_waitlist(obj)
 
 
 class PhaseAdmin(admin.ModelAdmin):
@@ -146,6 +172,25 @@ class ImageAdmin(admin.ModelAdmin):
   model = Image
 
 
+class OrphanedFileAdmin(admin.ModelAdmin):
+  model = OrphanedFile
+  list_display = ["name", "recorded_at", "attempts"]
+
+
+class WaitlistEntryAdmin(admin.ModelAdmin):
+  model = WaitlistEntry
+  list_display = ["tournament", "player", "created_at"]
+  list_filter = ["tournament"]
+  ordering = ["id"]
+
+
+class EnrollmentRequestAdmin(admin.ModelAdmin):
+  model = EnrollmentRequest
+  list_display = ["tournament", "user", "status", "created_at", "processed_at"]
+  list_filter = ["tournament", "status"]
+  ordering = ["id"]
+
+
 admin.site.register(Tournament, TournamentAdmin)
 admin.site.register(Phase, PhaseAdmin)
 admin.site.register(Enrollment, EnrollmentAdmin)
@@ -155,4 +200,7 @@ admin.site.register(Draft, DraftAdmin)
 admin.site.register(Round, RoundAdmin)
 admin.site.register(Cube, CubeAdmin)
 admin.site.register(Image, ImageAdmin)
+admin.site.register(OrphanedFile, OrphanedFileAdmin)
+admin.site.register(WaitlistEntry, WaitlistEntryAdmin)
+admin.site.register(EnrollmentRequest, EnrollmentRequestAdmin)
 admin.site.register(SideEvent, SideEventAdmin)
@@ -0,0 +1,129 @@
+import contextlib
+import io
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from . import queries, services
+from .models import Draft, Enrollment, Game
+
+User = get_user_model()
+
+
+@contextlib.contextmanager
+def measure(results, name):
+    """Adds the wall time and query count of the wrapped block to results[name]."""
+    entry = results.setdefault(name, {"calls": 0, "wall_ms": 0.0, "queries": 0})
+    with CaptureQueriesContext(connection) as ctx:
+        # The services print their progress, which would drown the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            yield
+            elapsed = time.perf_counter() - start
+    entry["calls"] += 1
+    entry["wall_ms"] += elapsed * 1000
+    entry["queries"] += len(ctx.captured_queries)
+
+
+def summarize(results):
+    """Adds per call averages to the measured results."""
+    for entry in results.values():
+        entry["wall_ms"] = round(entry["wall_ms"], 3)
+        entry["ms_per_call"] = round(entry["wall_ms"] / entry["calls"], 3)
+        entry["queries_per_call"] = round(entry["queries"] / entry["calls"], 2)
+    return results
+
+
+def json_views(tournament, draft, match):
+    """Returns the JSON endpoints polled by the dashboards for the given draft and match."""
+    slugs = {"slug": tournament.slug, "draft_slug": draft.slug}
+    return [
+        ("seatings", slugs, False),
+        ("draft_players", slugs, False),
+        ("draft_standings", slugs, False),
+        ("event_standings", {"slug": tournament.slug}, False),
+        ("player_draft_info", slugs, False),
+        ("player_basic_info", slugs, False),
+        ("player_match_info_light", slugs, False),
+        ("player_match_info", {**slugs, "match_id": match.id}, False),
+        ("player_pairings_info", slugs, False),
+        ("timetable", {"slug": tournament.slug}, False),
+        ("announcement", {"slug": tournament.slug}, False),
+        ("admin_draft_embed", slugs, True),
+        ("admin_match_embed", {"slug": tournament.slug, "match_id": match.id}, True),
+    ]
+
+
+def time_views(tournament, draft, match, admin, runs=5):
+    """Times every JSON view once with a cold cache and runs - 1 times with a warm one."""
+    factory = RequestFactory()
+    player_user = match.player1.player.user
+    results = {}
+
+    for name, kwargs, as_admin in json_views(tournament, draft, match):
+        path = reverse(f"tournaments:{name}", kwargs=kwargs)
+        view = resolve(path)
+        cache.clear()
+        for run in range(runs):
+            request = factory.get(path)
+            request.user = admin if as_admin else player_user
+            label = f"{name} (cold)" if run == 0 else f"{name} (warm)"
+            with measure(results, label):
+                view.func(request, *view.args, **view.kwargs)
+
+    return summarize(results)
+
+
+def run(tournament, view_runs=5):
+    """Runs a full round of the active phase of the given tournament and times
+    every service call and JSON view on the way.
+    """
+    admin, __ = User.objects.get_or_create(
+        username="benchmark-admin",
+        defaults={"name": "Benchmark Admin", "is_superuser": True, "password": "!"},
+    )
+    cache.clear()
+    phase = queries.active_phase(tournament, force_update=True)
+    drafts = list(Draft.objects.filter(phase=phase).select_related("phase", "cube"))
+    results = {}
+
+    with measure(results, "seat_phase"):
+        services.seat_phase(phase)
+
+    # Everyone checks in before the first pairings go up
+    Enrollment.objects.filter(draft__phase=phase).update(checked_in=True)
+    cache.clear()
+
+    for draft in drafts:
+        with measure(results, "pair_round_new"):
+            services.pair_round_new(draft)
+
+    matches = list(
+        Game.objects.filter(round__draft__phase=phase).select_related(
+            "round__draft", "player1__player__user", "player2__player__user"
+        )
+    )
+    views = time_views(tournament, drafts[0], matches[0], admin, runs=view_runs)
+
+    for idx, match in enumerate(matches):
+        with measure(results, "report_result"):
+            services.report_result(
+                match, idx % 3, 2 - idx % 3, reporting_player=match.player1.player
+            )
+        with measure(results, "finish_match"):
+            services.finish_match(match)
+
+    for draft in drafts:
+        current_round = queries.current_round(draft, force_update=True)
+        with measure(results, "finish_draft_round"):
+            services.finish_draft_round(current_round)
+
+    with measure(results, "finish_event_round"):
+        services.finish_event_round(tournament)
+
+    return {"services": summarize(results), "views": views}
@@ -0,0 +1,151 @@
+from django.db import transaction
+from django.utils.text import slugify
+
+from . import pods, queries, tables
+from .models import Draft, Enrollment, Game, Round
+
+BRACKET_SIZE = 8
+
+
+def seed_order(size):
+    """Returns the seeds in bracket order, so that the top seeds can only meet
+    in the late rounds, like 1, 8, 4, 5, 2, 7, 3, 6 for eight players.
+    """
+    order = [1]
+    while len(order) < size:
+        count = len(order) * 2
+        order = [seed for top in order for seed in (top, count + 1 - top)]
+    return order
+
+
+def winner_id(game):
+    """Returns the enrollment id of the winner of a confirmed playoff match."""
+    if game.player1_wins > game.player2_wins:
+        return game.player1_id
+    return game.player2_id
+
+
+@transaction.atomic
+def create_bracket(phase, size=BRACKET_SIZE):
+    """Seeds the best players of the event standings who haven't dropped into
+    the draft of the phase and returns it.
+
+    Without a draft made by hand, one is created with a cube of the event the
+    players haven't drafted yet where possible.
+    """
+    if size < 2 or size & (size - 1):
+        raise ValueError("Brackets need a power of two players.")
+    tournament = phase.tournament
+    if Game.objects.filter(round__draft__phase=phase).exists():
+        raise ValueError("The bracket is already running.")
+
+    standings = queries.tournament_standings(tournament) or []
+    active = set(
+        Enrollment.objects.filter(
+            tournament=tournament, dropped=False, id__in=[s["id"] for s in standings]
+        ).values_list("id", flat=True)
+    )
+    seeds = [s["id"] for s in standings if s["id"] in active][:size]
+    if len(seeds) < size:
+        raise ValueError(f"The standings have {len(seeds)} of {size} players.")
+
+    draft = phase.draft_set.first()
+    if draft is None:
+        players = list(Enrollment.objects.filter(id__in=seeds))
+        cubes = list(tournament.cubes.order_by("id"))
+        if not cubes:
+            raise ValueError("The event has no cubes for the bracket draft.")
+        (cube,) = pods.assign_cubes(
+            [players],
+            cubes,
+            pods.drafted_cubes(tournament),
+        )
+        draft = Draft(
+            phase=phase,
+            cube=cube,
+            slug=slugify(f"{tournament.name}{phase.phase_idx}{cube.name}"),
+        )
+    draft.round_number = size.bit_length() - 1
+    draft.seeds = seeds
+    draft.save()
+    draft.enrollments.set(seeds)
+    tables.allocate(phase)
+    draft.refresh_from_db()
+    queries.forget_bracket(draft)
+    return draft
+
+
+@transaction.atomic
+def start(draft):
+    """Pairs the first round of the bracket of the draft and returns its
+    matches. Players are paired by seed, the better seed as player1.
+    """
+    if Round.objects.filter(draft=draft).exists():
+        raise ValueError("The bracket is already running.")
+    order = seed_order(len(draft.seeds))
+    rd = Round.objects.create(draft=draft, round_idx=1, started=True, paired=True)
+    games = Game.objects.bulk_create(
+        [
+            Game(
+                round=rd,
+                player1_id=draft.seeds[order[idx] - 1],
+                player2_id=draft.seeds[order[idx + 1] - 1],
+                table=draft.first_table + idx // 2,
+                bracket_slot=idx // 2 + 1,
+            )
+            for idx in range(0, len(order), 2)
+        ]
+    )
+    queries.forget_bracket(draft)
+    return games
+
+
+@transaction.atomic
+def advance(match):
+    """Moves the winner of a confirmed playoff match on to the next round once
+    the match it meets in the bracket is decided too. Returns the new match or
+    None.
+    """
+    # Locking the round makes sure one of two matches confirmed at the same
+    # time sees the other one decided
+    rd = (
+        Round.objects.select_for_update().select_related("draft").get(pk=match.round_id)
+    )
+    draft = rd.draft
+    queries.forget_bracket(draft)
+    games = {g.bracket_slot: g for g in Game.objects.filter(round=rd)}
+    if all(g.result_confirmed for g in games.values()):
+        rd.finished = True
+        rd.save()
+    if rd.round_idx == draft.round_number:
+        draft.finished = rd.finished
+        draft.save()
+        return None
+
+    slot = match.bracket_slot
+    other = games.get(slot + 1 if slot % 2 else slot - 1)
+    if other is None or not other.result_confirmed:
+        return None
+    next_slot = (slot + 1) // 2
+    next_rd, __ = Round.objects.get_or_create(
+        draft=draft,
+        round_idx=rd.round_idx + 1,
+        defaults={"started": True},
+    )
+    if Game.objects.filter(round=next_rd, bracket_slot=next_slot).exists():
+        return None
+
+    seed = {enrollment_id: idx for idx, enrollment_id in enumerate(draft.seeds)}
+    player1, player2 = sorted((winner_id(match), winner_id(other)), key=seed.get)
+    game = Game.objects.create(
+        round=next_rd,
+        player1_id=player1,
+        player2_id=player2,
+        table=draft.first_table + next_slot - 1,
+        bracket_slot=next_slot,
+    )
+    # The round counts as paired once all of its matches are set
+    if next_rd.game_set.count() == len(draft.seeds) // 2**next_rd.round_idx:
+        next_rd.paired = True
+        next_rd.save()
+    return game
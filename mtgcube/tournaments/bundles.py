@@ -0,0 +1,185 @@
+from pathlib import Path
+
+from django.conf import settings
+
+# Scripts of the dashboard bundle in load order, the scheduler has to come first.
+DASHBOARD_SCRIPTS = [
+    "js/scheduler.js",
+    "js/event_dashboard.js",
+    "js/current_match_preview.js",
+    "js/event_standings.js",
+    "js/timetable.js",
+    "js/pool.js",
+    "js/current_match_full.js",
+    "js/seatings.js",
+    "js/pairings.js",
+    "js/draft_standings.js",
+    "js/bracket.js",
+    "js/player_list.js",
+    "js/admin_draft.js",
+    "js/admin_match.js",
+    "js/registration_status.js",
+]
+DASHBOARD_BUNDLE = "js/dist/dashboard.min.js"
+
+IDENTIFIER = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$")
+# A line break after one of these can't end a statement, so it can be dropped.
+CONTINUES_AFTER = set("{([,;:=&|?<>*%!")
+# A line break before one of these never ends a statement either.
+CONTINUES_BEFORE = set(")]},;:.?&|=*%<>")
+# A slash after one of these starts a regular expression, not a division.
+REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_AFTER_KEYWORDS = {
+    "await",
+    "case",
+    "delete",
+    "do",
+    "else",
+    "in",
+    "instanceof",
+    "new",
+    "of",
+    "return",
+    "throw",
+    "typeof",
+    "void",
+    "yield",
+}
+
+
+def minify(source):
+    """Strips comments and redundant whitespace from a script.
+
+    Strings, template literals and regular expressions are copied verbatim, and
+    line breaks are kept wherever automatic semicolon insertion could depend on
+    them, so the output behaves exactly like the source.
+    """
+    out = []
+    templates = []  # brace depth of the ${...} expressions we are in
+    pending = ""  # whitespace seen since the last token
+    i, n = 0, len(source)
+
+    def last():
+        return out[-1][-1] if out else ""
+
+    def regex_allowed():
+        # Whether a slash starts a regular expression, decided by the previous
+        # token. Postfix ++ and -- are the only operators a division can follow.
+        if not out:
+            return True
+        prev = out[-1]
+        if prev in REGEX_AFTER_KEYWORDS:
+            return True
+        if prev in ("+", "-") and out[-2:] == [prev, prev]:
+            return False
+        return prev[-1] in REGEX_AFTER
+
+    def emit(token):
+        nonlocal pending
+        if pending and out:
+            prev, nxt = last(), token[0]
+            if "\n" in pending:
+                if prev not in CONTINUES_AFTER and nxt not in CONTINUES_BEFORE:
+                    out.append("\n")
+            elif (prev in IDENTIFIER and nxt in IDENTIFIER) or (
+                prev in "+-" and nxt == prev
+            ):
+                out.append(" ")
+        pending = ""
+        out.append(token)
+
+    def scan_template(start):
+        # Returns the end of the template chunk starting at start, which either
+        # closes the literal or opens a ${...} expression.
+        j = start
+        while j < n:
+            if source[j] == "\\":
+                j += 2
+            elif source[j] == "`":
+                return j + 1, False
+            elif source.startswith("${", j):
+                return j + 2, True
+            else:
+                j += 1
+        raise ValueError("Unterminated template literal")
+
+    while i < n:
+        c = source[i]
+        if c in " \t\r\n":
+            pending += c
+            i += 1
+        elif source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end == -1 else end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            if end == -1:
+                raise ValueError("Unterminated comment")
+            pending += " "
+            i = end + 2
+        elif c in "'\"":
+            j = i + 1
+            while j < n and source[j] != c:
+                if source[j] in "\r\n":
+                    raise ValueError("Unterminated string")
+                j += 2 if source[j] == "\\" else 1
+            emit(source[i : j + 1])
+            i = j + 1
+        elif c == "`" or (c == "}" and templates and templates[-1] == 0):
+            j, opens = scan_template(i + 1)
+            if c == "}":
+                templates.pop()
+            if opens:
+                templates.append(0)
+            emit(source[i:j])
+            i = j
+        elif c == "/" and regex_allowed():
+            j, in_class = i + 1, False
+            while j < n and (in_class or source[j] != "/"):
+                if source[j] == "\\":
+                    j += 1
+                elif source[j] == "[":
+                    in_class = True
+                elif source[j] == "]":
+                    in_class = False
+                j += 1
+            j += 1
+            while j < n and source[j] in IDENTIFIER:
+                j += 1
+            emit(source[i:j])
+            i = j
+        elif c in IDENTIFIER:
+            j = i
+            while j < n and source[j] in IDENTIFIER:
+                j += 1
+            emit(source[i:j])
+            i = j
+        else:
+            if templates and c == "{":
+                templates[-1] += 1
+            elif templates and c == "}":
+                templates[-1] -= 1
+            emit(c)
+            i += 1
+    return "".join(out) + "\n"
+
+
+def static_path(path):
+    return Path(settings.STATICFILES_DIRS[0]) / path
+
+
+def build_dashboard_bundle():
+    """Concatenates and minifies the dashboard scripts into the bundle, which is
+    picked up by collectstatic like any other static file. Returns its path.
+    """
+    sources = [
+        static_path(script).read_text(encoding="utf-8") for script in DASHBOARD_SCRIPTS
+    ]
+    bundle = static_path(DASHBOARD_BUNDLE)
+    bundle.parent.mkdir(parents=True, exist_ok=True)
+    # The semicolons keep a script ending in an expression from running into
+    # the next one.
+    bundle.write_text(
+        ";\n".join(minify(source) for source in sources), encoding="utf-8"
+    )
+    return bundle
@@ -0,0 +1,131 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Draft, Enrollment, Game
+
+# Rows fetched per database round trip while streaming an export.
+CHUNK_SIZE = 2000
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+}
+
+MATCH_COLUMNS = {
+    "phase": "round__draft__phase__phase_idx",
+    "draft": "round__draft__slug",
+    "round": "round__round_idx",
+    "table": "table",
+    "player1": "player1__player__user__name",
+    "player2": "player2__player__user__name",
+}
+RESULT_COLUMNS = {
+    **MATCH_COLUMNS,
+    "player1_wins": "player1_wins",
+    "player2_wins": "player2_wins",
+    "result": "result",
+    "reported_by": "result_reported_by",
+    "confirmed": "result_confirmed",
+}
+
+
+def _matches(columns, tournament, draft=None, phase=None, round_idx=None):
+    games = Game.objects.filter(round__draft__phase__tournament=tournament)
+    if draft is not None:
+        games = games.filter(round__draft=draft)
+    if phase is not None:
+        games = games.filter(round__draft__phase__phase_idx=phase)
+    if round_idx is not None:
+        games = games.filter(round__round_idx=round_idx)
+    games = games.order_by(
+        "round__draft__phase__phase_idx",
+        "round__draft__slug",
+        "round__round_idx",
+        "table",
+    )
+    return games.values_list(*columns.values()).iterator(chunk_size=CHUNK_SIZE)
+
+
+def pairings(tournament, draft=None, phase=None, round_idx=None):
+    return MATCH_COLUMNS, _matches(MATCH_COLUMNS, tournament, draft, phase, round_idx)
+
+
+def results(tournament, draft=None, phase=None, round_idx=None):
+    return RESULT_COLUMNS, _matches(RESULT_COLUMNS, tournament, draft, phase, round_idx)
+
+
+def _ranked(rows):
+    for rank, row in enumerate(rows, start=1):
+        yield (rank, *row)
+
+
+def standings(tournament, draft=None, phase=None, round_idx=None):
+    """Draft standings when a draft is given, otherwise the event standings.
+    Both are ordered like on the dashboards.
+    """
+    if draft is not None:
+        prefix = "draft_"
+        enrollments = draft.enrollments.all()
+    else:
+        prefix = ""
+        # Like enrollments_for_tournament, only players seated in a draft count
+        enrollments = Enrollment.objects.filter(
+            tournament=tournament,
+            id__in=Draft.enrollments.through.objects.filter(
+                draft__phase__tournament=tournament
+            ).values("enrollment_id"),
+        )
+
+    columns = {
+        "rank": None,
+        "name": "player__user__name",
+        "score": f"{prefix}score",
+        "omw": f"{prefix}omw",
+        "pgw": f"{prefix}pgw",
+        "ogw": f"{prefix}ogw",
+        "games_played": f"{prefix}games_played",
+        "games_won": f"{prefix}games_won",
+        "dropped": "dropped",
+    }
+    rows = (
+        enrollments.order_by(
+            f"-{prefix}score",
+            f"-{prefix}omw",
+            f"-{prefix}pgw",
+            f"-{prefix}ogw",
+            "-player__user__name",
+        )
+        .values_list(*list(columns.values())[1:])
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return columns, _ranked(rows)
+
+
+EXPORTS = {
+    "pairings": pairings,
+    "results": results,
+    "standings": standings,
+}
+
+
+class Echo:
+    """A file-like object that hands written lines back instead of storing them."""
+
+    def write(self, value):
+        return value
+
+
+def render(columns, rows, format):
+    """Lazily renders the rows of an export as CSV or JSON Lines, one line at a
+    time, so a response can stream them as they come from the database.
+    """
+    if format == "csv":
+        writer = csv.writer(Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        for row in rows:
+            yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
@@ -1,4 +1,8 @@
+import csv
+import io
+
 from django import forms
+from . import images
 from .models import Image
 
 from django.utils.translation import gettext_lazy as _
@@ -12,6 +16,18 @@ class ImageForm(forms.ModelForm):
 
     image = forms.ImageField()
 
+    def clean_image(self):
+        try:
+            return images.downscale(self.cleaned_data["image"])
+        except images.UNREADABLE:
+            raise forms.ValidationError(_("The image could not be read."))
+
+    def save(self, commit=True):
+        instance = super().save(commit)
+        if commit:
+            images.save_thumbnail(instance)
+        return instance
+
 
 class ReportResultForm(forms.Form):
     match_id = forms.CharField(widget=forms.HiddenInput())
@@ -29,3 +45,28 @@ class ReportResultForm(forms.Form):
 
 class ConfirmResultForm(forms.Form):
     confirm_match_id = forms.CharField(widget=forms.HiddenInput())
+
+
+class EnrollmentImportForm(forms.Form):
+    file = forms.FileField(
+        label=_("CSV file"),
+        help_text=_("One username or email address per line, or in the first column."),
+    )
+
+    def clean_file(self):
+        """Returns the usernames and email addresses listed in the file."""
+        try:
+            text = self.cleaned_data["file"].read().decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise forms.ValidationError(_("The file is not a UTF-8 encoded CSV file."))
+        identifiers = [
+            row[0].strip()
+            for row in csv.reader(io.StringIO(text))
+            if row and row[0].strip()
+        ]
+        # A header row like "username" or "email" isn't a player
+        if identifiers and identifiers[0].lower() in ("username", "email", "user"):
+            identifiers = identifiers[1:]
+        if not identifiers:
+            raise forms.ValidationError(_("The file doesn't list any players."))
+        return identifiers
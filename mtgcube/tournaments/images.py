@@ -0,0 +1,58 @@
+import io
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+# Longest edge of stored uploads, enough to read every card name of a pool photo.
+MAX_SIZE = 2048
+JPEG_QUALITY = 82
+# Longest edge of the thumbnails on the pool and judge review pages.
+THUMBNAIL_SIZE = 400
+WEBP_QUALITY = 75
+# What PIL raises for files that aren't images or decode to too many pixels,
+# the warning only once it is turned into an error.
+UNREADABLE = (
+    OSError,
+    PILImage.DecompressionBombError,
+    PILImage.DecompressionBombWarning,
+)
+
+
+def _open(file):
+    """Opens an uploaded image upright, with its EXIF orientation applied."""
+    file.seek(0)
+    image = ImageOps.exif_transpose(PILImage.open(file))
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+
+def _encode(image, format, **params):
+    # Saving without passing exif drops all metadata, GPS position included.
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **params)
+    return buffer.getvalue()
+
+
+def downscale(upload):
+    """Returns the uploaded photo as an upright JPEG that fits into MAX_SIZE,
+    stripped of its metadata.
+    """
+    image = _open(upload)
+    image.thumbnail((MAX_SIZE, MAX_SIZE), PILImage.LANCZOS)
+    content = _encode(
+        image, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True
+    )
+    name = PurePosixPath(upload.name).with_suffix(".jpg").name
+    return ContentFile(content, name=name)
+
+
+def save_thumbnail(instance):
+    """Generates the WebP thumbnail of an Image and saves it on the instance."""
+    with instance.image.open("rb") as file:
+        image = _open(file)
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), PILImage.LANCZOS)
+    content = _encode(image, "WEBP", quality=WEBP_QUALITY, method=6)
+    instance.thumbnail.save("thumbnail.webp", ContentFile(content), save=True)
@@ -0,0 +1,147 @@
+import asyncio
+import random
+import ssl
+import statistics
+import time
+from urllib.parse import urlsplit
+
+# Dashboard pages, each of them also loads the JavaScript catalog and the
+# dashboard scripts once.
+PAGES = {
+    "event": "/event-dashboard/{slug}/",
+    "draft": "/event-dashboard/{slug}/{draft_slug}/",
+}
+
+# Endpoints polled by the scripts in static/js and their polling period in
+# seconds, which the scheduler jitters by up to 20%.
+POLLS = {
+    "event": [
+        ("/event-dashboard/{slug}/{draft_slug}/~player-draft-info/", 600),
+        ("/event-dashboard/{slug}/~announcement/", 600),
+        ("/event-dashboard/{slug}/{draft_slug}/~player-match-preview/", 120),
+        ("/event-dashboard/{slug}/~standings/?window=10", 120),
+        ("/event-dashboard/{slug}/~timetable/", 120),
+    ],
+    "draft": [
+        ("/event-dashboard/{slug}/{draft_slug}/~player-basic-info/", 120),
+        ("/event-dashboard/{slug}/{draft_slug}/~seatings/", 600),
+        ("/event-dashboard/{slug}/{draft_slug}/~player-pairings/", 120),
+        ("/event-dashboard/{slug}/{draft_slug}/~draft-standings/", 120),
+        ("/event-dashboard/{slug}/{draft_slug}/~players/", 120),
+    ],
+}
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, endpoint, latency, ok):
+        self.latencies.setdefault(endpoint, []).append(latency)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self):
+        out = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            if len(samples) > 1:
+                cuts = statistics.quantiles(samples, n=100, method="inclusive")
+                p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+            else:
+                p50 = p95 = p99 = samples[0]
+            out[endpoint] = {
+                "requests": len(samples),
+                "errors": self.errors.get(endpoint, 0),
+                "error_rate": round(self.errors.get(endpoint, 0) / len(samples), 4),
+                "p50_ms": round(p50 * 1000, 1),
+                "p95_ms": round(p95 * 1000, 1),
+                "p99_ms": round(p99 * 1000, 1),
+            }
+        return out
+
+
+async def get(base_url, path, cookie, timeout):
+    """Sends a plain HTTP/1.1 GET and returns the status code."""
+    url = urlsplit(base_url)
+    secure = url.scheme == "https"
+    port = url.port or (443 if secure else 80)
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(
+            url.hostname, port, ssl=ssl.create_default_context() if secure else None
+        ),
+        timeout,
+    )
+    try:
+        writer.write(
+            (
+                f"GET {path} HTTP/1.1\r\n"
+                f"Host: {url.netloc}\r\n"
+                f"Cookie: {cookie}\r\n"
+                "Accept: application/json, text/html\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode()
+        )
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        await asyncio.wait_for(reader.read(), timeout)
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def request(stats, base_url, endpoint, path, cookie, timeout):
+    start = time.perf_counter()
+    try:
+        status = await get(base_url, path, cookie, timeout)
+        ok = status < 400
+    except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+        ok = False
+    stats.record(endpoint, time.perf_counter() - start, ok)
+
+
+async def phone(stats, base_url, client, page, duration, speedup, ramp, timeout):
+    """Opens a dashboard page like a browser would and keeps polling its endpoints
+    at the intervals of the page scripts until the duration is over.
+    """
+    page_path = PAGES[page]
+    polls = POLLS[page]
+    # Players without a draft get neither the draft dashboard nor its widgets
+    if not client["draft_slug"]:
+        if "{draft_slug}" in page_path:
+            return
+        polls = [poll for poll in polls if "{draft_slug}" not in poll[0]]
+
+    rng = random.Random(client["session"])
+    await asyncio.sleep(rng.uniform(0, ramp))
+    cookie = f"{client['cookie_name']}={client['session']}"
+    fill = {"slug": client["slug"], "draft_slug": client["draft_slug"]}
+    deadline = time.monotonic() + duration
+
+    await request(stats, base_url, page_path, page_path.format(**fill), cookie, timeout)
+    for asset in client["assets"]:
+        await request(stats, base_url, asset, asset, cookie, timeout)
+
+    async def poll(endpoint, interval):
+        while time.monotonic() < deadline:
+            await request(
+                stats, base_url, endpoint, endpoint.format(**fill), cookie, timeout
+            )
+            await asyncio.sleep(interval * rng.uniform(0.8, 1.2) / speedup)
+
+    await asyncio.gather(*[poll(endpoint, interval) for endpoint, interval in polls])
+
+
+async def run(
+    base_url, clients, page="event", duration=300, speedup=1, ramp=0, timeout=30
+):
+    """Simulates one phone per client and returns per endpoint latency statistics."""
+    stats = Stats()
+    await asyncio.gather(
+        *[
+            phone(stats, base_url, client, page, duration, speedup, ramp, timeout)
+            for client in clients
+        ]
+    )
+    return stats.summary()
@@ -0,0 +1,91 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from ... import benchmarks
+from ...synthetic import seed_event
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a synthetic event, plays one round of its active phase and reports "
+        "wall time and query counts of the services and JSON views. "
+        "Nothing is persisted unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=256)
+        parser.add_argument(
+            "--phases",
+            type=int,
+            default=2,
+            help="Amount of phases, all but the last one are played before timing.",
+        )
+        parser.add_argument("--drafts", type=int, default=None)
+        parser.add_argument("--rounds", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--view-runs", type=int, default=5)
+        parser.add_argument("--label", default="")
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument("--compare", help="JSON report to compare against.")
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options):
+        params = {
+            key: options[key]
+            for key in ("players", "phases", "drafts", "rounds", "seed", "view_runs")
+        }
+        try:
+            with transaction.atomic():
+                tournament = seed_event(
+                    f"Benchmark {timezone.now():%Y%m%d%H%M%S}",
+                    players=options["players"],
+                    phases=options["phases"],
+                    drafts=options["drafts"],
+                    rounds=options["rounds"],
+                    unplayed_phases=1,
+                    seed=options["seed"],
+                )
+                results = benchmarks.run(tournament, view_runs=options["view_runs"])
+                if not options["keep"]:
+                    raise Rollback
+        except Rollback:
+            pass
+
+        report = {
+            "label": options["label"],
+            "created": timezone.now().isoformat(),
+            "params": params,
+            **results,
+        }
+
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+
+        for section in ("services", "views"):
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{section.capitalize()}:"))
+            for name, entry in report[section].items():
+                line = (
+                    f"  {name:<40} {entry['ms_per_call']:>10.2f} ms "
+                    f"{entry['queries_per_call']:>8} queries"
+                )
+                if baseline and name in baseline.get(section, {}):
+                    old = baseline[section][name]
+                    line += (
+                        f"  ({entry['ms_per_call'] - old['ms_per_call']:+.2f} ms, "
+                        f"{entry['queries_per_call'] - old['queries_per_call']:+} queries)"
+                    )
+                self.stdout.write(line)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from ...bundles import DASHBOARD_SCRIPTS, build_dashboard_bundle
+
+
+class Command(BaseCommand):
+    help = (
+        "Bundles and minifies the dashboard scripts into a single file. "
+        "Run it before collectstatic."
+    )
+
+    def handle(self, *args, **options):
+        bundle = build_dashboard_bundle()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Bundled {len(DASHBOARD_SCRIPTS)} scripts into {bundle} "
+                f"({bundle.stat().st_size} bytes)."
+            )
+        )
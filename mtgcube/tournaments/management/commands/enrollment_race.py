@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from ... import services
+from ...models import Enrollment, Player, Tournament
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Fires parallel enrollments at a synthetic event and checks that no seat "
+        "is oversold and everyone without a seat ends up on the waitlist. Run it "
+        "against a database with row locks like PostgreSQL, the synthetic event is "
+        "deleted afterwards unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=500)
+        parser.add_argument("--capacity", type=int, default=256)
+        parser.add_argument("--workers", type=int, default=50)
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options):
+        players, capacity = options["players"], options["capacity"]
+        slug = f"enrollment-race-{timezone.now():%Y%m%d%H%M%S}"
+        tournament = Tournament.objects.create(
+            name=slug, slug=slug, player_capacity=capacity
+        )
+        users = User.objects.bulk_create(
+            [
+                User(username=f"{slug}-{idx}", name=f"Racer {idx}", password="!")
+                for idx in range(players)
+            ]
+        )
+        Player.objects.bulk_create([Player(user=user) for user in users])
+
+        start = threading.Event()
+
+        def enroll(user):
+            start.wait()
+            try:
+                if services.enroll_for_event(user, tournament):
+                    return "enrolled"
+                return "waitlisted"
+            except Exception as e:
+                return f"{type(e).__name__}: {e}"
+            finally:
+                connection.close()
+
+        try:
+            with ThreadPoolExecutor(options["workers"]) as pool:
+                futures = [pool.submit(enroll, user) for user in users]
+                began = time.perf_counter()
+                start.set()
+                outcomes = Counter(future.result() for future in futures)
+            elapsed = time.perf_counter() - began
+
+            tournament.refresh_from_db()
+            enrolled = Enrollment.objects.filter(tournament=tournament).count()
+            waitlisted = tournament.waitlist.count()
+            checks = {
+                "signed_up matches the enrollments": tournament.signed_up == enrolled,
+                "no seat is oversold": enrolled <= capacity,
+                "every seat is taken": enrolled == min(players, capacity),
+                "everyone else is waitlisted": waitlisted == players - enrolled,
+            }
+        finally:
+            if not options["keep"]:
+                tournament.delete()
+                User.objects.filter(username__startswith=f"{slug}-").delete()
+
+        self.stdout.write(
+            f"{players} enrollments with {options['workers']} workers "
+            f"in {elapsed:.2f}s:"
+        )
+        for outcome, count in outcomes.most_common():
+            self.stdout.write(f"  {count:5d} {outcome}")
+        for check, passed in checks.items():
+            style = self.style.SUCCESS if passed else self.style.ERROR
+            self.stdout.write(style(f"  {'ok' if passed else 'FAILED'}: {check}"))
+        if not all(checks.values()):
+            raise CommandError("Enrollment race checks failed.")
@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from ...models import Draft, Enrollment, Game, Image, Phase, Round
+from ...synthetic import seed_event
+
+HOT_PATH_INDEXES = [
+    "enroll_tournament_dropped_idx",
+    "enroll_bye_this_round_idx",
+    "game_round_player1_idx",
+    "game_round_player2_idx",
+    "image_user_draft_idx",
+    "phase_tournament_state_idx",
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a synthetic event and prints the query plans of the hot lookup paths "
+        "without and with the hot path indexes. Nothing is persisted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=512)
+        parser.add_argument("--phases", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                tournament = seed_event(
+                    "Explain Hot Paths",
+                    players=options["players"],
+                    phases=options["phases"],
+                    seed=options["seed"],
+                )
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+
+                sid = transaction.savepoint()
+                with connection.cursor() as cursor:
+                    for name in HOT_PATH_INDEXES:
+                        cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+                self.explain(tournament, "Without indexes")
+                transaction.savepoint_rollback(sid)
+
+                self.explain(tournament, "With indexes")
+                raise Rollback
+        except Rollback:
+            pass
+
+    def hot_paths(self, tournament):
+        draft = Draft.objects.filter(phase__tournament=tournament).last()
+        rd = Round.objects.filter(draft=draft).last()
+        enrollment = draft.enrollments.first()
+
+        return {
+            "current_match": Game.objects.filter(
+                Q(player1=enrollment) | Q(player2=enrollment), round=rd
+            ),
+            "non_player_games": Game.objects.filter(
+                ~Q(player1=enrollment) & ~Q(player2=enrollment) & Q(round=rd)
+            ).order_by("table"),
+            "active_enrollments": Enrollment.objects.filter(
+                tournament=tournament, dropped=False
+            ),
+            "bye_this_round": draft.enrollments.filter(bye_this_round=True),
+            "images": Image.objects.filter(
+                user=enrollment.player.user, draft_idx=draft.id, checkin=True
+            ),
+            "active_phase": Phase.objects.filter(
+                tournament=tournament, started=True, finished=False
+            ),
+            "current_round": Round.objects.filter(draft=draft).order_by(
+                "-round_idx"
+            )[:1],
+        }
+
+    def explain(self, tournament, title):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{title}:"))
+        for label, queryset in self.hot_paths(tournament).items():
+            self.stdout.write(self.style.MIGRATE_LABEL(f"  {label}"))
+            for line in queryset.explain().splitlines():
+                self.stdout.write(f"    {line}")
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from ...synthetic import seed_event
+
+
+class Command(BaseCommand):
+    help = "Generates a synthetic tournament with random pods and match results."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name")
+        parser.add_argument("--players", type=int, default=256)
+        parser.add_argument("--phases", type=int, default=3)
+        parser.add_argument(
+            "--drafts", type=int, default=None, help="Drafts per phase."
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=3, help="Rounds per draft."
+        )
+        parser.add_argument(
+            "--unplayed-phases",
+            type=int,
+            default=0,
+            help="Amount of trailing phases that get pods but no rounds.",
+        )
+        parser.add_argument("--no-images", action="store_true")
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        tournament = seed_event(
+            options["name"],
+            players=options["players"],
+            phases=options["phases"],
+            drafts=options["drafts"],
+            rounds=options["rounds"],
+            unplayed_phases=options["unplayed_phases"],
+            images=not options["no_images"],
+            seed=options["seed"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {tournament} ({tournament.slug}).")
+        )
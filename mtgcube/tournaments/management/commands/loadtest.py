@@ -0,0 +1,146 @@
+import asyncio
+import json
+from importlib import import_module
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import translation
+
+from mtgcube.utils.views import catalog_version
+
+from ... import loadtest, queries
+from ...templatetags.static_version import dashboard_script_urls
+from ...models import Enrollment
+
+
+class Command(BaseCommand):
+    help = (
+        "Logs in enrolled users of an event and replays the polling pattern of the "
+        "dashboard scripts against a running server, reporting latency percentiles "
+        "and error rates per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("slug", help="Slug of the event to poll.")
+        parser.add_argument("--base-url", default="http://localhost:8000")
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--page", choices=loadtest.PAGES.keys(), default="event")
+        parser.add_argument("--duration", type=float, default=300, help="Seconds.")
+        parser.add_argument(
+            "--speedup",
+            type=float,
+            default=1,
+            help="Divides the polling intervals, e.g. 10 polls ten times as often.",
+        )
+        parser.add_argument(
+            "--ramp",
+            type=float,
+            default=0,
+            help="Spread the page loads over this many seconds. "
+            "0 opens every dashboard at once, like at round start.",
+        )
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--accept-terms", action="store_true")
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        tournament = queries.get_tournament(slug=options["slug"])
+        if not tournament:
+            raise CommandError(f"No event with slug {options['slug']}.")
+
+        enrollments = list(
+            Enrollment.objects.filter(tournament=tournament, dropped=False)
+            .select_related("player__user", "tournament")
+            .order_by("id")[: options["users"]]
+        )
+        if not enrollments:
+            raise CommandError("The event has no enrollments.")
+
+        users = [e.player.user for e in enrollments]
+        if options["accept_terms"] and apps.is_installed("termsandconditions"):
+            self.accept_terms(users)
+
+        catalog = reverse(
+            "javascript-catalog",
+            kwargs={
+                "lang": translation.get_supported_language_variant(
+                    settings.LANGUAGE_CODE
+                ),
+                "version": catalog_version(),
+            },
+        )
+        assets = [catalog, *dashboard_script_urls()]
+        clients = []
+        for enrollment, user in zip(enrollments, users):
+            draft = queries.current_draft(enrollment)
+            clients.append(
+                {
+                    "cookie_name": settings.SESSION_COOKIE_NAME,
+                    "session": self.login(user),
+                    "slug": tournament.slug,
+                    "draft_slug": draft.slug if draft else "",
+                    "assets": assets,
+                }
+            )
+
+        if options["page"] == "draft" and not any(c["draft_slug"] for c in clients):
+            raise CommandError("None of the users has a draft.")
+
+        self.stdout.write(
+            f"Polling {options['page']} dashboards of {len(clients)} users "
+            f"for {options['duration']}s..."
+        )
+        report = asyncio.run(
+            loadtest.run(
+                options["base_url"],
+                clients,
+                page=options["page"],
+                duration=options["duration"],
+                speedup=options["speedup"],
+                ramp=options["ramp"],
+                timeout=options["timeout"],
+            )
+        )
+
+        self.stdout.write(
+            f"  {'endpoint':<62} {'reqs':>6} {'err%':>6} "
+            f"{'p50':>8} {'p95':>8} {'p99':>8}"
+        )
+        for endpoint, entry in report.items():
+            self.stdout.write(
+                f"  {endpoint:<62} {entry['requests']:>6} "
+                f"{entry['error_rate'] * 100:>5.1f}% {entry['p50_ms']:>6.0f}ms "
+                f"{entry['p95_ms']:>6.0f}ms {entry['p99_ms']:>6.0f}ms"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
+
+    def login(self, user):
+        """Creates an authenticated session for the given user and returns its key."""
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return session.session_key
+
+    def accept_terms(self, users):
+        """Accepts the active terms for the given users, so the terms middleware
+        doesn't redirect their requests.
+        """
+        from termsandconditions.models import TermsAndConditions, UserTermsAndConditions
+
+        UserTermsAndConditions.objects.bulk_create(
+            [
+                UserTermsAndConditions(user=user, terms=terms)
+                for terms in TermsAndConditions.get_active_terms_list()
+                for user in users
+            ],
+            ignore_conflicts=True,
+        )
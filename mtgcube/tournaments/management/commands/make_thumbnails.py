@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from ...images import save_thumbnail
+from ...models import Image
+
+
+class Command(BaseCommand):
+    help = "Generates the missing thumbnails of uploaded deck and pool images."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tournament", help="Only images of this event's drafts.")
+
+    def handle(self, *args, **options):
+        images = Image.objects.filter(thumbnail="").order_by("id")
+        if options["tournament"]:
+            images = images.filter(draft__phase__tournament__slug=options["tournament"])
+
+        made = failed = 0
+        for image in images.iterator():
+            try:
+                save_thumbnail(image)
+                made += 1
+            except (OSError, ValueError) as e:
+                failed += 1
+                self.stderr.write(f"  {image.image.name}: {e}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Made {made} thumbnails, {failed} images failed.")
+        )
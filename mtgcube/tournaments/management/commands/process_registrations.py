@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from ...registration import BATCH_SIZE, process
+
+
+class Command(BaseCommand):
+    help = (
+        "Works off the registrations queued in surge mode, meant to run from cron "
+        "next to the background thread of the web processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        processed = process(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} registrations."))
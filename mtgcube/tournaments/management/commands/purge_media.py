@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from ...media import BATCH_SIZE, purge
+
+
+class Command(BaseCommand):
+    help = "Deletes the storage files queued for deletion, meant to run from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--max-batches", type=int, help="Stop after this many batches."
+        )
+
+    def handle(self, *args, **options):
+        deleted, failed = purge(options["batch_size"], options["max_batches"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} files, {failed} failed.")
+        )
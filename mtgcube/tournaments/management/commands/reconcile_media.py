@@ -0,0 +1,53 @@
+import datetime
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...media import discard, referenced_names, walk
+from ...models import OrphanedFile
+from ...uploads import PENDING_PREFIX, UPLOAD_MAX_AGE
+
+PREFIXES = ["images/userupload", "images/thumbnails"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the uploaded images in the storage with the Image rows and "
+        "reports files without a row and rows without a file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue", action="store_true", help="Queue the orphans for deletion."
+        )
+
+    def handle(self, *args, **options):
+        referenced = referenced_names()
+        queued = set(OrphanedFile.objects.values_list("name", flat=True))
+
+        stored = set()
+        for prefix in PREFIXES:
+            stored.update(walk(default_storage, prefix))
+        # Pending uploads are only orphans once they can't be finalized anymore.
+        cutoff = timezone.now() - datetime.timedelta(seconds=UPLOAD_MAX_AGE)
+        for name in walk(default_storage, PENDING_PREFIX):
+            if default_storage.get_modified_time(name) < cutoff:
+                stored.add(name)
+
+        orphans = sorted(stored - referenced - queued)
+        missing = sorted(referenced - stored)
+        for name in orphans:
+            self.stdout.write(f"  orphan: {name}")
+        for name in missing:
+            self.stdout.write(f"  missing: {name}")
+
+        if options["queue"]:
+            discard(*orphans)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(orphans)} orphaned files"
+                + (" queued for deletion" if options["queue"] else "")
+                + f", {len(missing)} missing files."
+            )
+        )
@@ -0,0 +1,69 @@
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import pairings
+from ...models import Round
+
+
+class Command(BaseCommand):
+    help = (
+        "Pairs a played round again from the inputs stored with it and checks that "
+        "the same seed gives the same pairings. With --engine the inputs go through "
+        "another engine for comparison, --runs repeats the pairing to time it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("round_id", type=int)
+        parser.add_argument("--seed", type=int, help="Defaults to the round's seed.")
+        parser.add_argument("--engine", choices=sorted(pairings.ENGINES))
+        parser.add_argument("--runs", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rd = (
+            Round.objects.select_related("draft").filter(pk=options["round_id"]).first()
+        )
+        if rd is None:
+            raise CommandError(f"Round {options['round_id']} does not exist.")
+        log = rd.pairing_log
+        if log is None:
+            # Rounds paired across the phase share the log of the first draft
+            log = (
+                Round.objects.filter(
+                    draft__phase=rd.draft.phase_id,
+                    round_idx=rd.round_idx,
+                    pairing_log__engine="phase",
+                )
+                .values_list("pairing_log", flat=True)
+                .first()
+            )
+        if log is None:
+            raise CommandError(f"Round {rd.id} was paired without a log.")
+
+        seed = rd.seed if options["seed"] is None else options["seed"]
+        times = []
+        for __ in range(max(options["runs"], 1)):
+            pairs, byes, replayed = pairings.replay(log, seed, options["engine"])
+            times.append(replayed["report"]["solve_seconds"])
+
+        self.stdout.write(
+            f"Round {rd.round_idx} of {rd.draft}, {len(log['players'])} players, "
+            f"seed {seed}, engine {replayed['engine']}:"
+        )
+        for key, value in replayed["report"].items():
+            if key not in ("score_spread", "solve_seconds"):
+                self.stdout.write(f"  {key}: {value} (stored {log['report'][key]})")
+        self.stdout.write(
+            f"  solve_seconds: {statistics.median(times):.4f} median of "
+            f"{len(times)} (stored {log['report']['solve_seconds']:.4f})"
+        )
+
+        same = replayed["pairs"] == log["pairs"] and replayed["byes"] == log["byes"]
+        if same:
+            self.stdout.write(self.style.SUCCESS("  Pairings match the stored ones."))
+        elif options["engine"] or options["seed"] is not None:
+            self.stdout.write(
+                self.style.WARNING("  Pairings differ from the stored ones.")
+            )
+        else:
+            raise CommandError("Replaying the round gave different pairings.")
@@ -0,0 +1,127 @@
+import hashlib
+import threading
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import Image, OrphanedFile
+
+BATCH_SIZE = 100
+# Files that failed this often are left for the reconcile command to report.
+MAX_ATTEMPTS = 5
+# Well below the expiration of signed storage URLs, which is a day by default.
+URL_CACHE_TIMEOUT = 60 * 60
+
+_purging = threading.Lock()
+
+
+def discard(*names):
+    """Queues the given storage files for deletion once the transaction commits."""
+    names = [name for name in names if name]
+    if not names:
+        return
+    OrphanedFile.objects.bulk_create(
+        [OrphanedFile(name=name) for name in names], ignore_conflicts=True
+    )
+    transaction.on_commit(purge_in_background)
+
+
+def delete_images(images):
+    """Deletes the given Image queryset and queues its files for deletion, so the
+    request doesn't wait for the storage backend.
+    """
+    names = []
+    for image, thumbnail in images.values_list("image", "thumbnail"):
+        names += [image, thumbnail]
+    images.delete()
+    discard(*names)
+
+
+def purge(batch_size=BATCH_SIZE, max_batches=None):
+    """Deletes queued files from the storage in batches and returns how many
+    were deleted and how many failed.
+    """
+    deleted = failed = batches = 0
+    last_id = 0
+    while max_batches is None or batches < max_batches:
+        batch = list(
+            OrphanedFile.objects.filter(
+                id__gt=last_id, attempts__lt=MAX_ATTEMPTS
+            ).order_by("id")[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        batches += 1
+
+        done, errors = [], []
+        for orphan in batch:
+            try:
+                default_storage.delete(orphan.name)
+                done.append(orphan.id)
+            except Exception:
+                errors.append(orphan.id)
+        OrphanedFile.objects.filter(id__in=done).delete()
+        OrphanedFile.objects.filter(id__in=errors).update(attempts=F("attempts") + 1)
+        deleted += len(done)
+        failed += len(errors)
+    return deleted, failed
+
+
+def _purge_thread():
+    try:
+        purge()
+    finally:
+        connection.close()
+        _purging.release()
+
+
+def purge_in_background():
+    """Starts draining the deletion queue in a background thread of this process,
+    unless one is already running.
+    """
+    if not _purging.acquire(blocking=False):
+        return
+    threading.Thread(target=_purge_thread, name="media-purge", daemon=True).start()
+
+
+def urls(names):
+    """Returns the storage URLs of the given files by name.
+
+    Signed URLs differ on every call, so they are cached to keep the URL of a file
+    stable across page views, which lets browsers cache and prefetch the files.
+    """
+    keys = {
+        name: "media_url_" + hashlib.md5(name.encode()).hexdigest() for name in names
+    }
+    cached = cache.get_many(keys.values())
+    result, missing = {}, {}
+    for name, key in keys.items():
+        if key not in cached:
+            cached[key] = missing[key] = default_storage.url(name)
+        result[name] = cached[key]
+    cache.set_many(missing, URL_CACHE_TIMEOUT)
+    return result
+
+
+def referenced_names():
+    """Returns the names of all storage files referenced by Image rows."""
+    names = set()
+    for image, thumbnail in Image.objects.values_list("image", "thumbnail").iterator():
+        names.update(name for name in (image, thumbnail) if name)
+    return names
+
+
+def walk(storage, path):
+    """Yields the names of all files below the given path of the storage."""
+    try:
+        dirs, files = storage.listdir(path)
+    except FileNotFoundError:
+        # Only the file system storage has directories that may not exist
+        return
+    for name in files:
+        yield f"{path}/{name}" if path else name
+    for name in dirs:
+        yield from walk(storage, f"{path}/{name}" if path else name)
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.10 on 2026-10-19 13:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0046_alter_tournament_announcement_and_more"),
+  ]
+
+  operations = [
+    migrations.AddIndex(
+      model_name="enrollment",
+      index=models.Index(
+        fields=["tournament", "dropped"], name="enroll_tournament_dropped_idx"
+      ),
+    ),
+    migrations.AddIndex(
+      model_name="enrollment",
+      index=models.Index(
+        condition=models.Q(("bye_this_round", True)),
+        fields=["bye_this_round"],
+        name="enroll_bye_this_round_idx",
+      ),
+    ),
+    migrations.AddIndex(
+      model_name="game",
+      index=models.Index(fields=["round", "player1"], name="game_round_player1_idx"),
+    ),
+    migrations.AddIndex(
+      model_name="game",
+      index=models.Index(fields=["round", "player2"], name="game_round_player2_idx"),
+    ),
+    migrations.AddIndex(
+      model_name="image",
+      index=models.Index(
+        fields=["user", "draft_idx", "checkin"], name="image_user_draft_idx"
+      ),
+    ),
+    migrations.AddIndex(
+      model_name="phase",
+      index=models.Index(
+        fields=["tournament", "started", "finished"],
+        name="phase_tournament_state_idx",
+      ),
+    ),
+  ]
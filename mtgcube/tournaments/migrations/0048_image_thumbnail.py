@@ -0,0 +1,20 @@
+# Generated by Django 5.0.10 on 2026-10-19 13:59
+
+import tournaments.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0047_hot_path_indexes"),
+  ]
+
+  operations = [
+    migrations.AddField(
+      model_name="image",
+      name="thumbnail",
+      field=models.ImageField(
+        blank=True, upload_to=tournaments.models.thumbnail_directory_path
+      ),
+    ),
+  ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.10 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0048_image_thumbnail"),
+  ]
+
+  operations = [
+    migrations.CreateModel(
+      name="OrphanedFile",
+      fields=[
+        (
+          "id",
+          models.BigAutoField(
+            auto_created=True,
+            primary_key=True,
+            serialize=False,
+            verbose_name="ID",
+          ),
+        ),
+        ("name", models.CharField(max_length=255, unique=True)),
+        ("recorded_at", models.DateTimeField(auto_now_add=True)),
+        ("attempts", models.PositiveIntegerField(default=0)),
+      ],
+    ),
+  ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.10 on 2026-10-19 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0049_orphanedfile"),
+  ]
+
+  operations = [
+    migrations.AddIndex(
+      model_name="image",
+      index=models.Index(
+        fields=["draft_idx", "checkin", "user"], name="image_draft_checkin_idx"
+      ),
+    ),
+  ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.10 on 2026-10-19 14:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0050_image_draft_checkin_idx"),
+  ]
+
+  operations = [
+    migrations.CreateModel(
+      name="WaitlistEntry",
+      fields=[
+        (
+          "id",
+          models.BigAutoField(
+            auto_created=True,
+            primary_key=True,
+            serialize=False,
+            verbose_name="ID",
+          ),
+        ),
+        ("created_at", models.DateTimeField(auto_now_add=True)),
+        (
+          "player",
+          models.ForeignKey(
+            on_delete=django.db.models.deletion.CASCADE,
+            to="tournaments.player",
+          ),
+        ),
+        (
+          "tournament",
+          models.ForeignKey(
+            on_delete=django.db.models.deletion.CASCADE,
+            related_name="waitlist",
+            to="tournaments.tournament",
+          ),
+        ),
+      ],
+      options={
+        "verbose_name_plural": "waitlist entries",
+        "unique_together": {("player", "tournament")},
+      },
+    ),
+  ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.0.10 on 2026-10-19 14:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0051_waitlistentry"),
+    migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+  ]
+
+  operations = [
+    migrations.AddField(
+      model_name="tournament",
+      name="queued_registration",
+      field=models.BooleanField(default=False),
+    ),
+    migrations.CreateModel(
+      name="EnrollmentRequest",
+      fields=[
+        (
+          "id",
+          models.BigAutoField(
+            auto_created=True,
+            primary_key=True,
+            serialize=False,
+            verbose_name="ID",
+          ),
+        ),
+        ("created_at", models.DateTimeField(auto_now_add=True)),
+        (
+          "status",
+          models.CharField(
+            choices=[
+              ("pending", "Pending"),
+              ("enrolled", "Enrolled"),
+              ("waitlisted", "Waitlisted"),
+              ("failed", "Failed"),
+            ],
+            default="pending",
+            max_length=10,
+          ),
+        ),
+        ("message", models.CharField(blank=True, max_length=255)),
+        ("processed_at", models.DateTimeField(blank=True, null=True)),
+        (
+          "tournament",
+          models.ForeignKey(
+            on_delete=django.db.models.deletion.CASCADE,
+            related_name="enrollment_requests",
+            to="tournaments.tournament",
+          ),
+        ),
+        (
+          "user",
+          models.ForeignKey(
+            on_delete=django.db.models.deletion.CASCADE,
+            to=settings.AUTH_USER_MODEL,
+          ),
+        ),
+      ],
+      options={
+        "indexes": [
+          models.Index(
+            condition=models.Q(("status", "pending")),
+            fields=["tournament", "id"],
+            name="enroll_request_pending_idx",
+          )
+        ],
+        "unique_together": {("user", "tournament")},
+      },
+    ),
+  ]
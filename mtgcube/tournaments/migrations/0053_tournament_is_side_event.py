@@ -0,0 +1,27 @@
+# Generated by Django 5.0.10 on 2026-10-19 16:02
+
+from django.db import migrations, models
+
+
+def flag_side_events(apps, schema_editor):
+  Tournament = apps.get_model("tournaments", "Tournament")
+  SideEvent = apps.get_model("tournaments", "SideEvent")
+
+  Tournament.objects.filter(
+    pk__in=SideEvent.objects.values("tournament_ptr_id")
+  ).update(is_side_event=True)
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0052_tournament_queued_registration_enrollmentrequest"),
+  ]
+
+  operations = [
+    migrations.AddField(
+      model_name="tournament",
+      name="is_side_event",
+      field=models.BooleanField(default=False, editable=False),
+    ),
+    migrations.RunPython(flag_side_events, migrations.RunPython.noop),
+  ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.10 on 2026-10-19 16:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0053_tournament_is_side_event"),
+  ]
+
+  operations = [
+    migrations.AddField(
+      model_name="tournament",
+      name="cubes",
+      field=models.ManyToManyField(
+        blank=True, related_name="tournaments", to="tournaments.cube"
+      ),
+    ),
+  ]
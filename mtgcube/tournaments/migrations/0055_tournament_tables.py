@@ -0,0 +1,32 @@
+# Generated by Django 5.0.10 on 2026-10-19 16:48
+
+from django.db import migrations, models
+
+import tournaments.models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0054_tournament_cubes"),
+  ]
+
+  operations = [
+    migrations.AddField(
+      model_name="tournament",
+      name="feature_tables",
+      field=models.CharField(
+        blank=True,
+        max_length=255,
+        validators=[tournaments.models.parse_tables],
+      ),
+    ),
+    migrations.AddField(
+      model_name="tournament",
+      name="tables",
+      field=models.CharField(
+        blank=True,
+        max_length=255,
+        validators=[tournaments.models.parse_tables],
+      ),
+    ),
+  ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.10 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0055_tournament_tables"),
+  ]
+
+  operations = [
+    migrations.AddField(
+      model_name="phase",
+      name="pairing",
+      field=models.CharField(
+        choices=[("pod", "Within each pod"), ("phase", "Swiss across the phase")],
+        default="pod",
+        max_length=5,
+      ),
+    ),
+  ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.10 on 2026-10-19 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0056_phase_pairing"),
+  ]
+
+  operations = [
+    migrations.AddField(
+      model_name="round",
+      name="seed",
+      field=models.BigIntegerField(blank=True, null=True),
+    ),
+    migrations.AddField(
+      model_name="round",
+      name="pairing_log",
+      field=models.JSONField(blank=True, null=True),
+    ),
+  ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.10 on 2026-10-19 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0057_round_seed_round_pairing_log"),
+  ]
+
+  operations = [
+    migrations.AddField(
+      model_name="draft",
+      name="seeds",
+      field=models.JSONField(blank=True, null=True),
+    ),
+    migrations.AddField(
+      model_name="game",
+      name="bracket_slot",
+      field=models.PositiveSmallIntegerField(blank=True, null=True),
+    ),
+    migrations.AlterField(
+      model_name="phase",
+      name="pairing",
+      field=models.CharField(
+        choices=[
+          ("pod", "Within each pod"),
+          ("phase", "Swiss across the phase"),
+          ("bracket", "Single elimination bracket"),
+        ],
+        default="pod",
+        max_length=7,
+      ),
+    ),
+  ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.10 on 2026-10-19 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+  dependencies = [
+    ("tournaments", "0058_bracket"),
+  ]
+
+  operations = [
+    migrations.AddField(
+      model_name="image",
+      name="upload_key",
+      field=models.CharField(
+        blank=True, editable=False, max_length=255, null=True, unique=True
+      ),
+    ),
+  ]
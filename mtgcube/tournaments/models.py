@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.template.defaultfilters import slugify
 from django.utils import timezone
@@ -6,6 +7,21 @@ from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 
 import datetime
+import re
+from pathlib import PurePosixPath
+
+
+def parse_tables(value):
+    """Returns the table numbers of a list like "1-40, 45, 50-60" in order."""
+    tables = set()
+    for part in filter(None, (part.strip() for part in value.split(","))):
+        match = re.fullmatch(r"(\d+)(?:\s*-\s*(\d+))?", part)
+        if not match or int(match[2] or match[1]) < int(match[1]):
+            raise ValidationError(
+                _("%(part)s is not a table number or range."), params={"part": part}
+            )
+        tables.update(range(int(match[1]), int(match[2] or match[1]) + 1))
+    return sorted(tables)
 
 
 class Tournament(models.Model):
@@ -22,6 +38,18 @@ class Tournament(models.Model):
     announcement = models.TextField(blank=True)
     slug = models.SlugField(unique=True)
     current_round = models.IntegerField(default=0)
+    # Surge mode: registrations are queued and worked off in order
+    queued_registration = models.BooleanField(default=False)
+    # Set by SideEvent, so listings tell side events apart without joining them
+    is_side_event = models.BooleanField(default=False, editable=False)
+    # The cubes pods are built with when a phase starts
+    cubes = models.ManyToManyField("Cube", blank=True, related_name="tournaments")
+    # The venue's tables as in "1-40, 45-60", numbered from 1 up when empty
+    tables = models.CharField(max_length=255, blank=True, validators=[parse_tables])
+    # Tables the top pods of a phase play at, like "1-4"
+    feature_tables = models.CharField(
+        max_length=255, blank=True, validators=[parse_tables]
+    )
 
     def __str__(self):
         return self.name
@@ -42,14 +70,28 @@ class SideEvent(Tournament):
         Tournament, related_name="side_events", on_delete=models.CASCADE
     )
 
+    def save(self, *args, **kwargs):
+        self.is_side_event = True
+        return super().save(*args, **kwargs)
+
 
 class Phase(models.Model):
+    POD = "pod"
+    PHASE = "phase"
+    BRACKET = "bracket"
+    PAIRING_CHOICES = {
+        POD: _("Within each pod"),
+        PHASE: _("Swiss across the phase"),
+        BRACKET: _("Single elimination bracket"),
+    }
+
     id = models.AutoField(primary_key=True)
     tournament = models.ForeignKey("Tournament", on_delete=models.CASCADE)
     phase_idx = models.IntegerField("Phase Number", default=1)
     round_number = models.IntegerField("Amount of rounds", default=3)
     started = models.BooleanField(default=False)
     finished = models.BooleanField(default=False)
+    pairing = models.CharField(max_length=7, choices=PAIRING_CHOICES, default=POD)
 
     def save(self, *args, **kwargs):
         if self.phase_idx == 1:
@@ -58,6 +100,12 @@ class Phase(models.Model):
 
     class Meta:
         unique_together = ["tournament", "phase_idx"]
+        indexes = [
+            models.Index(
+                fields=["tournament", "started", "finished"],
+                name="phase_tournament_state_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.tournament.name} - Phase {self.phase_idx}"
@@ -75,6 +123,8 @@ class Draft(models.Model):
     finished = models.BooleanField(default=False)
     seated = models.BooleanField(default=False)
     slug = models.SlugField(unique=True)
+    # Enrollment ids of a playoff draft from the top seed down
+    seeds = models.JSONField(null=True, blank=True)
 
     class Meta:
         unique_together = ["phase", "cube"]
@@ -100,6 +150,10 @@ class Round(models.Model):
     paired = models.BooleanField(default=False)
     started = models.BooleanField(default=False)
     finished = models.BooleanField(default=False)
+    # Seeds the random choices of the pairing, so it can be replayed
+    seed = models.BigIntegerField(null=True, blank=True)
+    # Inputs, pairs and quality report of the pairing, see pairings.run
+    pairing_log = models.JSONField(null=True, blank=True)
 
     class Meta:
         unique_together = ["draft", "round_idx"]
@@ -149,11 +203,75 @@ class Enrollment(models.Model):
 
     class Meta:
         unique_together = ("player", "tournament")
+        indexes = [
+            models.Index(
+                fields=["tournament", "dropped"], name="enroll_tournament_dropped_idx"
+            ),
+            models.Index(
+                fields=["bye_this_round"],
+                name="enroll_bye_this_round_idx",
+                condition=models.Q(bye_this_round=True),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.player.user.name} in {self.tournament.name}"
 
 
+class WaitlistEntry(models.Model):
+    """A player waiting for a seat of a full event, seated in signup order."""
+
+    tournament = models.ForeignKey(
+        Tournament, related_name="waitlist", on_delete=models.CASCADE
+    )
+    player = models.ForeignKey(Player, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("player", "tournament")
+        verbose_name_plural = "waitlist entries"
+
+    def __str__(self):
+        return f"{self.player.user.name} waiting for {self.tournament.name}"
+
+
+class EnrollmentRequest(models.Model):
+    """A queued registration of a user for an event in surge mode."""
+
+    PENDING = "pending"
+    ENROLLED = "enrolled"
+    WAITLISTED = "waitlisted"
+    FAILED = "failed"
+    STATUS_CHOICES = {
+        PENDING: _("Pending"),
+        ENROLLED: _("Enrolled"),
+        WAITLISTED: _("Waitlisted"),
+        FAILED: _("Failed"),
+    }
+
+    tournament = models.ForeignKey(
+        Tournament, related_name="enrollment_requests", on_delete=models.CASCADE
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    message = models.CharField(max_length=255, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("user", "tournament")
+        indexes = [
+            models.Index(
+                fields=["tournament", "id"],
+                name="enroll_request_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.name} for {self.tournament.name} ({self.status})"
+
+
 class Game(models.Model):
     id = models.AutoField(primary_key=True)
     round = models.ForeignKey("Round", on_delete=models.CASCADE)
@@ -169,6 +287,14 @@ class Game(models.Model):
     result = models.CharField(max_length=200, blank=True, null=True)
     result_reported_by = models.CharField(max_length=255, blank=True, null=True)
     result_confirmed = models.BooleanField(default=False)
+    # Position of a playoff match in its bracket round, from the top
+    bracket_slot = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["round", "player1"], name="game_round_player1_idx"),
+            models.Index(fields=["round", "player2"], name="game_round_player2_idx"),
+        ]
 
     def __str__(self):
         return f"Round {self.round.round_idx}, Table {self.table}: {self.player1.player.user.name} vs {self.player2.player.user.name}"
@@ -223,15 +349,52 @@ def user_directory_path(instance, filename: str):
     return f"images/userupload/{tstring}/{instance.user.username}/{dstring}/{fname}".lower()
 
 
+def thumbnail_directory_path(instance, filename: str):
+    # images/userupload/<path>.jpg -> images/thumbnails/<path>.webp
+    path = PurePosixPath(instance.image.name).with_suffix(".webp")
+    return str(PurePosixPath("images/thumbnails", *path.parts[2:]))
+
+
 class Image(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     draft = models.ForeignKey("Draft", null=True, on_delete=models.CASCADE)
     image = models.ImageField(upload_to=user_directory_path)
+    thumbnail = models.ImageField(upload_to=thumbnail_directory_path, blank=True)
     draft_idx = models.IntegerField("Draft ID", default=0)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     checkin = models.BooleanField(default=True)
+    # Pending object of a direct upload, finalizing it again returns this image
+    upload_key = models.CharField(
+        max_length=255, null=True, blank=True, unique=True, editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "draft_idx", "checkin"], name="image_user_draft_idx"
+            ),
+            models.Index(
+                fields=["draft_idx", "checkin", "user"], name="image_draft_checkin_idx"
+            ),
+        ]
 
     def __str__(self):
         img_time_fstring = self.uploaded_at.time().strftime("%H:%M:%S")
         draft = str(self.draft) if self.draft else ""
         return f"{self.user} - {draft} - Draft ID {self.draft_idx} - {'Checkin' if self.checkin else 'Checkout'} - ({img_time_fstring})"
+
+    @property
+    def thumbnail_url(self):
+        # Uploads from before thumbnails were generated only have the original
+        return self.thumbnail.url if self.thumbnail else self.image.url
+
+
+class OrphanedFile(models.Model):
+    """A storage file that no row references anymore and is waiting for deletion."""
+
+    name = models.CharField(max_length=255, unique=True)
+    recorded_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,171 @@
+import random
+import time
+from itertools import combinations
+
+import networkx as nx
+
+# Players matched at once. Matching is cubic in the players, windows keep
+# large fields fast while still pairing within and right below a score group.
+WINDOW = 32
+# Score groups of the pod engine are split beyond this many players.
+POD_GROUP_SIZE = 25
+
+
+def new_seed():
+    """Returns a seed for the random choices of a round's pairing."""
+    return random.randrange(2**63)
+
+
+def _match(group, scores, opponents, rematches):
+    """Pairs as many players of the group as possible with the closest scores,
+    without rematches unless allowed. Returns the pairs and the players left.
+    """
+    spread = max(scores[p] for p in group) - min(scores[p] for p in group)
+    closeness = spread**2 + 1
+    graph = nx.Graph()
+    graph.add_nodes_from(group)
+    for a, b in combinations(group, 2):
+        rematch = b in opponents.get(a, ())
+        if rematch and not rematches:
+            continue
+        weight = closeness - (scores[a] - scores[b]) ** 2
+        if not rematch:
+            weight += closeness * len(group)
+        graph.add_edge(a, b, weight=weight)
+
+    pairs = nx.max_weight_matching(graph, maxcardinality=True)
+    paired = {p for pair in pairs for p in pair}
+    return list(pairs), [p for p in group if p not in paired]
+
+
+def swiss_pairs(players, scores, opponents, had_bye, rng, window=WINDOW):
+    """Pairs the players Swiss style and returns the pairs, top table first, and
+    the players with a bye.
+
+    Players go from the highest score down, shuffled within equal scores. Each
+    window is paired with as little score difference as possible and no
+    rematches, whoever is left floats down into the next window. The lowest
+    ranked player without a bye so far sits out when the field is odd.
+    """
+    order = sorted(players, key=lambda p: (-scores[p], rng.random()))
+    byes = []
+    if len(order) % 2:
+        candidates = [p for p in reversed(order) if p not in had_bye]
+        byes.append(candidates[0] if candidates else order[-1])
+        order.remove(byes[0])
+
+    pairs, floating, pos = [], [], 0
+    while pos < len(order) or floating:
+        group = floating + order[pos : pos + window - len(floating)]
+        pos += len(group) - len(floating)
+        # The last window and one full of floaters can't pass players on
+        rematches = pos >= len(order) or len(floating) >= window // 2
+        matched, floating = _match(group, scores, opponents, rematches)
+        pairs += matched
+
+    rank = {p: idx for idx, p in enumerate(order)}
+    pairs = [tuple(sorted(pair, key=rank.get)) for pair in pairs]
+    pairs.sort(key=lambda pair: rank[pair[0]])
+    return pairs, byes
+
+
+def pod_pairs(players, scores, opponents, had_bye, rng):
+    """Pairs the players of a pod and returns the pairs in table order and the
+    players with a bye.
+
+    Score groups of up to POD_GROUP_SIZE players are matched from the top with
+    random weights among players who haven't played yet, players paired down
+    weigh the most. Whoever is left drops to the next group, the players left
+    in the last group get a bye.
+    """
+    groups = {}
+    for player in players:
+        score_groups = groups.setdefault(scores[player], [[]])
+        if len(score_groups[-1]) > POD_GROUP_SIZE:
+            score_groups.append([])
+        score_groups[-1].append(player)
+    ordered = [
+        (score, group)
+        for score in sorted(groups, reverse=True)
+        for group in groups[score]
+    ]
+
+    pairs, byes = [], []
+    for idx, (points, group) in enumerate(ordered):
+        graph = nx.Graph()
+        graph.add_nodes_from(group)
+        for player in group:
+            for opponent in group:
+                if opponent not in opponents.get(player, ()) and player != opponent:
+                    weight = rng.randint(1, 9)
+                    if scores[player] > points or scores[opponent] > points:
+                        weight = 10
+                    graph.add_edge(player, opponent, weight=weight)
+
+        for a, b in dict(nx.max_weight_matching(graph)).items():
+            if a in group:
+                pairs.append((a, b))
+                group.remove(a)
+                group.remove(b)
+
+        if idx + 1 == len(ordered):
+            byes += group
+        else:
+            ordered[idx + 1][1].extend(group)
+    return pairs, byes
+
+
+ENGINES = {
+    "pod": pod_pairs,
+    "phase": swiss_pairs,
+}
+
+
+def report(pairs, byes, scores, opponents, seconds):
+    """Sums up the quality of a round's pairings."""
+    spread = [abs(scores[a] - scores[b]) for a, b in pairs]
+    return {
+        "matches": len(pairs),
+        "byes": len(byes),
+        "rematches": sum(b in opponents.get(a, ()) for a, b in pairs),
+        "pair_downs": sum(1 for s in spread if s),
+        "score_spread": spread,
+        "max_score_spread": max(spread, default=0),
+        "solve_seconds": round(seconds, 4),
+    }
+
+
+def run(engine, players, scores, opponents, had_bye, seed):
+    """Pairs the players with the given engine and seed.
+
+    Returns the pairs, the byes and a log of the inputs, results and report,
+    from which the pairing can be replayed.
+    """
+    start = time.perf_counter()
+    pairs, byes = ENGINES[engine](
+        players, scores, opponents, had_bye, random.Random(seed)
+    )
+    seconds = time.perf_counter() - start
+    log = {
+        "engine": engine,
+        "players": [[p, scores[p], p in had_bye] for p in players],
+        "opponents": sorted([a, b] for a in opponents for b in opponents[a] if a < b),
+        "pairs": [list(pair) for pair in pairs],
+        "byes": list(byes),
+        "report": report(pairs, byes, scores, opponents, seconds),
+    }
+    return pairs, byes, log
+
+
+def replay(log, seed, engine=None):
+    """Pairs the stored inputs of a pairing log again, with another engine if
+    given, and returns the new pairs, byes and log.
+    """
+    players = [p for p, __, __ in log["players"]]
+    scores = {p: score for p, score, __ in log["players"]}
+    had_bye = {p for p, __, bye in log["players"] if bye}
+    opponents = {}
+    for a, b in log["opponents"]:
+        opponents.setdefault(a, set()).add(b)
+        opponents.setdefault(b, set()).add(a)
+    return run(engine or log["engine"], players, scores, opponents, had_bye, seed)
@@ -0,0 +1,111 @@
+import math
+import random
+
+import networkx as nx
+from django.db import transaction
+from django.utils.text import slugify
+
+from . import tables
+from .models import Draft, Enrollment
+
+POD_SIZE = 8
+
+
+def pod_sizes(players, pod_size=POD_SIZE):
+    """Splits the players into as few pods as possible with at most pod_size
+    players each, evening out the pod sizes so they differ by one at most.
+    """
+    if not players:
+        return []
+    pods = math.ceil(players / pod_size)
+    small, extra = divmod(players, pods)
+    return [small + 1] * extra + [small] * (pods - extra)
+
+
+def assign_cubes(pods, cubes, drafted):
+    """Matches every pod with a cube of the pool so that as few players as
+    possible draft a cube twice. Returns the cubes in the order of the pods.
+
+    drafted maps enrollment ids to the ids of the cubes they drafted before.
+    """
+    if len(cubes) < len(pods):
+        raise ValueError(f"The event has {len(cubes)} cubes for {len(pods)} pods.")
+
+    repeats = {
+        (pod_idx, cube.id): sum(cube.id in drafted.get(e.id, ()) for e in pod)
+        for pod_idx, pod in enumerate(pods)
+        for cube in cubes
+    }
+    worst = max(repeats.values(), default=0)
+
+    graph = nx.Graph()
+    for (pod_idx, cube_id), count in repeats.items():
+        # Every pod gets a cube first, the fewest repeats come second
+        graph.add_edge(("pod", pod_idx), ("cube", cube_id), weight=worst + 1 - count)
+    matching = nx.max_weight_matching(graph, maxcardinality=True)
+
+    by_id = {cube.id: cube for cube in cubes}
+    assigned = {}
+    for a, b in matching:
+        pod, cube = (a, b) if a[0] == "pod" else (b, a)
+        assigned[pod[1]] = by_id[cube[1]]
+    return [assigned[pod_idx] for pod_idx in range(len(pods))]
+
+
+def drafted_cubes(tournament):
+    """Maps the enrollment ids of the event to the ids of the cubes they drafted."""
+    drafted = {}
+    for enrollment_id, cube_id in Draft.enrollments.through.objects.filter(
+        draft__phase__tournament=tournament
+    ).values_list("enrollment_id", "draft__cube_id"):
+        drafted.setdefault(enrollment_id, set()).add(cube_id)
+    return drafted
+
+
+@transaction.atomic
+def build_pods(phase, pod_size=POD_SIZE, seed=None):
+    """Creates the drafts of the phase from the players that haven't dropped and
+    returns them.
+
+    The first phase is drawn at random, later phases go by the event standings,
+    so players with similar records share a pod. Each pod gets a cube of the
+    event that its players haven't drafted yet where possible, and its tables.
+    """
+    tournament = phase.tournament
+    enrollments = Enrollment.objects.filter(tournament=tournament, dropped=False)
+    if phase.phase_idx == 1:
+        enrollments = list(enrollments.order_by("id"))
+        random.Random(seed).shuffle(enrollments)
+    else:
+        enrollments = list(enrollments.order_by("-score", "-omw", "-pgw", "-ogw", "id"))
+
+    pods, start = [], 0
+    for size in pod_sizes(len(enrollments), pod_size):
+        pods.append(enrollments[start : start + size])
+        start += size
+
+    cubes = assign_cubes(
+        pods, list(tournament.cubes.order_by("id")), drafted_cubes(tournament)
+    )
+
+    drafts = Draft.objects.bulk_create(
+        [
+            Draft(
+                phase=phase,
+                cube=cube,
+                round_number=phase.round_number,
+                slug=slugify(f"{tournament.name}{phase.phase_idx}{cube.name}"),
+            )
+            for cube in cubes
+        ]
+    )
+    Through = Draft.enrollments.through
+    Through.objects.bulk_create(
+        [
+            Through(draft=draft, enrollment=enrollment)
+            for draft, pod in zip(drafts, pods)
+            for enrollment in pod
+        ]
+    )
+    tables.allocate(phase)
+    return drafts
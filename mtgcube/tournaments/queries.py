@@ -1,21 +1,21 @@
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery
 from django.utils import timezone
 from django.db.models import Prefetch
 
-from itertools import chain
-
 from .models import (
     Player,
     Enrollment,
     Draft,
     Game,
     Tournament,
-    SideEvent,
     Image,
     Round,
     Phase,
+    WaitlistEntry,
+    EnrollmentRequest,
 )
 
 User = get_user_model()
@@ -51,88 +51,43 @@ def get_player(user, force_update=False):
     return get_or_set_cache(cache_key, fetch_player, 300, force_update)
 
 
-def available_tournaments(player, force_update=False):
-    """Gets all available tournaments for the given player."""
-    if player:
-        cache_key = f"available_tournaments_{player.user.id}"
-    else:
-        cache_key = "available_tournaments_admin"
-
-    def fetch_available_tournaments():
-        # Get all tournaments the player is enrolled in
-
-        now = timezone.now()
-        if player:
-            enrolled_tournament_ids = Enrollment.objects.filter(
-                player=player
-            ).values_list("tournament_id", flat=True)
-            mains = (
-                Tournament.objects.exclude(
-                    Q(id__in=enrolled_tournament_ids) | Q(end_datetime__lt=now)
-                )
-                .filter(sideevent__isnull=True, public=True)
-                .distinct()
-                .order_by("start_datetime")
-            )
-            sides = (
-                SideEvent.objects.exclude(
-                    Q(id__in=enrolled_tournament_ids) | Q(end_datetime__lt=now)
-                )
-                .filter(public=True)
-                .distinct()
-                .order_by("start_datetime")
-            )
-        else:
-            mains = (
-                Tournament.objects.exclude(Q(end_datetime__lt=now))
-                .filter(sideevent__isnull=True)
-                .distinct()
-                .order_by("start_datetime")
-            )
-            sides = (
-                SideEvent.objects.exclude(Q(end_datetime__lt=now))
-                .distinct()
-                .order_by("start_datetime")
-            )
-
-        return list(chain(mains, sides))
-
-    return get_or_set_cache(cache_key, fetch_available_tournaments, 300, force_update)
+def event_listing(user):
+    """Returns the events the user is enrolled in and the ones still open for
+    registration, both main events first.
 
+    One query fetches them all, annotated with the user's enrollment and their
+    draft of the active phase. Superusers (user None) get all events.
 
-def enrolled_tournaments(player, force_update=False):
-    """Gets all distinct tournaments from the enrollments for the given player."""
-    if player:
-        cache_key = f"enrolled_tournaments_{player.user.id}"
-    else:
-        cache_key = "enrolled_tournaments_admin"
-
-    def fetch_enrolled_tournaments():
-        now = timezone.now()
-        if player:
-            mains = (
-                Tournament.objects.filter(
-                    sideevent__isnull=True, enrollment__player=player
-                )
-                .distinct()
-                .order_by("start_datetime")
-            )
-            sides = (
-                SideEvent.objects.filter(enrollment__player=player)
-                .distinct()
-                .order_by("start_datetime")
-            )
-        else:
-            mains = (
-                Tournament.objects.filter(sideevent__isnull=True)
-                .distinct()
-                .order_by("start_datetime")
-            )
-            sides = SideEvent.objects.all().distinct().order_by("start_datetime")
-
-        return list(chain(mains, sides))
+    The listing isn't cached: enrolling changes it on every worker, which a
+    per-process cache can't invalidate, and the single query is cheap enough.
+    """
+    now = timezone.now()
+    events = Tournament.objects.order_by("is_side_event", "start_datetime")
+
+    if not user:
+        events = list(events)
+        return {
+            "enrolled": events,
+            "available": [e for e in events if e.end_datetime >= now],
+        }
+
+    enrollment = Enrollment.objects.filter(tournament=OuterRef("pk"), player__user=user)
+    active_draft = Draft.objects.filter(
+        phase__tournament=OuterRef("pk"),
+        phase__started=True,
+        phase__finished=False,
+        enrollments__player__user=user,
+    )
+    events = events.annotate(
+        enrolled=Exists(enrollment),
+        registration_finished=Subquery(enrollment.values("registration_finished")[:1]),
+        active_draft_id=Subquery(active_draft.values("id")[:1]),
+    ).filter(Q(enrolled=True) | Q(public=True, end_datetime__gte=now))
 
-    return get_or_set_cache(cache_key, fetch_enrolled_tournaments, 300, force_update)
+    enrolled, available = [], []
+    for event in events:
+        (enrolled if event.enrolled else available).append(event)
+    return {"enrolled": enrolled, "available": available}
 
 
 def enrollment_from_tournament(tournament, player, force_update=True):
@@ -207,6 +162,25 @@ def bye_this_round(draft: Draft, current_enrollment=None):
     return get_or_set_cache(cache_key, fetch_bye_this_round, None)
 
 
+def waitlist_positions(player):
+    """Returns the places of the player on the waitlists of events by event id."""
+    entries = WaitlistEntry.objects.filter(player=player).annotate(
+        position=Count(
+            "tournament__waitlist", filter=Q(tournament__waitlist__id__lte=F("id"))
+        )
+    )
+    return dict(entries.values_list("tournament_id", "position"))
+
+
+def queued_registrations(user):
+    """Returns the states of the user's queued registrations by event id."""
+    return dict(
+        EnrollmentRequest.objects.filter(user=user).values_list(
+            "tournament_id", "status"
+        )
+    )
+
+
 def timetable(tournament, current_enrollment, force_update=False):
     cache_key = f"timetable_{current_enrollment.id}"
 
@@ -224,6 +198,18 @@ def images(user, draft, checkin: bool):
     return images
 
 
+def draft_images(draft, checkin: bool):
+    """Returns the images of all players of a draft for the judge gallery,
+    grouped by player and in upload order.
+    """
+    return (
+        Image.objects.filter(draft_idx=draft.id, checkin=checkin)
+        .select_related("user")
+        .only("image", "thumbnail", "uploaded_at", "user__name", "user__username")
+        .order_by("user__name", "user_id", "uploaded_at")
+    )
+
+
 def active_drafts_for_tournament(event, force_update=False):
     """Returns all active drafts for the given tournament."""
     phase = active_phase(event, force_update=True)
@@ -245,26 +231,18 @@ def active_drafts_for_tournament(event, force_update=False):
 
 
 def get_tournament(id=None, slug=None, force_update=True):
-    """Returns the tournament with the given id or slug."""
+    """Returns the tournament with the given id or slug, as a SideEvent if it is
+    one.
+    """
     cache_key = f"tournament_{id}" if id else f"tournament_{slug}"
 
     def fetch_tournament():
-        if id:
-            try:
-                tournament = SideEvent.objects.get(pk=id)
-            except SideEvent.DoesNotExist:
-                try:
-                    tournament = Tournament.objects.get(pk=id)
-                except Tournament.DoesNotExist:
-                    return None
-        elif slug:
-            try:
-                tournament = SideEvent.objects.get(slug=slug)
-            except SideEvent.DoesNotExist:
-                try:
-                    tournament = Tournament.objects.get(slug=slug)
-                except Tournament.DoesNotExist:
-                    return None
+        tournaments = Tournament.objects.select_related("sideevent")
+        tournament = (
+            tournaments.filter(pk=id) if id else tournaments.filter(slug=slug)
+        ).first()
+        if tournament and tournament.is_side_event:
+            return tournament.sideevent
         return tournament
 
     return get_or_set_cache(cache_key, fetch_tournament, 300, force_update)
@@ -375,6 +353,21 @@ def current_round(current_draft, force_update=False):
     return get_or_set_cache(cache_key, fetch_current_round, 30, force_update)
 
 
+def draft_version(draft, current_round):
+    """Returns a version of the seating and round state of the given draft.
+
+    Cached template fragments are keyed on it, so seating, pairing, finishing or
+    resetting a round invalidates them without any explicit cache busting.
+    """
+    version = f"{draft.id}-{draft.seated:d}-{draft.finished:d}"
+    if not current_round:
+        return version
+    return (
+        f"{version}-{current_round.id}-"
+        f"{current_round.paired:d}-{current_round.finished:d}"
+    )
+
+
 def current_match(current_enroll, current_round, force_update=True):
     """Returns the current match for the given enrollment and round."""
     cache_key = (
@@ -382,15 +375,77 @@ def current_match(current_enroll, current_round, force_update=True):
     )
 
     def fetch_current_match():
+        # Matches paired across the phase are filed under the draft of player1
         match = Game.objects.filter(
             Q(player1=current_enroll) | Q(player2=current_enroll),
-            round=current_round,
+            round__draft__phase_id=current_round.draft.phase_id,
+            round__round_idx=current_round.round_idx,
         ).first()
         return None if not match else match
 
     return get_or_set_cache(cache_key, fetch_current_match, 300, force_update)
 
 
+def bracket_match(current_enroll, draft):
+    """Returns the latest match of the enrollment in the bracket of the draft,
+    given as instance or id.
+    """
+    return (
+        Game.objects.filter(
+            Q(player1=current_enroll) | Q(player2=current_enroll), round__draft=draft
+        )
+        .select_related("round", "player1__player__user", "player2__player__user")
+        .order_by("-round__round_idx")
+        .first()
+    )
+
+
+def current_assignment(user, tournament_slug, draft_slug):
+    """Returns the enrollment of the given user in the given tournament with the
+    latest round of the given draft as round_idx and round_finished, and the
+    user's match in it with both players selected as match.
+    """
+    rd = (
+        Round.objects.filter(draft__slug=draft_slug)
+        .order_by("-round_idx")
+        .values(
+            "round_idx", "finished", "draft_id", "draft__phase", "draft__phase__pairing"
+        )
+        .first()
+    )
+    assignment = Enrollment.objects.filter(
+        player__user=user, tournament__slug=tournament_slug
+    ).first()
+    if not assignment:
+        return None
+
+    assignment.match = None
+    if not rd:
+        assignment.round_idx = assignment.round_finished = None
+        return assignment
+    assignment.round_idx = rd["round_idx"]
+    assignment.round_finished = rd["finished"]
+
+    if rd["draft__phase__pairing"] == Phase.BRACKET:
+        # Rounds of a bracket overlap, players follow their own latest match
+        assignment.match = bracket_match(assignment, rd["draft_id"])
+        if assignment.match:
+            assignment.round_idx = assignment.match.round.round_idx
+            assignment.round_finished = assignment.match.round.finished
+    else:
+        # Matches paired across the phase are filed under the draft of player1
+        assignment.match = (
+            Game.objects.filter(
+                Q(player1=assignment) | Q(player2=assignment),
+                round__draft__phase=rd["draft__phase"],
+                round__round_idx=rd["round_idx"],
+            )
+            .select_related("player1__player__user", "player2__player__user")
+            .first()
+        )
+    return assignment
+
+
 def admin_round_prefetch(draft, force_update=False):
     """Returns the current round for the given draft and prefetches the games."""
     cache_key = f"admin_round_{draft.id}"
@@ -433,28 +488,25 @@ def draft_standings(draft):
     cache_key = f"draft_standings_{draft.id}_{rd_idx}"
 
     def fetch_draft_standings():
-        players = draft.enrollments.all()
-        sorted_players = sorted(
-            players,
-            key=lambda x: (
-                x.draft_score,
-                x.draft_omw,
-                x.draft_pgw,
-                x.draft_ogw,
-                x.player.user.name,
-            ),
-            reverse=True,
+        sorted_players = draft.enrollments.select_related("player__user").order_by(
+            "-draft_score",
+            "-draft_omw",
+            "-draft_pgw",
+            "-draft_ogw",
+            "-player__user__name",
         )
 
         standings_out = [
             {
+                "rank": idx + 1,
+                "id": enrollment.id,
                 "name": enrollment.player.user.name,
                 "score": enrollment.draft_score,
                 "omw": round(enrollment.draft_omw, 2),
                 "pgw": round(enrollment.draft_pgw, 2),
                 "ogw": round(enrollment.draft_ogw, 2),
             }
-            for enrollment in sorted_players
+            for idx, enrollment in enumerate(sorted_players)
         ]
 
         return standings_out
@@ -472,21 +524,23 @@ def tournament_standings(tournament):
             return None
 
         players = enrollments_for_tournament(tournament)
-        sorted_players = sorted(
-            players,
-            key=lambda x: (x.score, x.omw, x.pgw, x.ogw, x.player.user.name),
-            reverse=True,
+        if not players:
+            return None
+        sorted_players = players.select_related("player__user").order_by(
+            "-score", "-omw", "-pgw", "-ogw", "-player__user__name"
         )
 
         standings_out = [
             {
+                "rank": idx + 1,
+                "id": enrollment.id,
                 "name": enrollment.player.user.name,
                 "score": enrollment.score,
                 "omw": round(enrollment.omw, 2),
                 "pgw": round(enrollment.pgw, 2),
                 "ogw": round(enrollment.ogw, 2),
             }
-            for enrollment in sorted_players
+            for idx, enrollment in enumerate(sorted_players)
         ]
 
         return standings_out
@@ -494,6 +548,22 @@ def tournament_standings(tournament):
     return get_or_set_cache(cache_key, fetch_tournament_standings, timeout=None)
 
 
+def standings_slice(standings, offset=0, limit=None, around=None, window=0):
+    """Returns a slice of the given standings.
+    If around is given, the slice is centered on the entry with that enrollment id
+    and reaches window places above and below it.
+    """
+    if around is not None:
+        rank = next((s["rank"] for s in standings if s["id"] == around), None)
+        if rank is None:
+            return []
+        offset = max(rank - 1 - window, 0)
+        limit = 2 * window + 1
+    if limit is None:
+        return standings[offset:]
+    return standings[offset : offset + limit]
+
+
 def reset_cache(tournament):
     """Resets the cache for the given tournament."""
     cache.clear()
@@ -549,3 +619,64 @@ def player_records(tournament):
             op_wins = g.player2_wins if player_role == 1 else g.player1_wins
             outcome = 1 if p_wins > op_wins else -1 if p_wins < op_wins else 0
             player_record[draft.slug][g.round.round_idx] = outcome
+
+
+def forget_bracket(draft):
+    """Drops the cached bracket of the draft once the transaction commits."""
+    transaction.on_commit(lambda: cache.delete(f"bracket_{draft.id}"))
+
+
+def bracket(draft, force_update=False):
+    """Returns the rounds of the playoff bracket of the draft, every match with
+    its players' seeds, and the champion once the final is confirmed. Matches
+    not paired yet have no players.
+    """
+    cache_key = f"bracket_{draft.id}"
+
+    def fetch_bracket():
+        if not draft.seeds:
+            return None
+        seed = {enrollment_id: idx + 1 for idx, enrollment_id in enumerate(draft.seeds)}
+        games = {
+            (g.round.round_idx, g.bracket_slot): g
+            for g in Game.objects.filter(
+                round__draft=draft, bracket_slot__isnull=False
+            ).select_related("round", "player1__player__user", "player2__player__user")
+        }
+
+        def entry(enrollment):
+            return {
+                "seed": seed.get(enrollment.id),
+                "name": enrollment.player.user.name,
+            }
+
+        rounds, champion = [], None
+        for round_idx in range(1, draft.round_number + 1):
+            matches = []
+            for slot in range(1, len(draft.seeds) // 2**round_idx + 1):
+                game = games.get((round_idx, slot))
+                if game is None:
+                    matches.append({"slot": slot, "player1": None, "player2": None})
+                    continue
+                winner = None
+                if game.result_confirmed:
+                    winner = 1 if game.player1_wins > game.player2_wins else 2
+                matches.append(
+                    {
+                        "slot": slot,
+                        "table": game.table,
+                        "player1": entry(game.player1),
+                        "player2": entry(game.player2),
+                        "result": game.result,
+                        "confirmed": game.result_confirmed,
+                        "winner": winner,
+                    }
+                )
+            rounds.append({"round": round_idx, "matches": matches})
+
+        final = rounds[-1]["matches"][0] if rounds else {}
+        if final.get("winner"):
+            champion = final[f"player{final['winner']}"]
+        return {"rounds": rounds, "champion": champion}
+
+    return get_or_set_cache(cache_key, fetch_bracket, 30, force_update)
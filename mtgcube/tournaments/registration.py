@@ -0,0 +1,118 @@
+import threading
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import services
+from .models import EnrollmentRequest, Tournament
+
+BATCH_SIZE = 100
+
+_processing = threading.Lock()
+
+
+def submit(user, tournament):
+    """Queues a registration of the user for the event in surge mode and returns
+    it. Submitting again returns the registration that is already queued, one
+    that failed or ended on the waitlist is queued again.
+    """
+    request, created = EnrollmentRequest.objects.get_or_create(
+        user=user, tournament=tournament
+    )
+    if not created and request.status in (
+        EnrollmentRequest.FAILED,
+        EnrollmentRequest.WAITLISTED,
+    ):
+        request.status = EnrollmentRequest.PENDING
+        request.message = ""
+        request.processed_at = None
+        request.save()
+    transaction.on_commit(process_in_background)
+    return request
+
+
+def status(user, tournament):
+    """Returns the state of the user's queued registration for the event, with the
+    amount of registrations ahead of it while it is pending, or None.
+    """
+    request = EnrollmentRequest.objects.filter(user=user, tournament=tournament).first()
+    if not request:
+        return None
+    data = {"status": request.status, "message": request.message}
+    if request.status == EnrollmentRequest.PENDING:
+        data["ahead"] = EnrollmentRequest.objects.filter(
+            tournament=tournament, status=EnrollmentRequest.PENDING, id__lt=request.id
+        ).count()
+    return data
+
+
+def process(batch_size=BATCH_SIZE):
+    """Works off the queued registrations in the order they came in and returns
+    how many were processed.
+
+    Each batch runs with the event row locked, so only one worker at a time takes
+    seats of an event and no registration overtakes an earlier one.
+    """
+    processed = 0
+    while True:
+        with transaction.atomic():
+            tournament = (
+                Tournament.objects.select_for_update(skip_locked=True)
+                .filter(
+                    id__in=EnrollmentRequest.objects.filter(
+                        status=EnrollmentRequest.PENDING
+                    ).values("tournament_id")
+                )
+                .order_by("id")
+                .first()
+            )
+            if tournament is None:
+                return processed
+
+            requests = list(
+                EnrollmentRequest.objects.filter(
+                    tournament=tournament, status=EnrollmentRequest.PENDING
+                )
+                .select_related("user")
+                .order_by("id")[:batch_size]
+            )
+            for request in requests:
+                try:
+                    if services.enroll_for_event(request.user, tournament):
+                        request.status = EnrollmentRequest.ENROLLED
+                    else:
+                        request.status = EnrollmentRequest.WAITLISTED
+                except ValueError as e:
+                    request.status = EnrollmentRequest.FAILED
+                    request.message = str(e)[:255]
+                request.processed_at = timezone.now()
+            EnrollmentRequest.objects.bulk_update(
+                requests, ["status", "message", "processed_at"]
+            )
+            processed += len(requests)
+
+
+def _process_thread():
+    try:
+        while True:
+            try:
+                processed = process()
+            finally:
+                _processing.release()
+            # Registrations queued while the last batch was committed found the
+            # lock taken, another round picks them up
+            if not processed or not _processing.acquire(blocking=False):
+                return
+    finally:
+        connection.close()
+
+
+def process_in_background():
+    """Starts working off the queue in a background thread of this process, unless
+    one is already running.
+    """
+    if not _processing.acquire(blocking=False):
+        return
+    threading.Thread(
+        target=_process_thread, name="registration-queue", daemon=True
+    ).start()
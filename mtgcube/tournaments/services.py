@@ -1,37 +1,113 @@
 import random
 
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Q
 from django.utils import timezone
-import networkx as nx
 
-from .models import Game, Enrollment, Round, Draft, Phase
-from . import queries
+from .models import (
+  Game,
+  Enrollment,
+  Round,
+  Draft,
+  Phase,
+  Image,
+  Player,
+  Tournament,
+  WaitlistEntry,
+)
+from . import brackets, media, pairings, queries, tables
 
 
 def seat_draft(draft):
-  reset_draft_scores(draft)
-  players = list(draft.enrollments.filter(dropped=False))
-
-  random.shuffle(players)
-  for idx, player in enumerate(players):
-    player.seat = idx + 1
-  draft.seated = True
-  draft.started = True
-  draft.save()
+  seat_drafts([draft])
+
+
+@transaction.atomic
+def seat_drafts(drafts, rng=random):
+  """Resets the draft scores of the players of the given drafts, shuffles them
+  into seats and saves all of them in bulk.
+  """
+  if not drafts:
+    return
+
+  Through = Draft.enrollments.through
+  players = {draft.id: [] for draft in drafts}
+  for row in Through.objects.filter(draft__in=drafts).select_related("enrollment"):
+    players[row.draft_id].append(row.enrollment)
+
+  enrollments = []
+  for draft in drafts:
+    seated = [p for p in players[draft.id] if not p.dropped]
+    rng.shuffle(seated)
+    for idx, player in enumerate(seated):
+      player.seat = idx + 1
+    for player in players[draft.id]:
+      if player.dropped:
+        player.seat = 0
+      player.draft_score = 0
+      player.draft_games_played = 0
+      player.draft_games_won = 0
+      player.draft_omw = 0.0
+      player.draft_pgw = 0.0
+      player.draft_ogw = 0.0
+      player.had_bye = False
+      player.checked_in = False
+      player.checked_out = False
+      enrollments.append(player)
+
+    draft.seated = True
+    draft.started = True
+
+  ids = [e.id for e in enrollments]
+  Enrollment.pairings.through.objects.filter(
+    Q(from_enrollment__in=ids) | Q(to_enrollment__in=ids)
+  ).delete()
+  Enrollment.objects.bulk_update(
+    enrollments,
+    [
+      "seat",
+      "draft_score",
+      "draft_games_played",
+      "draft_games_won",
+      "draft_omw",
+      "draft_pgw",
+      "draft_ogw",
+      "had_bye",
+      "checked_in",
+      "checked_out",
+    ],
+    batch_size=500,
+  )
+  Draft.objects.bulk_update(drafts, ["seated", "started"])
+
 
+@transaction.atomic
+def seat_phase(phase, rng=random):
+  """Seats all drafts of the phase that aren't seated yet at tables of their
+  own and returns them.
+  """
+  drafts = tables.allocate(phase)
+  seat_drafts(drafts, rng)
+  return drafts
 
-def pair_round_new(draft):
+
+def pair_round_new(draft, seed=None):
   current_round = queries.current_round(draft, force_update=True)
 
+  if seed is None:
+    seed = pairings.new_seed()
   if current_round:
     if current_round.round_idx == draft.round_number:
-      return IndexError("Draft already has all rounds.")
-    new_rd = Round(draft=draft, round_idx=current_round.round_idx + 1, started=True)
+      raise ValueError("Draft already has all rounds.")
+    new_rd = Round(
+      draft=draft, round_idx=current_round.round_idx + 1, started=True, seed=seed
+    )
     new_rd.save()
   else:
-    new_rd = Round(draft=draft, round_idx=1)
+    new_rd = Round(draft=draft, round_idx=1, seed=seed)
     new_rd.save()
 
-  players = list(Enrollment.objects.filter(draft=draft, dropped=False))
+  players = list(Enrollment.objects.filter(draft=draft, dropped=False).order_by("id"))
 
   # Clear old round pairings
   for player in players:
@@ -39,113 +115,108 @@ def pair_round_new(draft):
     player.bye_this_round = False
     player.save()
 
-  startingTable = draft.first_table
-
-  openTable = startingTable
-
-  # Contains lists of players sorted by how many points they currently have
-  pointLists = {}
-
-  # Contains a list of points in the event from high to low
-  pointTotals = []
-
-  # Counts our groupings for each point amount
-  countPoints = {}
+  opponents = {}
+  for a, b in Enrollment.pairings.through.objects.filter(
+    from_enrollment__in=players
+  ).values_list("from_enrollment_id", "to_enrollment_id"):
+    opponents.setdefault(a, set()).add(b)
+
+  by_id = {player.id: player for player in players}
+  pairs, byes, log = pairings.run(
+    "pod",
+    list(by_id),
+    {player.id: player.draft_score for player in players},
+    opponents,
+    {player.id for player in players if player.had_bye},
+    seed,
+  )
 
-  # Add all players to pointLists
-  for player in players:
-    # If this point amount isn't in the list, add it
-    if "%s_1" % player.draft_score not in pointLists:
-      pointLists["%s_1" % player.draft_score] = []
-      countPoints[player.draft_score] = 1
-
-    # Breakers the players into groups of their current points up to the max group allowed.
-    # Smaller groups mean faster calculations
-    if (
-      len(pointLists["%s_%s" % (player.draft_score, countPoints[player.draft_score])])
-      > 25
-    ):
-      countPoints[player.draft_score] += 1
-      pointLists["%s_%s" % (player.draft_score, countPoints[player.draft_score])] = []
-
-    # Add our player to the correct group
-    pointLists["%s_%s" % (player.draft_score, countPoints[player.draft_score])].append(
-      player
-    )
+  for table, (a, b) in enumerate(pairs, start=draft.first_table):
+    pair(new_rd, by_id[a], by_id[b], table)
+  for player_id in byes:
+    assign_bye(by_id[player_id])
+
+  new_rd.pairing_log = log
+  new_rd.save()
+
+
+@transaction.atomic
+def pair_phase_round(phase, seed=None):
+  """Pairs the next round of the phase across all of its pods by event score
+  and the match history of the whole event, and returns the new matches.
+
+  Every draft of the phase gets the round, each match is filed under the
+  round of its first player's draft. Tables are numbered over the venue, the
+  top matches at the feature tables.
+  """
+  tournament = phase.tournament
+  rounds = Round.objects.filter(draft__phase=phase)
+  if rounds.filter(finished=False).exists():
+    raise ValueError("The current round of the phase isn't finished yet.")
+  round_idx = (rounds.aggregate(last=Max("round_idx"))["last"] or 0) + 1
+  if round_idx > phase.round_number:
+    raise ValueError("The phase already has all rounds.")
+
+  draft_of = dict(
+    Draft.enrollments.through.objects.filter(
+      draft__phase=phase, enrollment__dropped=False
+    ).values_list("enrollment_id", "draft_id")
+  )
+  players = Enrollment.objects.in_bulk(draft_of)
+  opponents = {}
+  for a, b in Game.objects.filter(
+    round__draft__phase__tournament=tournament
+  ).values_list("player1_id", "player2_id"):
+    opponents.setdefault(a, set()).add(b)
+    opponents.setdefault(b, set()).add(a)
+
+  if seed is None:
+    seed = pairings.new_seed()
+  pairs, byes, log = pairings.run(
+    "phase",
+    sorted(players),
+    {p.id: p.score for p in players.values()},
+    opponents,
+    {p.id for p in players.values() if p.had_bye},
+    seed,
+  )
+  numbers = tables.venue_tables(tournament, len(pairs))
 
-  # Add all points in use to pointTotals
-  for points in pointLists:
-    pointTotals.append(points)
-
-  # Sort our point groups based on points
-  pointTotals.sort(reverse=True, key=lambda s: int(s.split("_")[0]))
-
-  print("Point totals after sorting high to low are: %s" % pointTotals, 3)
-
-  # Actually pair the players utilizing graph theory networkx
-  for points in pointTotals:
-    print(points, 5)
-
-    # Create the graph object and add all players to it
-    bracketGraph = nx.Graph()
-    bracketGraph.add_nodes_from(pointLists[points])
-
-    print(pointLists[points], 5)
-    print(bracketGraph.nodes(), 5)
-
-    # Create edges between all players in the graph who haven't already played
-    for player in bracketGraph.nodes():
-      for opponent in bracketGraph.nodes():
-        if opponent not in player.pairings.all() and player != opponent:
-          # Weight edges randomly between 1 and 9 to ensure pairings are not always the same with
-          # the same list of players
-          wgt = random.randint(1, 9)
-          # If a player has more points, weigh them the highest, so they get paired first
-          if player.draft_score > int(
-            points.split("_")[0]
-          ) or opponent.draft_score > int(points.split("_")[0]):
-            wgt = 10
-          # Create edge
-          bracketGraph.add_edge(player, opponent, weight=wgt)
-
-    # Generate pairings from the created graph
-    pairings = dict(nx.max_weight_matching(bracketGraph))
-
-    print(pairings, 3)
-
-    # Actually pair the players based on the matching we found
-    for p in pairings:
-      if p in pointLists[points]:
-        pair(new_rd, p, pairings[p], openTable)
-        openTable += 1
-        pointLists[points].remove(p)
-        pointLists[points].remove(pairings[p])
-
-    print(pointLists[points], 5)
-
-    # Check if we have an odd man out that we need to pair down
-    if len(pointLists[points]) > 0:
-      # Check to make sure we aren't at the last player in the event
-      print(
-        "Player %s left in %s. The index is %s and the length of totals is %s"
-        % (
-          pointLists[points][0],
-          points,
-          pointTotals.index(points),
-          len(pointTotals),
-        ),
-        3,
+  new_rounds = Round.objects.bulk_create(
+    [
+      Round(
+        draft_id=draft_id, round_idx=round_idx, started=True, paired=True, seed=seed
       )
-      if pointTotals.index(points) + 1 == len(pointTotals):
-        while len(pointLists[points]) > 0:
-          # If they are the last player give them a bye
-          assign_bye(pointLists[points].pop(0))
-      else:
-        # Add our player to the next point group down
-        nextPoints = pointTotals[pointTotals.index(points) + 1]
+      for draft_id in Draft.objects.filter(phase=phase)
+      .order_by("id")
+      .values_list("id", flat=True)
+    ]
+  )
+  # One log for the whole round, kept with the first draft's round
+  if new_rounds:
+    new_rounds[0].pairing_log = log
+    new_rounds[0].save(update_fields=["pairing_log"])
+  round_of = {rd.draft_id: rd for rd in new_rounds}
+  games = Game.objects.bulk_create(
+    [
+      Game(round=round_of[draft_of[a]], player1_id=a, player2_id=b, table=table)
+      for (a, b), table in zip(pairs, numbers)
+    ]
+  )
 
-        while len(pointLists[points]) > 0:
-          pointLists[nextPoints].append(pointLists[points].pop(0))
+  Through = Enrollment.pairings.through
+  Through.objects.bulk_create(
+    [
+      Through(from_enrollment_id=x, to_enrollment_id=y)
+      for a, b in pairs
+      for x, y in ((a, b), (b, a))
+    ],
+    ignore_conflicts=True,
+  )
+  Enrollment.objects.filter(id__in=players).update(paired=True, bye_this_round=False)
+  for player_id in byes:
+    assign_bye(players[player_id])
+  return games
 
 
 def assign_bye(player):
@@ -210,6 +281,9 @@ def finish_match(match):
   p1.save()
   p2.save()
 
+  if match.bracket_slot is not None:
+    brackets.advance(match)
+
 
 def update_draft_tiebreakers(draft):
   players = draft.enrollments.all()
@@ -312,7 +386,7 @@ def finish_event_round(tournament):
   )
 
   for idx, p in enumerate(sorted_players):
-    p.place = idx + 1
+    p.tournament_place = idx + 1
     p.save()
 
 
@@ -365,22 +439,22 @@ def clear_histories(draft):
     player.draft_omw = 0
     player.draft_pgw = 0
     player.draft_ogw = 0
-    player.place = 0
+    player.tournament_place = 0
     player.draft_place = 0
     player.pairings.clear()
     player.paired = False
     player.had_bye = False
     player.bye_this_round = False
-    checkin_images = queries.images(player.player.user, draft, checkin=True)
-    for img in checkin_images:
-      img.delete()
-    checkout_images = queries.images(player.player.user, draft, checkin=False)
-    for img in checkout_images:
-      img.delete()
     player.checked_in = False
     player.checked_out = False
     player.save()
 
+  media.delete_images(
+    Image.objects.filter(
+      draft_idx=draft.id, user__in=players.values("player__user")
+    )
+  )
+
   for rd in rounds:
     rd.delete()
 
@@ -404,6 +478,8 @@ def reset_tournament(tournament):
 def report_result(match, player1_wins, player2_wins, reporting_player, admin=False):
   if int(player1_wins) + int(player2_wins) > 3:
     raise ValueError("Error: Please enter a valid game result.")
+  if match.bracket_slot is not None and int(player1_wins) == int(player2_wins):
+    raise ValueError("Error: Playoff matches need a winner.")
 
   match.player1_wins = int(player1_wins)
   match.player2_wins = int(player2_wins)
@@ -416,31 +492,110 @@ def report_result(match, player1_wins, player2_wins, reporting_player, admin=Fal
   match.save()
 
 
-def enroll_for_event(user, tournament):
-  user_player = queries.get_player(user)
+def reserve_seats(tournament, count=1):
+  """Takes the given amount of seats of the event if they are still free.
 
-  if tournament.signed_up >= tournament.player_capacity:
-    raise ValueError("Event is full.")
+  The capacity check and the increment are a single conditional UPDATE, so
+  concurrent registrations neither overbook the event nor rewrite its whole row.
+  """
+  return bool(
+    Tournament.objects.filter(
+      pk=tournament.pk, signed_up__lte=F("player_capacity") - count
+    ).update(signed_up=F("signed_up") + count)
+  )
 
-  enroll = queries.enrollment_from_tournament(tournament, user_player)
-  if enroll:
+
+def enroll_for_event(user, tournament, waitlist=True):
+  """Enrolls the user and returns the enrollment. If the event is full, the user
+  is put on its waitlist instead and None is returned, unless waitlist is False.
+  """
+  user_player = queries.get_player(user)
+
+  # The tournament may come from the cache, so its signed_up is not trusted
+  if Enrollment.objects.filter(tournament=tournament, player=user_player).exists():
     raise ValueError("User is already enrolled in this event.")
 
-  # if timezone.now() >= tournament.start_datetime:
-  #   raise ValueError("Event has already started")
+  with transaction.atomic():
+    if not reserve_seats(tournament):
+      if not waitlist:
+        raise ValueError("Event is full.")
+      __, created = WaitlistEntry.objects.get_or_create(
+        tournament=tournament, player=user_player
+      )
+      if not created:
+        raise ValueError("User is already on the waitlist of this event.")
+      return None
+
+    try:
+      # The nested block keeps the outer transaction usable after the error,
+      # raising out of it then releases the reserved seat again
+      with transaction.atomic():
+        enrollment = Enrollment.objects.create(
+          tournament=tournament, player=user_player, registration_finished=True
+        )
+    except IntegrityError as exc:
+      raise ValueError("User is already enrolled in this event.") from exc
+    WaitlistEntry.objects.filter(tournament=tournament, player=user_player).delete()
+
+  return enrollment
+
+
+@transaction.atomic
+def promote_waitlist(tournament):
+  """Enrolls waitlisted players in signup order while the event has free seats
+  and returns the new enrollments.
+  """
+  tournament.refresh_from_db(fields=["signed_up", "player_capacity"])
+  free = tournament.player_capacity - tournament.signed_up
+  if free <= 0:
+    return []
+
+  entries = list(
+    WaitlistEntry.objects.select_for_update(skip_locked=True)
+    .filter(tournament=tournament)
+    .select_related("player__user")
+    .order_by("id")[:free]
+  )
+  return bulk_enroll_for_event([e.player.user for e in entries], tournament)
+
+
+@transaction.atomic
+def bulk_enroll_for_event(users, tournament):
+  """Enrolls all given users in one transaction and returns the new enrollments.
 
-  # try:
-  # tournament.tournament # NOTE: what does this meeeean
+  Users that are already enrolled are skipped, missing Player rows are created.
+  Raises a ValueError without enrolling anyone if the event can't fit them all.
+  """
+  users = [user for user in users if not user.is_superuser]
 
-  Enrollment.objects.create(
-    tournament=tournament, player=user_player, registration_finished=True
+  players = {p.user_id: p for p in Player.objects.filter(user__in=users)}
+  missing = [Player(user=u, name=u.name) for u in users if u.id not in players]
+  for player in Player.objects.bulk_create(missing):
+    players[player.user_id] = player
+
+  enrolled = set(
+    Enrollment.objects.filter(
+      tournament=tournament, player__in=players.values()
+    ).values_list("player_id", flat=True)
   )
-  
-  # TODO: ???
-  # except AttributeError:
-  # Enrollment.objects.create(
-  #   tournament=tournament, player=user_player, registration_finished=True
-  # )
-
-  tournament.signed_up += 1
-  tournament.save()
+  new = [
+    Enrollment(tournament=tournament, player=player, registration_finished=True)
+    for player in players.values()
+    if player.id not in enrolled
+  ]
+  if not new:
+    return []
+
+  if not reserve_seats(tournament, len(new)):
+    tournament.refresh_from_db(fields=["signed_up", "player_capacity"])
+    free = max(tournament.player_capacity - tournament.signed_up, 0)
+    raise ValueError(
+      f"Event is full: {len(new)} players don't fit into {free} free seats."
+    )
+
+  enrollments = Enrollment.objects.bulk_create(new)
+  WaitlistEntry.objects.filter(
+    tournament=tournament, player__in=players.values()
+  ).delete()
+  tournament.refresh_from_db(fields=["signed_up"])
+  return enrollments
@@ -0,0 +1,304 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.text import slugify
+
+from .models import (
+    Cube,
+    Draft,
+    Enrollment,
+    Game,
+    Image,
+    Phase,
+    Player,
+    Round,
+    Tournament,
+)
+
+User = get_user_model()
+
+RESULTS = [(2, 0), (2, 1), (1, 2), (0, 2), (1, 1)]
+
+
+def _update_tiebreakers(enrollments, pods, games, draft_rounds, event_rounds):
+    """Sets the tiebreakers and places the way services.finish_draft_round and
+    services.finish_event_round do after the last played round, in memory.
+    pods are the members of the drafts of the last played phase.
+    """
+    history = {e.id: [] for e in enrollments}
+    for g in games:
+        history[g.player1.id].append(g.player2)
+        history[g.player2.id].append(g.player1)
+
+    for p in enrollments:
+        p.pmw = max(round((p.score // 3) / event_rounds, 4), 0.33)
+        try:
+            p.pgw = max(round(p.games_won / p.games_played, 4), 0.33)
+        except ZeroDivisionError:
+            p.pgw = 1.0
+    for p in enrollments:
+        p.omw = max(round(sum(o.pmw for o in history[p.id]) / event_rounds, 4), 0.33)
+        p.ogw = max(round(sum(o.pgw for o in history[p.id]) / event_rounds, 4), 0.33)
+    ranked = sorted(
+        enrollments, key=lambda x: (x.score, x.omw, x.pgw, x.ogw), reverse=True
+    )
+    for idx, p in enumerate(ranked):
+        p.tournament_place = idx + 1
+
+    for p in (p for members in pods for p in members):
+        p.draft_pmw = max(round((p.draft_score // 3) / draft_rounds, 4), 0.33)
+        try:
+            p.draft_pgw = max(round(p.draft_games_won / p.draft_games_played, 4), 0.33)
+        except ZeroDivisionError:
+            p.draft_pgw = 1.0
+    for members in pods:
+        for p in members:
+            # Like Enrollment.pairings, every opponent of the event counts once
+            opponents = {o.id: o for o in history[p.id]}.values()
+            if not opponents:
+                p.draft_omw = p.draft_ogw = 1.0
+                continue
+            omw = sum(o.draft_pmw for o in opponents)
+            ogw = sum(o.draft_pgw for o in opponents)
+            p.draft_omw = max(round(omw / draft_rounds, 4), 0.33)
+            p.draft_ogw = max(round(ogw / draft_rounds, 4), 0.33)
+        ranked = sorted(
+            members,
+            key=lambda x: (x.draft_score, x.draft_omw, x.draft_pgw, x.draft_ogw),
+            reverse=True,
+        )
+        for idx, p in enumerate(ranked):
+            p.draft_place = idx + 1
+
+
+@transaction.atomic
+def seed_event(
+    name,
+    players=256,
+    phases=3,
+    drafts=None,
+    rounds=3,
+    unplayed_phases=0,
+    images=True,
+    seed=None,
+):
+    """Creates a synthetic tournament with random pods and match results.
+    Every phase gets its own set of pods (players // 8 unless drafts is given),
+    every pod plays the given amount of rounds. The last unplayed_phases phases
+    get pods but no rounds, the first of them is started.
+    All rows are written with bulk_create, so large fields seed in seconds.
+    """
+    rng = random.Random(seed)
+    slug = slugify(name)
+    played_phases = phases - unplayed_phases
+    pods = drafts or max(players // 8, 1)
+    pod_size = players // pods
+
+    tournament = Tournament.objects.create(
+        name=name,
+        slug=slug,
+        player_capacity=players,
+        signed_up=players,
+        current_round=played_phases * rounds + 1,
+    )
+
+    users = User.objects.bulk_create(
+        [
+            User(username=f"{slug}-{idx}", name=f"Player {idx}", password="!")
+            for idx in range(players)
+        ]
+    )
+    player_objs = Player.objects.bulk_create(
+        [Player(user=user, name=user.name) for user in users]
+    )
+    enrollments = Enrollment.objects.bulk_create(
+        [
+            Enrollment(player=p, tournament=tournament, registration_finished=True)
+            for p in player_objs
+        ]
+    )
+
+    cubes = Cube.objects.bulk_create(
+        [
+            Cube(
+                name=f"{name} Cube {idx}",
+                url=f"https://example.com/{slug}/cube-{idx}",
+                slug=f"{slug}-cube-{idx}",
+            )
+            for idx in range(pods * phases)
+        ]
+    )
+    phase_objs = Phase.objects.bulk_create(
+        [
+            Phase(
+                tournament=tournament,
+                phase_idx=idx + 1,
+                round_number=rounds,
+                started=idx <= played_phases,
+                finished=idx < played_phases,
+            )
+            for idx in range(phases)
+        ]
+    )
+
+    draft_rows = []
+    pod_members = []
+    for phase in phase_objs:
+        shuffled = enrollments[:]
+        rng.shuffle(shuffled)
+        for pod in range(pods):
+            cube = cubes[(phase.phase_idx - 1) * pods + pod]
+            draft_rows.append(
+                Draft(
+                    phase=phase,
+                    cube=cube,
+                    round_number=rounds,
+                    first_table=pod * pod_size // 2 + 1,
+                    last_table=(pod + 1) * pod_size // 2,
+                    started=phase.phase_idx <= played_phases,
+                    seated=phase.phase_idx <= played_phases,
+                    finished=phase.phase_idx <= played_phases,
+                    slug=slugify(f"{name}{phase.phase_idx}{cube.name}"),
+                )
+            )
+            pod_members.append(shuffled[pod * pod_size : (pod + 1) * pod_size])
+    draft_objs = Draft.objects.bulk_create(draft_rows)
+    played = [
+        (draft, members)
+        for draft, members in zip(draft_objs, pod_members)
+        if draft.phase.phase_idx <= played_phases
+    ]
+
+    Through = Draft.enrollments.through
+    Through.objects.bulk_create(
+        [
+            Through(draft=draft, enrollment=e)
+            for draft, members in zip(draft_objs, pod_members)
+            for e in members
+        ]
+    )
+
+    round_objs = Round.objects.bulk_create(
+        [
+            Round(
+                draft=draft,
+                round_idx=idx + 1,
+                paired=True,
+                started=True,
+                finished=True,
+            )
+            for draft, __ in played
+            for idx in range(rounds)
+        ]
+    )
+
+    games = []
+    for rd_idx, rd in enumerate(round_objs):
+        members = played[rd_idx // rounds][1][:]
+        rng.shuffle(members)
+        # Draft stats are reset at seating, so only the last played phase counts
+        last_phase = rd.draft.phase.phase_idx == played_phases
+        for table, (p1, p2) in enumerate(zip(members[::2], members[1::2])):
+            p1_wins, p2_wins = rng.choice(RESULTS)
+            games.append(
+                Game(
+                    round=rd,
+                    table=rd.draft.first_table + table,
+                    player1=p1,
+                    player2=p2,
+                    player1_wins=p1_wins,
+                    player2_wins=p2_wins,
+                    result=f"{p1_wins}-{p2_wins}",
+                    result_reported_by=p1.player.user.name,
+                    result_confirmed=True,
+                )
+            )
+            p1.games_won += p1_wins
+            p2.games_won += p2_wins
+            p1.games_played += p1_wins + p2_wins
+            p2.games_played += p1_wins + p2_wins
+            if p1_wins > p2_wins:
+                p1.score += 3
+            elif p2_wins > p1_wins:
+                p2.score += 3
+            else:
+                p1.score += 1
+                p2.score += 1
+            if last_phase:
+                p1.draft_games_won += p1_wins
+                p2.draft_games_won += p2_wins
+                p1.draft_games_played += p1_wins + p2_wins
+                p2.draft_games_played += p1_wins + p2_wins
+                if p1_wins > p2_wins:
+                    p1.draft_score += 3
+                elif p2_wins > p1_wins:
+                    p2.draft_score += 3
+                else:
+                    p1.draft_score += 1
+                    p2.draft_score += 1
+    Game.objects.bulk_create(games, batch_size=1000)
+
+    Pairings = Enrollment.pairings.through
+    Pairings.objects.bulk_create(
+        [
+            Pairings(from_enrollment=a, to_enrollment=b)
+            for g in games
+            for a, b in ((g.player1, g.player2), (g.player2, g.player1))
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    if played:
+        _update_tiebreakers(
+            enrollments,
+            [
+                members
+                for draft, members in played
+                if draft.phase.phase_idx == played_phases
+            ],
+            games,
+            rounds,
+            played_phases * rounds,
+        )
+    Enrollment.objects.bulk_update(
+        enrollments,
+        [
+            "score",
+            "games_played",
+            "games_won",
+            "pmw",
+            "omw",
+            "pgw",
+            "ogw",
+            "tournament_place",
+            "draft_score",
+            "draft_games_played",
+            "draft_games_won",
+            "draft_pmw",
+            "draft_omw",
+            "draft_pgw",
+            "draft_ogw",
+            "draft_place",
+        ],
+        batch_size=1000,
+    )
+
+    if images:
+        Image.objects.bulk_create(
+            [
+                Image(
+                    user=e.player.user,
+                    draft=draft,
+                    draft_idx=draft.id,
+                    checkin=checkin,
+                    image=f"images/synthetic/{slug}/{draft.id}-{e.id}-{checkin}.jpg",
+                )
+                for draft, members in played
+                for e in members
+                for checkin in (True, False)
+            ],
+            batch_size=1000,
+        )
+
+    return tournament
@@ -0,0 +1,94 @@
+from django.db.models import Count, Q
+
+from .models import Draft, parse_tables
+
+
+def table_count(players):
+    """Returns how many tables a pod of the given size plays at."""
+    return max((players + 1) // 2, 1)
+
+
+def _runs(tables):
+    """Splits ordered table numbers into runs of consecutive numbers."""
+    runs = []
+    for table in tables:
+        if runs and runs[-1][-1] == table - 1:
+            runs[-1].append(table)
+        else:
+            runs.append([table])
+    return runs
+
+
+def _take(runs, count):
+    """Takes the first count tables in a row out of the runs and returns the
+    first and last of them, or None if no run is long enough.
+    """
+    for idx, run in enumerate(runs):
+        if len(run) >= count:
+            runs[idx] = run[count:]
+            return run[0], run[count - 1]
+    return None
+
+
+def allocate(phase):
+    """Gives every draft of the phase that isn't seated yet its own range of
+    consecutive tables and returns these drafts.
+
+    Pods that are already playing keep their tables. The drafts come in the
+    order they were built, top pods first, and these get the feature tables of
+    the event for as long as they fit. A pod plays all its rounds within its
+    range, so players stay in the same part of the venue.
+    """
+    tournament = phase.tournament
+    drafts = list(
+        Draft.objects.filter(phase=phase)
+        .annotate(players=Count("enrollments", filter=Q(enrollments__dropped=False)))
+        .order_by("id")
+    )
+    unseated = [d for d in drafts if not d.seated]
+    taken = set()
+    for draft in drafts:
+        if draft.seated:
+            taken.update(range(draft.first_table, draft.last_table + 1))
+
+    feature = [t for t in parse_tables(tournament.feature_tables) if t not in taken]
+    if tournament.tables:
+        venue = parse_tables(tournament.tables)
+    else:
+        # Enough tables for every pod after all the numbers in use
+        needed = sum(table_count(d.players) for d in unseated)
+        venue = range(1, max(taken | set(feature), default=0) + needed + 1)
+    excluded = taken | set(feature)
+    feature_runs = _runs(feature)
+    venue_runs = _runs([t for t in venue if t not in excluded])
+
+    for draft in unseated:
+        count = table_count(draft.players)
+        tables = _take(feature_runs, count) if feature_runs else None
+        if tables is None:
+            # Lower pods don't jump ahead to feature tables left over
+            feature_runs = []
+            tables = _take(venue_runs, count)
+        if tables is None:
+            raise ValueError(
+                f"The venue has no {count} free tables in a row for {draft}."
+            )
+        draft.first_table, draft.last_table = tables
+
+    Draft.objects.bulk_update(unseated, ["first_table", "last_table"])
+    return unseated
+
+
+def venue_tables(tournament, count):
+    """Returns the numbers of the first count tables of the venue for matches
+    ranked from the top, feature tables first.
+    """
+    feature = parse_tables(tournament.feature_tables)
+    if tournament.tables:
+        venue = parse_tables(tournament.tables)
+    else:
+        venue = range(1, max(feature, default=0) + count + 1)
+    numbers = feature + [t for t in venue if t not in set(feature)]
+    if len(numbers) < count:
+        raise ValueError(f"The venue has {len(numbers)} tables for {count} matches.")
+    return numbers[:count]
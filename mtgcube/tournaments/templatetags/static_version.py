@@ -1,13 +1,50 @@
 from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
 from django.templatetags.static import static
+from django.urls import reverse
+from django.utils import translation
+import functools
 import time
 
+from mtgcube.utils.views import catalog_version
+from ..bundles import DASHBOARD_BUNDLE, DASHBOARD_SCRIPTS
+
 
 register = template.Library()
 
 
 @register.simple_tag
 def versioned_static(path):
+  """Returns the content-hashed URL of the given static file from the manifest.
+  The manifest isn't used in DEBUG mode, so the URL gets a timestamp instead.
+  """
   file_url = static(path)
+  if not settings.DEBUG:
+    return file_url
   now = int(time.time())
   return f"{file_url}?v={now}"
+
+
+@register.simple_tag
+def javascript_catalog_url():
+  """Returns the versioned URL of the JavaScript catalog for the active language."""
+  lang = translation.get_supported_language_variant(translation.get_language())
+  return reverse(
+    "javascript-catalog", kwargs={"lang": lang, "version": catalog_version()}
+  )
+
+
+@functools.cache
+def dashboard_bundle_built():
+  return finders.find(DASHBOARD_BUNDLE) is not None
+
+
+@register.simple_tag
+def dashboard_script_urls():
+  """Returns the URLs of the dashboard scripts. Outside of DEBUG mode that is
+  just the minified bundle, as long as it was built with the build_js command.
+  """
+  if not settings.DEBUG and dashboard_bundle_built():
+    return [static(DASHBOARD_BUNDLE)]
+  return [versioned_static(script) for script in DASHBOARD_SCRIPTS]
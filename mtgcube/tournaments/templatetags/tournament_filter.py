@@ -6,8 +6,5 @@ register = template.Library()
 
 @register.filter
 def is_side_event(tournament):
-  try:
-    tournament.tournament
-    return True
-  except AttributeError:
-    return False
+  # Kept for the templates, the flag is a column of every event now
+  return tournament.is_side_event
@@ -1,3 +1,388 @@
-# from django.test import TestCase
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from . import (
+    brackets,
+    bundles,
+    pairings,
+    pods,
+    queries,
+    services,
+    synthetic,
+    tables,
+)
+from .models import (
+    Cube,
+    Draft,
+    Enrollment,
+    Game,
+    Phase,
+    Player,
+    Round,
+    Tournament,
+    WaitlistEntry,
+)
+
+User = get_user_model()
+
+
+class EnrollmentRaceTests(TransactionTestCase):
+    """Fires parallel enrollments at a full event. The threads need connections
+    of their own to the test database, which an in-memory SQLite one can't give.
+    """
+
+    players = 500
+    capacity = 256
+
+    def setUp(self):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("The threads can't share an in-memory database.")
+        self.tournament = Tournament.objects.create(
+            name="Race", slug="race", player_capacity=self.capacity
+        )
+        users = User.objects.bulk_create(
+            [
+                User(username=f"racer-{idx}", name=f"Racer {idx}", password="!")
+                for idx in range(self.players)
+            ]
+        )
+        Player.objects.bulk_create([Player(user=user) for user in users])
+        self.users = list(User.objects.filter(username__startswith="racer-"))
+
+    def race(self, func):
+        """Runs func for every user at once and returns the results."""
+        start = threading.Event()
+
+        def run(user):
+            start.wait()
+            try:
+                return func(user)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(50) as pool:
+            futures = [pool.submit(run, user) for user in self.users]
+            start.set()
+            return [future.result() for future in futures]
+
+    def test_reserve_seats(self):
+        results = self.race(lambda user: services.reserve_seats(self.tournament))
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(sum(results), self.capacity)
+        self.assertEqual(self.tournament.signed_up, self.capacity)
+
+    def test_enroll_for_event(self):
+        results = self.race(
+            lambda user: services.enroll_for_event(user, self.tournament)
+        )
+
+        self.tournament.refresh_from_db()
+        enrolled = Enrollment.objects.filter(tournament=self.tournament).count()
+        waitlisted = WaitlistEntry.objects.filter(tournament=self.tournament).count()
+        self.assertEqual(enrolled, 256)
+        self.assertEqual(waitlisted, 244)
+        self.assertEqual(sum(r is not None for r in results), 256)
+        self.assertEqual(self.tournament.signed_up, 256)
+
+
+class EventRoundTests(TestCase):
+    """Plays the first round of a synthetic event from seating to standings."""
+
+    def setUp(self):
+        cache.clear()
+        self.tournament = synthetic.seed_event(
+            "Round Trip", players=16, phases=1, unplayed_phases=1, images=False, seed=1
+        )
+
+    def test_round(self):
+        drafts = list(Draft.objects.filter(phase__tournament=self.tournament))
+        self.assertEqual(len(drafts), 2)
+        winners = set()
+        for draft in drafts:
+            services.seat_draft(draft)
+            seats = draft.enrollments.values_list("seat", flat=True)
+            self.assertEqual(sorted(seats), list(range(1, 9)))
+
+            services.pair_round_new(draft, seed=7)
+            rd = queries.current_round(draft, force_update=True)
+            games = list(rd.game_set.select_related("player1__player__user"))
+            self.assertEqual(len(games), 4)
+            paired = [p for g in games for p in (g.player1_id, g.player2_id)]
+            self.assertEqual(len(set(paired)), 8)
+
+            for game in games:
+                services.report_result(game, 2, 0, game.player1.player)
+                services.finish_match(game)
+                winners.add(game.player1_id)
+            services.finish_draft_round(rd)
+
+            standings = queries.draft_standings(draft)
+            self.assertEqual([s["score"] for s in standings], [3] * 4 + [0] * 4)
+            self.assertEqual(
+                {s["id"] for s in standings[:4]}, {g.player1_id for g in games}
+            )
+
+        services.finish_event_round(self.tournament)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.current_round, 2)
+        standings = queries.tournament_standings(self.tournament)
+        self.assertEqual([s["rank"] for s in standings], list(range(1, 17)))
+        self.assertEqual({s["id"] for s in standings[:8]}, winners)
+        self.assertEqual([s["score"] for s in standings], [3] * 8 + [0] * 8)
+
+
+class SeedEventTests(TestCase):
+    fields = [
+        "pmw",
+        "omw",
+        "pgw",
+        "ogw",
+        "draft_pmw",
+        "draft_omw",
+        "draft_pgw",
+        "draft_ogw",
+    ]
+
+    def test_tiebreakers_match_services(self):
+        cache.clear()
+        tournament = synthetic.seed_event(
+            "Tiebreakers", players=48, phases=3, unplayed_phases=1, images=False, seed=2
+        )
+        seeded = list(tournament.enrollment_set.values_list("id", *self.fields))
+        self.assertGreater(len({row[2] for row in seeded}), 1)
+
+        tournament.current_round = 6
+        services.update_tournament_tiebreakers(tournament)
+        for draft in Draft.objects.filter(
+            phase__tournament=tournament, phase__phase_idx=2
+        ):
+            services.update_draft_tiebreakers(draft)
+        updated = {
+            row[0]: row[1:]
+            for row in tournament.enrollment_set.values_list("id", *self.fields)
+        }
+        for row in seeded:
+            for seeded_value, value in zip(row[1:], updated[row[0]]):
+                # Both sum the opponents in their own order
+                self.assertAlmostEqual(seeded_value, value, delta=1.01e-4)
+
+
+class PairingTests(SimpleTestCase):
+    players = list(range(1, 10))
+    scores = {p: 3 * (p % 3) for p in range(1, 10)}
+    opponents = {1: {2}, 2: {1}, 4: {5}, 5: {4}, 7: {8}, 8: {7}}
+
+    def test_same_seed_same_pairs(self):
+        for engine in pairings.ENGINES:
+            first = pairings.run(
+                engine, self.players, self.scores, self.opponents, set(), 5
+            )
+            again = pairings.run(
+                engine, self.players, self.scores, self.opponents, set(), 5
+            )
+            self.assertEqual(first[:2], again[:2])
+
+    def test_replay(self):
+        pairs, byes, log = pairings.run(
+            "phase", self.players, self.scores, self.opponents, set(), 11
+        )
+        self.assertEqual(pairings.replay(log, 11)[:2], (pairs, byes))
+
+    def test_no_rematches(self):
+        for engine in pairings.ENGINES.values():
+            pairs, byes = engine(
+                self.players, self.scores, self.opponents, set(), random.Random(3)
+            )
+            for a, b in pairs:
+                self.assertNotIn(b, self.opponents.get(a, ()))
+            seated = [p for pair in pairs for p in pair] + byes
+            self.assertEqual(sorted(seated), self.players)
+
+    def test_swiss_bye_goes_to_lowest_without_bye(self):
+        scores = {p: p for p in self.players}
+        pairs, byes = pairings.swiss_pairs(
+            self.players, scores, {}, {1}, random.Random(1)
+        )
+        self.assertEqual(byes, [2])
+        self.assertEqual(len(pairs), 4)
+
+    def test_pod_bye_for_odd_field(self):
+        pairs, byes = pairings.pod_pairs(
+            self.players, self.scores, {}, set(), random.Random(1)
+        )
+        self.assertEqual(len(byes), 1)
+        self.assertEqual(len(pairs), 4)
+
+
+class AssignCubesTests(SimpleTestCase):
+    def test_avoids_cubes_drafted_before(self):
+        pods_ = [
+            [SimpleNamespace(id=1), SimpleNamespace(id=2)],
+            [SimpleNamespace(id=3), SimpleNamespace(id=4)],
+        ]
+        cubes = [SimpleNamespace(id=cube_id) for cube_id in (10, 20, 30)]
+        drafted = {1: {10}, 2: {10}, 3: {20}, 4: {30}}
+
+        first, second = pods.assign_cubes(pods_, cubes, drafted)
+        self.assertNotEqual(first.id, 10)
+        self.assertEqual(second.id, 10)
+
+    def test_too_few_cubes(self):
+        pods_ = [[SimpleNamespace(id=1)], [SimpleNamespace(id=2)]]
+        with self.assertRaises(ValueError):
+            pods.assign_cubes(pods_, [SimpleNamespace(id=10)], {})
+
+
+class MinifyTests(SimpleTestCase):
+    def assertMinified(self, source, expected):
+        self.assertEqual(bundles.minify(source), expected + "\n")
+
+    def test_regex_literals(self):
+        self.assertMinified("return / x /.test(s)", "return/ x /.test(s)")
+        self.assertMinified("case /a\\/ '/g.test(s): y()", "case/a\\/ '/g.test(s):y()")
+        self.assertMinified('x = typeof /[/ "]/', 'x=typeof/[/ "]/')
+        self.assertMinified("x = a + /\\/\\/ x/.source", "x=a+/\\/\\/ x/.source")
+
+    def test_division(self):
+        self.assertMinified("x = a / b / (c) / 2", "x=a/b/(c)/2")
+        self.assertMinified("x = i++ / 2", "x=i++/2")
+        self.assertMinified("x = returned / 2", "x=returned/2")
+
+    def test_strings_keep_comment_markers(self):
+        self.assertMinified(
+            "s = 'http://host/*x*/'; // comment\nt = \"//\" /* more */",
+            "s='http://host/*x*/';t=\"//\"",
+        )
+
+    def test_template_literals(self):
+        self.assertMinified(
+            "t = `a // ${b / 2} /* ${`n ${c}`} */`",
+            "t=`a // ${b/2} /* ${`n ${c}`} */`",
+        )
+        self.assertMinified(
+            "t = `${ {a: 1}.a }` + /x/.source", "t=`${{a:1}.a}`+/x/.source"
+        )
+
+    def test_line_breaks(self):
+        self.assertMinified("a = b\nc = d\n", "a=b\nc=d")
+        self.assertMinified("f(a,\n  b)\n", "f(a,b)")
+
+
+class AllocateTablesTests(TestCase):
+    def setUp(self):
+        self.tournament = synthetic.seed_event(
+            "Tables", players=24, phases=1, unplayed_phases=1, images=False, seed=1
+        )
+        self.phase = Phase.objects.get(tournament=self.tournament)
+
+    def test_feature_tables_first(self):
+        self.tournament.tables = "1-12, 20-30"
+        self.tournament.feature_tables = "100-103"
+        self.tournament.save()
+
+        drafts = tables.allocate(self.phase)
+        ranges = [(d.first_table, d.last_table) for d in drafts]
+        self.assertEqual(ranges, [(100, 103), (1, 4), (5, 8)])
+
+    def test_keeps_seated_drafts_and_skips_gaps(self):
+        self.tournament.tables = "1-6, 10-20"
+        self.tournament.save()
+        seated = Draft.objects.filter(phase=self.phase).order_by("id").first()
+        Draft.objects.filter(id=seated.id).update(
+            seated=True, first_table=1, last_table=4
+        )
+
+        drafts = tables.allocate(self.phase)
+        ranges = [(d.first_table, d.last_table) for d in drafts]
+        self.assertEqual(ranges, [(10, 13), (14, 17)])
+
+    def test_venue_too_small(self):
+        self.tournament.tables = "1-10"
+        self.tournament.save()
+        with self.assertRaises(ValueError):
+            tables.allocate(self.phase)
+
+
+class BracketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        tournament = synthetic.seed_event("Top", players=16, images=False, seed=1)
+        tournament.cubes.set(Cube.objects.filter(name__startswith="Top"))
+        phase = Phase.objects.create(
+            tournament=tournament, phase_idx=4, round_number=3, pairing=Phase.BRACKET
+        )
+        self.draft = brackets.create_bracket(phase)
+        brackets.start(self.draft)
+
+    def confirm(self, round_idx, slot, player1_wins=2, player2_wins=1):
+        game = Game.objects.get(
+            round__draft=self.draft, round__round_idx=round_idx, bracket_slot=slot
+        )
+        services.report_result(game, player1_wins, player2_wins, None, admin=True)
+        services.finish_match(game)
+        return game
+
+    def test_seed_order(self):
+        self.assertEqual(brackets.seed_order(8), [1, 8, 4, 5, 2, 7, 3, 6])
+        quarterfinals = Game.objects.filter(round__draft=self.draft).order_by(
+            "bracket_slot"
+        )
+        seeds = self.draft.seeds
+        self.assertEqual(
+            [
+                (seeds.index(g.player1_id), seeds.index(g.player2_id))
+                for g in quarterfinals
+            ],
+            [(0, 7), (3, 4), (1, 6), (2, 5)],
+        )
+
+    def test_advance(self):
+        self.confirm(1, 1, 0, 2)
+        self.assertFalse(Round.objects.filter(draft=self.draft, round_idx=2).exists())
+
+        self.confirm(1, 2)
+        semifinal = Game.objects.get(round__draft=self.draft, round__round_idx=2)
+        # Seed 4 beat seed 5 and plays player1 against seed 8
+        seeds = self.draft.seeds
+        self.assertEqual(semifinal.bracket_slot, 1)
+        self.assertEqual(
+            (semifinal.player1_id, semifinal.player2_id), (seeds[3], seeds[7])
+        )
+        self.assertFalse(semifinal.round.paired)
+
+        self.confirm(1, 3)
+        self.confirm(1, 4)
+        self.assertTrue(Round.objects.get(draft=self.draft, round_idx=1).finished)
+        self.assertTrue(Round.objects.get(draft=self.draft, round_idx=2).paired)
+
+        self.confirm(2, 1)
+        self.confirm(2, 2)
+        final = self.confirm(3, 1)
+        self.draft.refresh_from_db()
+        self.assertTrue(self.draft.finished)
+        bracket = queries.bracket(self.draft, force_update=True)
+        self.assertEqual(bracket["champion"]["seed"], seeds.index(final.player1_id) + 1)
+
+    def test_no_cubes(self):
+        phase = Phase.objects.create(
+            tournament=self.draft.phase.tournament,
+            phase_idx=5,
+            round_number=3,
+            pairing=Phase.BRACKET,
+        )
+        phase.tournament.cubes.clear()
+        with self.assertRaises(ValueError):
+            brackets.create_bracket(phase)
+
+    def test_no_draws(self):
+        game = Game.objects.get(round__draft=self.draft, bracket_slot=1)
+        with self.assertRaises(ValueError):
+            services.report_result(game, 1, 1, None, admin=True)
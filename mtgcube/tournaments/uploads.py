@@ -0,0 +1,116 @@
+import datetime
+import uuid
+
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+
+from . import images, media
+from .models import Image
+
+# Objects uploaded by the client but not finalized into an Image yet.
+PENDING_PREFIX = "images/pending"
+# Seconds a signed upload URL and its finalize token stay valid.
+UPLOAD_MAX_AGE = 15 * 60
+MAX_UPLOAD_SIZE = 25 * 1024 * 1024
+CONTENT_TYPES = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp"}
+
+SALT = "tournaments.uploads"
+
+
+class UploadError(Exception):
+    pass
+
+
+def _blob_name(key):
+    from storages.utils import safe_join
+
+    return safe_join(default_storage.location, key)
+
+
+def upload_target(key, content_type):
+    """Returns where and how the client has to upload the object with the given key.
+
+    On Google Cloud Storage that is a V4 signed URL of the bucket, anywhere else a
+    signed URL of LocalUploadView, which writes the request body to the storage.
+    """
+    bucket = getattr(default_storage, "bucket", None)
+    if bucket is not None:
+        url = bucket.blob(_blob_name(key)).generate_signed_url(
+            version="v4",
+            expiration=datetime.timedelta(seconds=UPLOAD_MAX_AGE),
+            method="PUT",
+            content_type=content_type,
+        )
+    else:
+        token = signing.dumps({"key": key, "type": content_type}, salt=SALT)
+        url = reverse("tournaments:local_upload", kwargs={"token": token})
+    return {"url": url, "method": "PUT", "headers": {"Content-Type": content_type}}
+
+
+def start_upload(user, draft, checkin, content_type):
+    """Reserves a pending object key for an image of the user and returns the
+    upload target along with the token to finalize the upload with.
+    """
+    if content_type not in CONTENT_TYPES:
+        raise UploadError("Unsupported image type.")
+    key = f"{PENDING_PREFIX}/{user.id}/{uuid.uuid4().hex}.{CONTENT_TYPES[content_type]}"
+    token = signing.dumps(
+        {"key": key, "user": user.id, "draft": draft.id, "checkin": checkin},
+        salt=SALT,
+    )
+    return {**upload_target(key, content_type), "token": token}
+
+
+def local_upload_key(token):
+    """Returns the key and content type a local upload URL was signed for."""
+    data = signing.loads(token, salt=SALT, max_age=UPLOAD_MAX_AGE)
+    return data["key"], data["type"]
+
+
+def finish_upload(user, draft, token):
+    """Turns the uploaded object of a finalize token into an Image of the user.
+
+    The original is re-encoded like a form upload and the pending object queued for
+    deletion. A token finalized before returns the image it created then.
+    """
+    try:
+        data = signing.loads(token, salt=SALT, max_age=UPLOAD_MAX_AGE)
+    except signing.BadSignature:
+        raise UploadError("Invalid or expired upload.")
+    if data["user"] != user.id or data["draft"] != draft.id:
+        raise UploadError("Invalid or expired upload.")
+
+    key = data["key"]
+    image = Image.objects.filter(upload_key=key).first()
+    if image:
+        return image
+    if not default_storage.exists(key):
+        raise UploadError("The image has not been uploaded.")
+    try:
+        if default_storage.size(key) > MAX_UPLOAD_SIZE:
+            raise UploadError("The image is too large.")
+        with default_storage.open(key, "rb") as file:
+            content = images.downscale(file)
+    except images.UNREADABLE:
+        raise UploadError("The image could not be read.")
+    finally:
+        media.discard(key)
+
+    image = Image(
+        user=user,
+        draft=draft,
+        draft_idx=draft.id,
+        checkin=data["checkin"],
+        upload_key=key,
+    )
+    try:
+        with transaction.atomic():
+            image.image.save(content.name, content)
+    except IntegrityError:
+        # Finalized by a concurrent request in the meantime
+        media.discard(image.image.name)
+        return Image.objects.get(upload_key=key)
+    images.save_thumbnail(image)
+    return image
@@ -10,6 +10,11 @@ app_name = "tournaments"
 urlpatterns = [
   path("", templates.MyEventsView.as_view(), name="index"),
   path("registration/", templates.AvailableEvents.as_view(), name="available_events"),
+  path(
+    "registration/<int:event_id>/~status/",
+    player.RegistrationStatusView.as_view(),
+    name="registration_status",
+  ),
   path("cube/<slug:slug>/", templates.CubeDetailView.as_view(), name="cube_detail"),
   path(
     "event-dashboard/<slug:slug>/",
@@ -31,11 +36,26 @@ urlpatterns = [
     templates.AdminDraftDashboardView.as_view(),
     name="admin_draft_dashboard",
   ),
+  path(
+    "admin-dashboard/<slug:slug>/<slug:draft_slug>/gallery/",
+    templates.JudgeGalleryView.as_view(),
+    name="judge_gallery",
+  ),
   path(
     "admin-dashboard/<slug:slug>/<slug:draft_slug>/~draft/",
     admin.AdminDraftInfoEmbedView.as_view(),
     name="admin_draft_embed",
   ),
+  path(
+    "admin-dashboard/<slug:slug>/<slug:draft_slug>/~export/<str:export>/",
+    admin.ExportView.as_view(),
+    name="draft_export",
+  ),
+  path(
+    "admin-dashboard/<slug:slug>/~export/<str:export>/",
+    admin.ExportView.as_view(),
+    name="event_export",
+  ),
   path(
     "admin-dashboard/<slug:slug>/~match/<int:match_id>/",
     admin.AdminMatchInfoEmbedView.as_view(),
@@ -56,6 +76,17 @@ urlpatterns = [
     player.CheckoutView.as_view(),
     name="checkout",
   ),
+  path(
+    "event-dashboard/<slug:slug>/<slug:draft_slug>/~upload-url/",
+    player.DirectUploadView.as_view(),
+    name="direct_upload",
+  ),
+  path(
+    "event-dashboard/<slug:slug>/<slug:draft_slug>/~upload-finalize/",
+    player.FinalizeUploadView.as_view(),
+    name="finalize_upload",
+  ),
+  path("uploads/<str:token>/", player.LocalUploadView.as_view(), name="local_upload"),
   path(
     "event-dashboard/<slug:slug>/<slug:draft_slug>/checkin-pool/",
     templates.MyPoolCheckinView.as_view(),
@@ -101,6 +132,11 @@ urlpatterns = [
     generic.DraftStandingsView.as_view(),
     name="draft_standings",
   ),
+  path(
+    "event-dashboard/<slug:slug>/<slug:draft_slug>/~bracket/",
+    generic.BracketView.as_view(),
+    name="bracket",
+  ),
   path(
     "event-dashboard/<slug:slug>/<slug:draft_slug>/~seatings/",
     generic.SeatingsView.as_view(),
@@ -1,8 +1,8 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views import View
 
-from .. import queries
+from .. import exports, queries
 
 
 class AdminDraftInfoEmbedView(LoginRequiredMixin, View):
@@ -80,3 +80,51 @@ class AdminMatchInfoEmbedView(LoginRequiredMixin, View):
         "reported_by": match.result_reported_by,
       }
     )
+
+
+class ExportView(LoginRequiredMixin, View):
+  """Streams pairings, results or standings of an event, or of one of its drafts,
+  as CSV or JSON Lines.
+  """
+
+  def get(self, request, *args, **kwargs):
+    user = request.user
+    if not user.is_superuser:
+      return JsonResponse({"error": "Missing authentication level"}, status=403)
+
+    export = exports.EXPORTS.get(kwargs["export"])
+    fmt = request.GET.get("format", "csv")
+    if not export or fmt not in exports.FORMATS:
+      return JsonResponse({"error": "Unknown export."}, status=404)
+
+    tournament = queries.get_tournament(slug=kwargs["slug"])
+    if not tournament:
+      return JsonResponse({"error": "No tournament found."}, status=404)
+    draft = None
+    if "draft_slug" in kwargs:
+      draft = queries.get_draft(slug=kwargs["draft_slug"])
+      if not draft:
+        return JsonResponse({"error": "No draft found."}, status=404)
+
+    try:
+      filters = {
+        param: int(request.GET[param])
+        for param in ("phase", "round")
+        if request.GET.get(param)
+      }
+    except ValueError:
+      return JsonResponse({"error": "Invalid export parameters."}, status=400)
+
+    columns, rows = export(
+      tournament, draft, phase=filters.get("phase"), round_idx=filters.get("round")
+    )
+    content_type, extension = exports.FORMATS[fmt]
+    name = "-".join(
+      [draft.slug if draft else tournament.slug, kwargs["export"]]
+      + [f"{key}{value}" for key, value in filters.items()]
+    )
+    response = StreamingHttpResponse(
+      exports.render(columns, rows, fmt), content_type=content_type
+    )
+    response["Content-Disposition"] = f'attachment; filename="{name}.{extension}"'
+    return response
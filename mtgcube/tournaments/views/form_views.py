@@ -2,12 +2,14 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.views.generic.edit import FormView
 from django.contrib.auth.mixins import UserPassesTestMixin, LoginRequiredMixin
+from django.db.models import Q
 from django.http import JsonResponse
 from django.urls import reverse_lazy
 from django.shortcuts import redirect
 
-from .. import queries, services
-from ..forms import ReportResultForm, ConfirmResultForm
+from .. import brackets, pods, queries, registration, services
+from ..forms import ReportResultForm, ConfirmResultForm, EnrollmentImportForm
+from ..models import Phase
 
 User = get_user_model()
 
@@ -52,13 +54,16 @@ class PlayerReportResultView(FormView, LoginRequiredMixin):
 
         player = queries.get_player(self.request.user)
         match = queries.get_match(match_id)
-        services.report_result(
-            match,
-            player1_wins,
-            player2_wins,
-            reporting_player=player,
-            admin=False,
-        )
+        try:
+            services.report_result(
+                match,
+                player1_wins,
+                player2_wins,
+                reporting_player=player,
+                admin=False,
+            )
+        except ValueError as e:
+            messages.error(self.request, str(e))
         return redirect(self.get_success_url())
 
     def form_invalid(self, form):
@@ -84,13 +89,17 @@ class AdminReportResultView(FormView, AdminDataMixin):
         player1_wins = form.cleaned_data["player1_wins"]
         player2_wins = form.cleaned_data["player2_wins"]
         match = queries.get_match(match_id)
-        services.report_result(
-            match,
-            player1_wins,
-            player2_wins,
-            reporting_player=None,
-            admin=True,
-        )
+        try:
+            services.report_result(
+                match,
+                player1_wins,
+                player2_wins,
+                reporting_player=None,
+                admin=True,
+            )
+        except ValueError as e:
+            messages.error(self.request, str(e))
+            return redirect(self.get_success_url())
         services.finish_match(match)
         return super().form_valid(form)
 
@@ -140,6 +149,28 @@ class SeatDraftView(FormView, AdminDataMixin):
         return redirect(self.get_success_url())
 
 
+class SeatPhaseView(FormView, AdminDataMixin):
+    template_name = "tournaments/admin_dashboard.html"
+
+    def get_success_url(self):
+        return reverse_lazy("tournaments:admin_dashboard", kwargs=self.kwargs)
+
+    def post(self, request, *args, **kwargs):
+        tournament = queries.get_tournament(slug=kwargs["slug"])
+        phase = queries.active_phase(tournament, force_update=True)
+        if not phase:
+            messages.error(request, "Error: No phase is running.")
+            return redirect(self.get_success_url())
+
+        try:
+            drafts = services.seat_phase(phase)
+        except ValueError as e:
+            messages.error(request, f"Error: {e}")
+            return redirect(self.get_success_url())
+        messages.success(request, f"{len(drafts)} drafts were seated.")
+        return redirect(self.get_success_url())
+
+
 class PairRoundView(FormView, AdminDataMixin):
     template_name = "tournaments/admin_draft_dashboard.html"
 
@@ -155,7 +186,43 @@ class PairRoundView(FormView, AdminDataMixin):
     def post(self, request, *args, **kwargs):
         slug = kwargs.get("draft_slug")
         draft = queries.get_draft(slug=slug)
-        services.pair_round_new(draft)
+        if draft.phase.pairing == Phase.PHASE:
+            try:
+                services.pair_phase_round(draft.phase)
+            except ValueError as e:
+                messages.error(request, f"Error: {e}")
+        elif draft.phase.pairing == Phase.BRACKET:
+            try:
+                brackets.start(draft)
+            except ValueError as e:
+                messages.error(request, f"Error: {e}")
+        else:
+            try:
+                services.pair_round_new(draft)
+            except ValueError as e:
+                messages.error(request, f"Error: {e}")
+        return redirect(self.get_success_url())
+
+
+class PairPhaseView(FormView, AdminDataMixin):
+    template_name = "tournaments/admin_dashboard.html"
+
+    def get_success_url(self):
+        return reverse_lazy("tournaments:admin_dashboard", kwargs=self.kwargs)
+
+    def post(self, request, *args, **kwargs):
+        tournament = queries.get_tournament(slug=kwargs["slug"])
+        phase = queries.active_phase(tournament, force_update=True)
+        if not phase:
+            messages.error(request, "Error: No phase is running.")
+            return redirect(self.get_success_url())
+
+        try:
+            games = services.pair_phase_round(phase)
+        except ValueError as e:
+            messages.error(request, f"Error: {e}")
+            return redirect(self.get_success_url())
+        messages.success(request, f"{len(games)} matches were paired.")
         return redirect(self.get_success_url())
 
 
@@ -226,6 +293,23 @@ class StartPhaseView(FormView, AdminDataMixin):
         phase_idx = tournament.current_round // 3 + 1
         phase = queries.get_phase_by_index(tournament, phase_idx)
 
+        if phase.pairing == Phase.BRACKET:
+            try:
+                draft = brackets.create_bracket(phase)
+            except ValueError as e:
+                messages.error(request, f"Error: {e}")
+                return redirect(self.get_success_url())
+            messages.success(request, f"{len(draft.seeds)} players were seeded.")
+        # Phases without manually created drafts get their pods built, as long
+        # as the event has a pool of cubes to give them
+        elif tournament.cubes.exists() and not phase.draft_set.exists():
+            try:
+                drafts = pods.build_pods(phase)
+            except ValueError as e:
+                messages.error(request, f"Error: {e}")
+                return redirect(self.get_success_url())
+            messages.success(request, f"{len(drafts)} pods were built.")
+
         phase.started = True
         phase.save()
 
@@ -256,11 +340,29 @@ class EventEnrollView(FormView, LoginRequiredMixin):
     def post(self, request, *args, **kwargs):
         event_id = request.POST.get("event-id")
         tournament = queries.get_tournament(id=int(event_id))
+        if tournament.queued_registration:
+            registration.submit(request.user, tournament)
+            messages.info(
+                request,
+                f"Your registration for {tournament.name} is queued, "
+                "this page shows when it went through.",
+            )
+            return redirect("tournaments:available_events")
+
         try:
-            services.enroll_for_event(request.user, tournament)
+            enrollment = services.enroll_for_event(request.user, tournament)
         except ValueError as e:
             messages.error(request, str(e))
-            return redirect("tournaments:registration")
+            return redirect("tournaments:available_events")
+
+        if not enrollment:
+            player = queries.get_player(request.user)
+            position = queries.waitlist_positions(player).get(tournament.id)
+            messages.warning(
+                request,
+                f"{tournament.name} is full. You are number {position} on the waitlist.",
+            )
+            return redirect("tournaments:available_events")
 
         messages.success(request, f"You successfully registered for {tournament.name}!")
 
@@ -282,7 +384,7 @@ class AdminEnrollUserView(FormView, AdminDataMixin):
         tournament = queries.get_tournament(slug=tournament_slug)
 
         try:
-            services.enroll_for_event(user, tournament)
+            services.enroll_for_event(user, tournament, waitlist=False)
             messages.success(
                 request,
                 f"{user.name} was successfully registered for {tournament.name}!",
@@ -291,3 +393,62 @@ class AdminEnrollUserView(FormView, AdminDataMixin):
             messages.error(request, f"Error: {e}")
 
         return redirect(self.get_success_url())
+
+
+class AdminBulkEnrollView(FormView, AdminDataMixin):
+    """Enrolls all users selected on the player list or listed in an uploaded CSV
+    file in one go.
+    """
+
+    template_name = "tournaments/admin_tournament_players.html"
+
+    def get_success_url(self):
+        return reverse_lazy(
+            "tournaments:admin_player_list", kwargs={"slug": self.kwargs["slug"]}
+        )
+
+    def post(self, request, *args, **kwargs):
+        tournament = queries.get_tournament(slug=kwargs["slug"])
+
+        if request.FILES:
+            form = EnrollmentImportForm(request.POST, request.FILES)
+            if not form.is_valid():
+                for error in form.errors["file"]:
+                    messages.error(request, f"Error: {error}")
+                return redirect(self.get_success_url())
+            identifiers = form.cleaned_data["file"]
+            users = list(
+                User.objects.filter(
+                    Q(username__in=identifiers) | Q(email__in=identifiers)
+                )
+            )
+            known = {u.username for u in users} | {u.email for u in users}
+            unknown = [i for i in identifiers if i not in known]
+            if unknown:
+                messages.error(request, f"Unknown users: {', '.join(unknown)}")
+                return redirect(self.get_success_url())
+        else:
+            user_ids = [int(i) for i in request.POST.getlist("user-ids") if i.isdigit()]
+            users = list(User.objects.filter(id__in=user_ids))
+            if not users:
+                messages.error(request, "Error: No players were selected.")
+                return redirect(self.get_success_url())
+
+        try:
+            enrollments = services.bulk_enroll_for_event(users, tournament)
+        except ValueError as e:
+            messages.error(request, f"Error: {e}")
+            return redirect(self.get_success_url())
+
+        if not enrollments:
+            messages.warning(
+                request,
+                f"No new players were enrolled in {tournament.name}, the selected ones are already registered.",
+            )
+            return redirect(self.get_success_url())
+
+        messages.success(
+            request,
+            f"{len(enrollments)} players were successfully registered for {tournament.name}!",
+        )
+        return redirect(self.get_success_url())
@@ -5,6 +5,32 @@ from django.views import View
 from .. import queries
 
 
+def standings_params(request, enrollments):
+    """Reads the offset, limit and window query parameters of a standings request.
+    A window centers on the requesting user's own place, so their enrollment is
+    only looked up among the given ones when a window is asked for. Returns None
+    if the parameters are invalid or the user isn't among the enrollments.
+    """
+    params = {}
+    for key in ("offset", "limit", "window"):
+        value = request.GET.get(key)
+        if value is None:
+            continue
+        try:
+            params[key] = max(int(value), 0)
+        except ValueError:
+            return None
+    if "window" in params:
+        params["around"] = (
+            enrollments.filter(player__user=request.user)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if params["around"] is None:
+            return None
+    return params
+
+
 class SeatingsView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
         draft = queries.get_draft(slug=kwargs["draft_slug"])
@@ -53,6 +79,20 @@ class PlayerListView(LoginRequiredMixin, View):
         return JsonResponse({"players": players})
 
 
+class BracketView(LoginRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        draft = queries.get_draft(slug=kwargs["draft_slug"])
+
+        if not draft:
+            return JsonResponse({"error": "No draft found."}, status=404)
+
+        bracket = queries.bracket(draft)
+        if not bracket:
+            return JsonResponse({"error": "No bracket found."}, status=404)
+
+        return JsonResponse(bracket)
+
+
 class DraftStandingsView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
         draft = queries.get_draft(slug=kwargs["draft_slug"])
@@ -72,7 +112,17 @@ class DraftStandingsView(LoginRequiredMixin, View):
         else:
             rd_idx = current_round.round_idx
 
-        return JsonResponse({"standings": standings, "current_round": rd_idx})
+        params = standings_params(request, draft.enrollments.all())
+        if params is None:
+            return JsonResponse({"error": "Invalid standings parameters."}, status=400)
+
+        return JsonResponse(
+            {
+                "standings": queries.standings_slice(standings, **params),
+                "total": len(standings),
+                "current_round": rd_idx,
+            }
+        )
 
 
 class EventStandingsView(LoginRequiredMixin, View):
@@ -87,6 +137,14 @@ class EventStandingsView(LoginRequiredMixin, View):
         if not standings:
             return JsonResponse({"error": "No event standings yet."})
 
+        params = standings_params(request, tournament.enrollment_set.all())
+        if params is None:
+            return JsonResponse({"error": "Invalid standings parameters."}, status=400)
+
         return JsonResponse(
-            {"standings": standings, "current_round": tournament.current_round - 1}
+            {
+                "standings": queries.standings_slice(standings, **params),
+                "total": len(standings),
+                "current_round": tournament.current_round - 1,
+            }
         )
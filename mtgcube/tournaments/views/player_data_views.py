@@ -1,17 +1,22 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core import signing
+from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.views.decorators.csrf import csrf_exempt
 
 from ..forms import ImageForm
 from .. import queries as queries
+from .. import media, registration, uploads
 from ..models import Image
 
 from django.views import View
 
-
 PRONOUN_CHOICES = {
     "x": _("(they/them)"),
     "m": _("(he/him)"),
@@ -73,51 +78,48 @@ class PlayerDraftInfoView(LoginRequiredMixin, View):
 
 class PlayerPreviewMatchInfoView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
-        user = request.user
+        assignment = queries.current_assignment(
+            request.user, kwargs["slug"], kwargs["draft_slug"]
+        )
 
-        player = queries.get_player(user)
-        tournament = queries.get_tournament(slug=kwargs["slug"])
-        current_enroll = queries.enrollment_from_tournament(tournament, player)
-        current_draft = queries.get_draft(slug=kwargs["draft_slug"])
-        current_round = queries.current_round(current_draft, force_update=True)
+        if not assignment:
+            return JsonResponse({"error": "No enrollment found."}, status=404)
 
-        if not current_round:
+        if assignment.round_idx is None:
             return JsonResponse(
                 {"error": "Not started."},
                 status=200,
             )
 
-        if current_round.finished:
+        if assignment.round_finished:
             return JsonResponse({"error": "No match yet."})
 
-        if not current_enroll.checked_in:
+        if not assignment.checked_in:
             return JsonResponse(
                 {"error": "No checkin."},
                 status=200,
             )
 
-        if current_enroll.bye_this_round:
+        if assignment.bye_this_round:
             return JsonResponse({"bye": True}, status=200)
 
-        current_match = queries.current_match(current_enroll, current_round)
+        current_match = assignment.match
         if not current_match:
             return JsonResponse({"error": "No match yet."})
 
         opponent = current_match.player2
-        if current_match.player2 == current_enroll:
+        if current_match.player2_id == assignment.id:
             opponent = current_match.player1
 
-        opp_pronouns = _(PRONOUN_CHOICES[opponent.player.user.pronouns])
-
         match_json = {
             "id": current_match.id,
             "table": current_match.table,
             "player1": current_match.player1.player.user.name,
             "player2": current_match.player2.player.user.name,
-            "current_round": current_round.round_idx,
+            "current_round": assignment.round_idx,
             "opponent": opponent.player.user.name,
-            "opp_pronouns": opp_pronouns,
-            "draft_slug": current_draft.slug,
+            "opp_pronouns": _(PRONOUN_CHOICES[opponent.player.user.pronouns]),
+            "draft_slug": kwargs["draft_slug"],
         }
 
         return JsonResponse(match_json)
@@ -242,6 +244,18 @@ class AnnouncementView(LoginRequiredMixin, View):
         return JsonResponse({"error": "no announcement"})
 
 
+class RegistrationStatusView(LoginRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        tournament = queries.get_tournament(id=kwargs["event_id"], force_update=False)
+        if not tournament:
+            return JsonResponse({"error": "No tournament found."}, status=404)
+
+        status = registration.status(request.user, tournament)
+        if not status:
+            return JsonResponse({"error": "No queued registration."}, status=404)
+        return JsonResponse(status)
+
+
 class TimetableView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
         user = request.user
@@ -270,6 +284,16 @@ class TimetableView(LoginRequiredMixin, View):
         return JsonResponse({"timetable": timetable})
 
 
+def direct_upload_urls(kwargs):
+    """Returns the URLs the upload page needs to upload straight to the storage."""
+    if not settings.DIRECT_IMAGE_UPLOADS:
+        return {}
+    return {
+        "upload_url": reverse("tournaments:direct_upload", kwargs=kwargs),
+        "finalize_url": reverse("tournaments:finalize_upload", kwargs=kwargs),
+    }
+
+
 class CheckinView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         form = ImageForm(request.POST, request.FILES)
@@ -299,7 +323,7 @@ class CheckinView(LoginRequiredMixin, View):
         return render(
             request,
             "tournaments/checkin.html",
-            {"form": form},
+            {"form": form, **direct_upload_urls(kwargs)},
         )
 
 
@@ -331,16 +355,87 @@ class CheckoutView(LoginRequiredMixin, View):
         return render(
             request,
             "tournaments/checkout.html",
-            {"form": form},
+            {"form": form, **direct_upload_urls(kwargs)},
         )
 
 
+class DirectUploadView(LoginRequiredMixin, View):
+    def post(self, request, *args, **kwargs):
+        current_draft = queries.get_draft(slug=kwargs["draft_slug"])
+        if not current_draft:
+            return JsonResponse({"error": "No draft."}, status=404)
+
+        try:
+            target = uploads.start_upload(
+                request.user,
+                current_draft,
+                checkin=request.POST.get("checkin") == "True",
+                content_type=request.POST.get("content_type"),
+            )
+        except uploads.UploadError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        return JsonResponse(target)
+
+
+class FinalizeUploadView(LoginRequiredMixin, View):
+    def post(self, request, *args, **kwargs):
+        user = request.user
+        current_draft = queries.get_draft(slug=kwargs["draft_slug"])
+        if not current_draft:
+            return JsonResponse({"error": "No draft."}, status=404)
+
+        try:
+            image = uploads.finish_upload(
+                user, current_draft, request.POST.get("token", "")
+            )
+        except uploads.UploadError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        player = queries.get_player(user)
+        tournament = queries.get_tournament(slug=kwargs["slug"])
+        current_enroll = queries.enrollment_from_tournament(tournament, player)
+        if image.checkin:
+            current_enroll.checked_in = True
+            pool = "tournaments:my_pool_checkin"
+        else:
+            current_enroll.checked_out = True
+            pool = "tournaments:my_pool_checkout"
+        current_enroll.save()
+
+        return JsonResponse({"redirect": reverse(pool, kwargs=kwargs)})
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class LocalUploadView(View):
+    """Stands in for the signed URLs of the storage bucket when the files are
+    stored locally, the signed token is the only authorization.
+    """
+
+    def put(self, request, *args, **kwargs):
+        if getattr(default_storage, "bucket", None) is not None:
+            return JsonResponse({"error": "Upload to the bucket."}, status=404)
+        try:
+            key, content_type = uploads.local_upload_key(kwargs["token"])
+        except signing.BadSignature:
+            return JsonResponse({"error": "Invalid or expired upload."}, status=403)
+        if request.content_type != content_type:
+            return JsonResponse({"error": "Wrong content type."}, status=400)
+        if int(request.META.get("CONTENT_LENGTH") or 0) > uploads.MAX_UPLOAD_SIZE:
+            return JsonResponse({"error": "The image is too large."}, status=413)
+        # The header may be missing or wrong, the body read is capped as well
+        content = request.read(uploads.MAX_UPLOAD_SIZE + 1)
+        if len(content) > uploads.MAX_UPLOAD_SIZE:
+            return JsonResponse({"error": "The image is too large."}, status=413)
+
+        default_storage.save(key, ContentFile(content, name=key))
+        return HttpResponse(status=201)
+
+
 class DeleteImageCheckinView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
         image_id = kwargs.get("image_id")
-        image = get_object_or_404(Image, id=image_id, user=request.user)
-        default_storage.delete(image.image.name)
-        image.delete()
+        get_object_or_404(Image, id=image_id, user=request.user)
+        media.delete_images(Image.objects.filter(id=image_id))
 
         user = request.user
         player = queries.get_player(user)
@@ -366,9 +461,8 @@ class DeleteImageCheckinView(LoginRequiredMixin, View):
 class DeleteImageCheckoutView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
         image_id = kwargs.get("image_id")
-        image = get_object_or_404(Image, id=image_id, user=request.user)
-        default_storage.delete(image.image.name)
-        image.delete()
+        get_object_or_404(Image, id=image_id, user=request.user)
+        media.delete_images(Image.objects.filter(id=image_id))
 
         user = request.user
         player = queries.get_player(user)
@@ -1,6 +1,11 @@
+import functools
+
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect, render
 from django.views import View
 from django.views.generic.detail import DetailView
@@ -9,6 +14,8 @@ from django.urls import reverse_lazy
 
 from .form_views import (
     SeatDraftView,
+    SeatPhaseView,
+    PairPhaseView,
     PairRoundView,
     FinishRoundView,
     ResetDraftView,
@@ -21,13 +28,26 @@ from .form_views import (
     ResetEventView,
     StartPhaseView,
     AdminEnrollUserView,
+    AdminBulkEnrollView,
 )
+from .. import media
 from .. import queries as queries
-from ..models import Tournament, Cube
-from ..forms import ReportResultForm, ConfirmResultForm
+from ..models import Tournament, Cube, Game
+from ..forms import ReportResultForm, ConfirmResultForm, EnrollmentImportForm
 
 User = get_user_model()
 
+# Thumbnails per page of the judge gallery
+GALLERY_PAGE_SIZE = 48
+
+
+def csrf_cookie(request):
+    """Returns the CSRF secret of the request. Cached fragments containing forms
+    vary on it, as their tokens are only valid for the cookie they were made for.
+    """
+    get_token(request)
+    return request.META["CSRF_COOKIE"]
+
 
 class AdminTemplateMixin(UserPassesTestMixin):
     def test_func(self):
@@ -46,26 +66,21 @@ class MyEventsView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser:
-            events = queries.enrolled_tournaments(None, force_update=True)
+            events = queries.event_listing(None)["enrolled"]
             status = {}
             for e in events:
                 status[e.id] = True
             queryset = {"events": events, "status": status}
             return queryset
 
-        player = queries.get_player(user)
-        events = queries.enrolled_tournaments(player, force_update=True)
+        events = queries.event_listing(user)["enrolled"]
         if not events:
             return None
 
-        status = {}
-        for e in events:
-            current_enroll = queries.enrollment_from_tournament(e, player)
-            draft = queries.current_draft(current_enroll)
-            if not draft:
-                status[e.id] = False
-                continue
-            status[e.id] = current_enroll.registration_finished
+        # The dashboard opens once the player has a draft in the active phase
+        status = {
+            e.id: bool(e.active_draft_id and e.registration_finished) for e in events
+        }
 
         queryset = {"events": events, "status": status}
 
@@ -80,20 +95,18 @@ class AvailableEvents(LoginRequiredMixin, ListView):
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser:
-            return queries.available_tournaments(None, force_update=True)
+            return queries.event_listing(None)["available"]
         player = queries.get_player(user)
-        available = queries.available_tournaments(player, force_update=True)
-        enrolled = queries.enrolled_tournaments(player, force_update=True)
+        listing = queries.event_listing(user)
 
-        status = {}
-        for e in enrolled:
-            current_enroll = queries.enrollment_from_tournament(e, player)
-            status[e.id] = current_enroll.registration_finished
+        status = {e.id: e.registration_finished for e in listing["enrolled"]}
 
         queryset = {
-            "enrolled": enrolled,
-            "available": available,
+            "enrolled": listing["enrolled"],
+            "available": listing["available"],
             "status": status,
+            "waitlist": queries.waitlist_positions(player),
+            "queued": queries.queued_registrations(user),
         }
         return queryset
 
@@ -115,37 +128,49 @@ class AdminPlayerListView(AdminTemplateMixin, ListView):
 
         return {"enrolled": enrollments, "not_enrolled": not_enrolled}
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["import_form"] = EnrollmentImportForm()
+        return context
+
     def post(self, request, *args, **kwargs):
+        if "bulk-enroll" in request.POST:
+            return AdminBulkEnrollView.as_view()(request, *args, **kwargs)
         return AdminEnrollUserView.as_view()(request, *args, **kwargs)
 
 
 class AdminDraftDashboardView(AdminTemplateMixin, View):
     def get(self, request, *args, **kwargs):
         draft = queries.get_draft(slug=kwargs["draft_slug"])
+        current_round = queries.current_round(draft, force_update=True)
 
-        current_round = queries.admin_round_prefetch(draft, force_update=True)
-        if current_round:
-            matches = current_round.game_set.select_related(
-                "player1__player__user", "player2__player__user"
-            ).order_by("table")
+        # Only called by the template when the cached match list is stale
+        @functools.cache
+        def matches():
+            if not current_round:  # If no rounds exist yet in the current draft
+                return {"match_ids": [], "bye": False, "forms": {}, "confirm_forms": {}}
+
+            games = current_round.game_set
+            if draft.seeds:
+                # Rounds of a bracket overlap, earlier ones may still be running
+                games = Game.objects.filter(
+                    Q(round=current_round) | Q(round__finished=False),
+                    round__draft=draft,
+                )
+            m_ids = list(games.order_by("table").values_list("id", flat=True))
             bye = queries.bye_this_round(draft)
-            if bye:
-                bye = bye.player.user.name
-
-            m_ids = [m.id for m in matches]
-            forms = {
-                match_id: ReportResultForm(initial={"match_id": match_id})
-                for match_id in m_ids
-            }
-            confirm_forms = {
-                match_id: ConfirmResultForm(initial={"confirm_match_id": match_id})
-                for match_id in m_ids
+            return {
+                "match_ids": m_ids,
+                "bye": bye.player.user.name if bye else False,
+                "forms": {
+                    match_id: ReportResultForm(initial={"match_id": match_id})
+                    for match_id in m_ids
+                },
+                "confirm_forms": {
+                    match_id: ConfirmResultForm(initial={"confirm_match_id": match_id})
+                    for match_id in m_ids
+                },
             }
-        else:  # If no rounds exist yet in the current draft
-            m_ids = []
-            forms = []
-            confirm_forms = []
-            bye = False
 
         return render(
             request,
@@ -153,10 +178,9 @@ class AdminDraftDashboardView(AdminTemplateMixin, View):
             {
                 "tournament_slug": kwargs["slug"],
                 "draft": draft,
-                "match_ids": m_ids,
-                "bye": bye,
-                "forms": forms,
-                "confirm_forms": confirm_forms,
+                "draft_version": queries.draft_version(draft, current_round),
+                "csrf_cookie": csrf_cookie(request),
+                "matches": matches,
             },
         )
 
@@ -175,6 +199,45 @@ class AdminDraftDashboardView(AdminTemplateMixin, View):
             return ResetDraftView.as_view()(request, *args, **kwargs)
 
 
+class JudgeGalleryView(AdminTemplateMixin, View):
+    def get(self, request, *args, **kwargs):
+        draft = queries.get_draft(slug=kwargs["draft_slug"])
+        if not draft:
+            messages.error(request, "No draft.")
+            return redirect("tournaments:index")
+
+        checkin = request.GET.get("images") != "checkout"
+        paginator = Paginator(queries.draft_images(draft, checkin), GALLERY_PAGE_SIZE)
+        page = paginator.get_page(request.GET.get("page"))
+        images = list(page)
+        # The thumbnails of the next page are prefetched while judges review this one
+        upcoming = (
+            list(paginator.page(page.next_page_number())) if page.has_next() else []
+        )
+
+        files = [image.image.name for image in images]
+        files += [(image.thumbnail or image.image).name for image in images + upcoming]
+        urls = media.urls(files)
+        for image in images:
+            image.gallery_url = urls[image.image.name]
+            image.gallery_thumbnail_url = urls[(image.thumbnail or image.image).name]
+
+        return render(
+            request,
+            "tournaments/judge_gallery.html",
+            {
+                "tournament_slug": kwargs["slug"],
+                "draft": draft,
+                "checkin": checkin,
+                "page": page,
+                "images": images,
+                "prefetch_urls": [
+                    urls[(image.thumbnail or image.image).name] for image in upcoming
+                ],
+            },
+        )
+
+
 class AdminDashboardView(AdminTemplateMixin, View):
     def test_func(self):
         return self.request.user.is_superuser
@@ -194,12 +257,21 @@ class AdminDashboardView(AdminTemplateMixin, View):
         return render(
             request,
             "tournaments/admin_dashboard.html",
-            {"tournament": tournament, "draft_ids": draft_ids, "slugs": slugs},
+            {
+                "tournament": tournament,
+                "phase": queries.active_phase(tournament),
+                "draft_ids": draft_ids,
+                "slugs": slugs,
+            },
         )
 
     def post(self, request, *args, **kwargs):
         if "start-phase" in request.POST:
             return StartPhaseView.as_view()(request, *args, **kwargs)
+        if "seat-phase" in request.POST:
+            return SeatPhaseView.as_view()(request, *args, **kwargs)
+        if "pair-phase" in request.POST:
+            return PairPhaseView.as_view()(request, *args, **kwargs)
         if "finish-event-round" in request.POST:
             return FinishEventRoundView.as_view()(request, *args, **kwargs)
         if "reset-event" in request.POST:
@@ -231,21 +303,24 @@ class DraftDashboardView(LoginRequiredMixin, View):
                         "tournaments:event_dashboard", kwargs={"slug": kwargs["slug"]}
                     )
                 )
+        elif draft.seeds:
+            # Rounds of a bracket overlap, players follow their own latest match
+            match = queries.bracket_match(current_enroll, draft)
+            if match:
+                current_round = match.round
         else:
             if not current_round.finished:
                 if current_enroll.bye_this_round:
                     bye = True
-                    form = None
-                    confirm_form = None
                 else:
                     match = queries.current_match(current_enroll, current_round)
-                    form = ReportResultForm(initial={"match_id": match.id})
-                    confirm_form = ConfirmResultForm(
-                        initial={"confirm_match_id": match.id}
-                    )
+        if match:
+            form = ReportResultForm(initial={"match_id": match.id})
+            confirm_form = ConfirmResultForm(initial={"confirm_match_id": match.id})
 
         context = {
             "draft": draft,
+            "draft_version": queries.draft_version(draft, current_round),
             "tournament": tournament,
             "round": current_round,
             "bye": bye,
@@ -0,0 +1,27 @@
+import re
+
+from django.contrib.staticfiles.storage import ManifestFilesMixin
+from storages.backends.gcloud import GoogleCloudStorage
+
+# ManifestFilesMixin puts the first 12 hex digits of the MD5 before the extension
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}(\.[^./]+)?$")
+
+
+class ManifestStaticGoogleCloudStorage(ManifestFilesMixin, GoogleCloudStorage):
+  """Static files storage that stores content-hashed copies of every file on
+  collectstatic, so their URLs can be cached forever by browsers and the CDN.
+  The manifest is read once per process and kept in memory.
+  """
+
+  querystring_auth = False
+
+  def get_object_parameters(self, name):
+    """Only the hashed copies are immutable. The originals and the manifest keep
+    their name across deploys, so they must be revalidated.
+    """
+    params = super().get_object_parameters(name)
+    if HASHED_NAME.search(name):
+      params["cache_control"] = "public, max-age=31536000, immutable"
+    else:
+      params["cache_control"] = "no-cache"
+    return params
@@ -0,0 +1,46 @@
+import functools
+import hashlib
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils import translation
+from django.views.i18n import JavaScriptCatalog
+
+
+@functools.cache
+def catalog_version():
+  """Hash of the djangojs catalogs, computed once per process."""
+  digest = hashlib.md5()
+  for locale_path in settings.LOCALE_PATHS:
+    for path in sorted(Path(locale_path).glob("*/LC_MESSAGES/djangojs.*")):
+      digest.update(path.read_bytes())
+  return digest.hexdigest()[:12]
+
+
+class VersionedJavaScriptCatalog(JavaScriptCatalog):
+  """JavaScript catalog for the language in the URL.
+  The URL changes whenever the catalogs do, so the response can be cached forever.
+  """
+
+  def get(self, request, *args, **kwargs):
+    lang = kwargs["lang"]
+    if lang not in dict(settings.LANGUAGES):
+      raise Http404
+
+    etag = f'"{lang}-{catalog_version()}"'
+    if request.headers.get("If-None-Match") == etag:
+      return HttpResponseNotModified()
+
+    cache_key = f"javascript_catalog_{lang}_{catalog_version()}"
+    content = cache.get(cache_key)
+    if content is None:
+      with translation.override(lang):
+        content = super().get(request, *args, **kwargs).content
+      cache.set(cache_key, content, None)
+
+    response = HttpResponse(content, content_type='text/javascript; charset="utf-8"')
+    response["ETag"] = etag
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response